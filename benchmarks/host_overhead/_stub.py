@@ -0,0 +1,84 @@
+"""Stubs to measure the host overhead of CuPy without running kernels.
+
+:func:`install_allocator` replaces the memory allocator with one returning
+fake device pointers, which are never dereferenced, so that arrays and
+views can be created on machines without GPU. :func:`install_launcher`
+replaces the kernel compiler with one returning kernels whose launches are
+no-ops, so that the dispatch of kernels is measured without compiling and
+running them (a CUDA device is still needed to look up the current
+device).
+"""
+
+from unittest import mock
+
+import cupy
+from cupy.cuda import function
+from cupy.cuda import memory
+
+
+class _StubAllocator(object):
+
+    # Fake pointers are allocated from a range unlikely to be used by
+    # actual allocations; memory is never reused.
+
+    def __init__(self):
+        self._next = 1 << 48
+
+    def __call__(self, size):
+        ptr = self._next
+        self._next += -(-max(size, 1) // 512) * 512
+        return memory.MemoryPointer(
+            memory.UnownedMemory(ptr, size, None, 0), 0)
+
+
+class StubFunction(function.Function):
+
+    """Kernel whose launches are no-ops."""
+
+    def __init__(self, name):
+        self.n_launches = 0
+
+    def __call__(self, *args, **kwargs):
+        self.n_launches += 1
+
+    def linear_launch(self, *args, **kwargs):
+        self.n_launches += 1
+
+
+class StubModule(function.Module):
+
+    """Module returning :class:`StubFunction` kernels."""
+
+    def get_function(self, name):
+        return StubFunction(name)
+
+
+def _compile_with_cache(*args, **kwargs):
+    return StubModule()
+
+
+def install_allocator():
+    """Installs the stub allocator and returns a function to restore."""
+    allocator = memory.get_allocator()
+    memory.set_allocator(_StubAllocator())
+    return lambda: memory.set_allocator(allocator)
+
+
+def install_launcher():
+    """Installs the stub kernel compiler and returns a function to restore.
+
+    Note that the stub kernels remain in the kernel caches after restored.
+    Benchmarks should use their own kernels and ufuncs so that they do not
+    affect each other.
+    """
+    patcher = mock.patch.object(
+        cupy.cuda, 'compile_with_cache', _compile_with_cache)
+    patcher.start()
+    return patcher.stop
+
+
+def require_device():
+    """Skips the benchmark if no CUDA device is available."""
+    if not cupy.cuda.is_available():
+        # Following asv, NotImplementedError raised in setup skips it.
+        raise NotImplementedError('CUDA device is not available')
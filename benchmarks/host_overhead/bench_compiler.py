@@ -0,0 +1,69 @@
+"""Host overhead of the kernel cache lookup in ``compile_with_cache``.
+
+The cache key computation runs without GPU. The preprocess fingerprint (the
+result of compiling an empty source) requires NVRTC.
+"""
+
+import tempfile
+
+import cupy
+from cupy.cuda import compiler
+
+import _stub
+
+
+class CacheKey(object):
+
+    params = [[1000, 10000, 100000], [0, 300000]]
+    param_names = ['source_size', 'extra_source_size']
+
+    def setup(self, source_size, extra_source_size):
+        self.env = (
+            '80', ('-ftz=true', '-I/path/to/include'), (11, 2), 'nvrtc')
+        self.base = b'x' * 1000
+        self.sources = [
+            '/* %d */ ' % i + 'x' * source_size for i in range(100)]
+        self.extra_source = 'y' * extra_source_size
+        self.memo = compiler._cache_key_memo.copy()
+
+    def teardown(self, source_size, extra_source_size):
+        compiler._cache_key_memo.clear()
+        compiler._cache_key_memo.update(self.memo)
+
+    def time_cold(self, source_size, extra_source_size):
+        compiler._cache_key_memo.clear()
+        for source in self.sources:
+            compiler._get_cache_key(
+                self.env, self.base, source, self.extra_source, '.cubin')
+
+    def time_memoized(self, source_size, extra_source_size):
+        for source in self.sources:
+            compiler._get_cache_key(
+                self.env, self.base, source, self.extra_source, '.cubin')
+
+
+class PreprocessFingerprint(object):
+
+    def setup(self):
+        _stub.require_device()
+        if cupy.cuda.runtime.is_hip:
+            raise NotImplementedError('NVRTC is not available')
+        self.arch = compiler._get_arch()
+        self.options = ('-ftz=true',)
+        self.env = (
+            self.arch, self.options, compiler._get_nvrtc_version(), 'nvrtc')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self._get(self.temp_dir.name)  # fill the disk cache
+
+    def teardown(self):
+        self.temp_dir.cleanup()
+
+    def _get(self, cache_dir):
+        compiler._get_preprocess_fingerprint(
+            self.env, self.options, self.arch, 'nvrtc', cache_dir)
+
+    def time_compile(self):
+        self._get(None)
+
+    def time_disk_cache(self):
+        self._get(self.temp_dir.name)
@@ -0,0 +1,54 @@
+"""Host overhead of planning einsum contractions (no GPU required)."""
+
+from cupy.linalg import _einsum
+from cupy.linalg import _einsum_opt
+
+
+_subscripts = {
+    'matmul_chain': ('ij,jk,kl,lm->im', [(10, 20), (20, 30), (30, 40),
+                                         (40, 50)]),
+    'tensor_network': ('abc,cde,efa,bdf->', [(8, 9, 10), (10, 11, 12),
+                                             (12, 13, 8), (9, 11, 13)]),
+    'batched': ('bij,bjk,bkl->bil', [(16, 10, 20), (16, 20, 30),
+                                     (16, 30, 40)]),
+}
+
+
+class PathPlanning(object):
+
+    params = [sorted(_subscripts), ['greedy', 'optimal']]
+    param_names = ['subscripts', 'algorithm']
+
+    def setup(self, subscripts, algorithm):
+        expr, shapes = _subscripts[subscripts]
+        inputs, output = expr.split('->')
+        inputs = inputs.split(',')
+        self.input_sets = [set(sub) for sub in inputs]
+        self.output_set = set(output)
+        self.idx_dict = {}
+        for sub, shape in zip(inputs, shapes):
+            self.idx_dict.update(zip(sub, shape))
+        self.path = {
+            'greedy': _einsum_opt._greedy_path,
+            'optimal': _einsum_opt._optimal_path,
+        }[algorithm]
+
+    def time_path(self, subscripts, algorithm):
+        self.path(self.input_sets, self.output_set, self.idx_dict, 2 ** 31)
+
+
+class ParseSubscripts(object):
+
+    # Subscripts of the operands, with '...' replaced by '@' as einsum does.
+    params = [['explicit', 'ellipsis']]
+    param_names = ['subscripts']
+
+    def setup(self, subscripts):
+        self.subscripts = {
+            'explicit': ['ij', 'jk', 'kl'],
+            'ellipsis': ['@ij', '@jk', '@kl'],
+        }[subscripts]
+
+    def time_parse_ellipsis_subscript(self, subscripts):
+        for idx, sub in enumerate(self.subscripts):
+            _einsum._parse_ellipsis_subscript(sub, idx, ellipsis_len=2)
@@ -0,0 +1,53 @@
+"""Host overhead of tracing fused functions (no GPU required)."""
+
+import numpy
+
+import cupy
+from cupy._core import _fusion_thread_local
+from cupy._core import fusion
+from cupy._core import new_fusion
+
+import _stub
+
+
+def _elementwise(x, y):
+    return cupy.sqrt(x * x + y * y) + 1
+
+
+def _reduction(x, y):
+    return cupy.sum(x * y, axis=1)
+
+
+_funcs = {'elementwise': _elementwise, 'reduction': _reduction}
+
+
+class Trace(object):
+
+    params = [['elementwise', 'reduction']]
+    param_names = ['func']
+
+    def setup(self, func):
+        self._restore = _stub.install_allocator()
+        self.func = _funcs[func]
+        self.args = (
+            cupy.ndarray((10, 20), numpy.float32),
+            cupy.ndarray((10, 20), numpy.float32))
+
+    def teardown(self, func):
+        self._restore()
+
+    def time_trace(self, func):
+        # Tracing of cupy.fuse (the kernel is compiled at the first launch).
+        thread_local = _fusion_thread_local.thread_local
+        history = fusion._FusionHistory()
+        try:
+            thread_local.history = history
+            thread_local.is_old_fusing = True
+            history.get_fusion(self.func, self.args, 'bench_fusion')
+        finally:
+            thread_local.history = None
+            thread_local.is_old_fusing = False
+
+    def time_trace_new_fusion(self, func):
+        new_fusion._get_fused_kernel(
+            'bench_new_fusion', self.func, self.args)
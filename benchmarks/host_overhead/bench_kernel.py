@@ -0,0 +1,156 @@
+"""Host overhead of ufunc and elementwise kernel dispatch.
+
+Routine and type resolution run without GPU. Calls are measured with the
+stub launcher, which requires a CUDA device but does not compile or run
+kernels. :class:`Dispatch` measures calls with the actual kernel launches.
+"""
+
+import numpy
+
+import cupy
+from cupy import _core
+from cupy._core import _kernel
+
+import _stub
+
+
+def _create_ufunc(name):
+    return _core.create_ufunc(
+        name, ('??->?', 'bb->b', 'll->l', 'ff->f', 'dd->d', 'FF->F', 'DD->D'),
+        'out0 = in0 + in1')
+
+
+def _get_calls(func, a):
+    # Returns the argument patterns of the calls to be measured.
+    at = a.T
+    b = a[0]
+    out = cupy.empty_like(a)
+    return {
+        'contiguous': lambda: func(a, a),
+        'scalar': lambda: func(a, 2),
+        'non_contiguous': lambda: func(at, at),
+        'broadcast': lambda: func(a, b),
+        'out': lambda: func(a, a, out),
+    }
+
+
+class UfuncRoutine(object):
+
+    params = [['bool', 'int64', 'float32', 'complex128']]
+    param_names = ['dtype']
+
+    def setup(self, dtype):
+        self._restore = _stub.install_allocator()
+        self.ufunc = _create_ufunc('bench_ufunc_routine')
+        a = cupy.ndarray((10,), dtype)
+        self.args = [a, a]
+        self.scalar_args = [a, numpy.float64(2.0)]
+        self.in_types = (a.dtype.type, a.dtype.type)
+        self.cache = {}
+
+    def teardown(self, dtype):
+        self._restore()
+
+    def time_guess_routine(self, dtype):
+        self.ufunc._ops.guess_routine(
+            self.ufunc.name, self.cache, self.args, None, None)
+
+    def time_guess_routine_scalar(self, dtype):
+        self.ufunc._ops.guess_routine(
+            self.ufunc.name, self.cache, self.scalar_args, None, None)
+
+    def time_guess_routine_uncached(self, dtype):
+        self.ufunc._ops._guess_routine_from_in_types(self.in_types)
+
+
+class UfuncCall(object):
+
+    params = [['contiguous', 'scalar', 'non_contiguous', 'broadcast', 'out']]
+    param_names = ['args']
+
+    def setup(self, args):
+        _stub.require_device()
+        self._restore = _stub.install_launcher()
+        ufunc = _create_ufunc('bench_ufunc_call')
+        self.call = _get_calls(ufunc, cupy.empty((10, 100), numpy.float32))[
+            args]
+        self.call()  # fill the caches
+
+    def teardown(self, args):
+        self._restore()
+
+    def time_call(self, args):
+        self.call()
+
+
+class ElementwiseKernelArgs(object):
+
+    def setup(self):
+        self.kernel = cupy.ElementwiseKernel(
+            'T x, T y', 'T z', 'z = x + y', 'bench_elementwise_args')
+        self.in_types = (numpy.float32, numpy.float32)
+        self.kernel._decide_params_type(self.in_types, ())
+
+    def time_init(self):
+        cupy.ElementwiseKernel(
+            'T x, T y, raw U w', 'T z', 'z = x + y + w[i]',
+            'bench_elementwise_init')
+
+    def time_decide_params_type(self):
+        self.kernel._decide_params_type(self.in_types, ())
+
+    def time_decide_params_type_uncached(self):
+        _kernel._decide_params_type(
+            self.kernel.in_params, self.kernel.out_params, self.in_types, ())
+
+
+class ElementwiseKernelCall(object):
+
+    params = [['contiguous', 'scalar', 'non_contiguous', 'broadcast', 'out']]
+    param_names = ['args']
+
+    def setup(self, args):
+        _stub.require_device()
+        self._restore = _stub.install_launcher()
+        kernel = cupy.ElementwiseKernel(
+            'T x, T y', 'T z', 'z = x + y', 'bench_elementwise_call')
+        self.call = _get_calls(kernel, cupy.empty((10, 100), numpy.float32))[
+            args]
+        self.call()  # fill the caches
+
+    def teardown(self, args):
+        self._restore()
+
+    def time_call(self, args):
+        self.call()
+
+
+class Dispatch(object):
+
+    # Kernels are launched asynchronously on small arrays, where the host
+    # overhead dominates the latency. Contiguous and scalar arguments go
+    # through the dispatch cache, while the others take the full path.
+
+    params = [
+        ['ufunc', 'elementwise'],
+        [(10, 100), (4, 10, 25)],
+        ['contiguous', 'scalar', 'non_contiguous', 'broadcast'],
+    ]
+    param_names = ['kernel', 'shape', 'args']
+
+    def setup(self, kernel, shape, args):
+        _stub.require_device()
+        if kernel == 'ufunc':
+            func = _create_ufunc('bench_dispatch')
+        else:
+            func = cupy.ElementwiseKernel(
+                'T x, T y', 'T z', 'z = x + y', 'bench_dispatch')
+        self.call = _get_calls(func, cupy.ones(shape, numpy.float32))[args]
+        self.call()  # compile the kernel and fill the caches
+        cupy.cuda.Device().synchronize()
+
+    def teardown(self, kernel, shape, args):
+        cupy.cuda.Device().synchronize()
+
+    def time_call(self, kernel, shape, args):
+        self.call()
@@ -0,0 +1,70 @@
+"""Host overhead of creating arrays and views (no GPU required)."""
+
+import numpy
+
+import cupy
+
+import _stub
+
+
+class Creation(object):
+
+    params = [[(), (1000,), (10, 10, 10)], ['float32', 'complex128']]
+    param_names = ['shape', 'dtype']
+
+    def setup(self, shape, dtype):
+        self._restore = _stub.install_allocator()
+        self.memptr = cupy.cuda.alloc(1 << 20)
+
+    def teardown(self, shape, dtype):
+        self._restore()
+
+    def time_ndarray(self, shape, dtype):
+        cupy.ndarray(shape, dtype)
+
+    def time_ndarray_memptr(self, shape, dtype):
+        cupy.ndarray(shape, dtype, memptr=self.memptr)
+
+    def time_empty(self, shape, dtype):
+        cupy.empty(shape, dtype)
+
+
+class Views(object):
+
+    def setup(self):
+        self._restore = _stub.install_allocator()
+        self.a = cupy.ndarray((10, 20, 30), numpy.float32)
+        self.b = cupy.ndarray((1, 20, 1), numpy.float32)
+
+    def teardown(self):
+        self._restore()
+
+    def time_getitem_int(self):
+        self.a[1]
+
+    def time_getitem_slice(self):
+        self.a[1:5]
+
+    def time_getitem_tuple(self):
+        self.a[1:5, ::2, 3]
+
+    def time_getitem_newaxis(self):
+        self.a[..., None]
+
+    def time_transpose(self):
+        self.a.T
+
+    def time_swapaxes(self):
+        self.a.swapaxes(0, 2)
+
+    def time_reshape(self):
+        self.a.reshape(200, 30)
+
+    def time_ravel(self):
+        self.a.ravel()
+
+    def time_view(self):
+        self.a.view()
+
+    def time_squeeze(self):
+        self.b.squeeze()
@@ -0,0 +1,44 @@
+"""Host overhead of the reclamation of pinned memory (no GPU required).
+
+Pinned buffers used by asynchronous host-to-device copies are kept alive
+by ``_EventWatcher`` until the event recorded after the copy is done, and
+the watcher is checked on every pinned memory allocation. Events are
+emulated on the host.
+"""
+
+from cupy.cuda import pinned_memory
+
+
+class _Event(object):
+
+    # Emulates cupy.cuda.Event; only ``done`` is used by the watcher.
+
+    def __init__(self):
+        self.done = False
+
+
+class EventWatcher(object):
+
+    params = [[10, 100, 1000, 10000], [0.0, 0.5, 1.0]]
+    param_names = ['n_pending', 'done_ratio']
+
+    def setup(self, n_pending, done_ratio):
+        self.events = [_Event() for _ in range(n_pending)]
+        # Events complete in the order of recording.
+        self.done_events = self.events[:int(n_pending * done_ratio)]
+
+    def time_add(self, n_pending, done_ratio):
+        watcher = pinned_memory._EventWatcher()
+        for event in self.events:
+            watcher.add(event, None)
+
+    def time_add_and_release(self, n_pending, done_ratio):
+        # The cost of check_and_release is the difference from time_add.
+        watcher = pinned_memory._EventWatcher()
+        for event in self.events:
+            watcher.add(event, None)
+        for event in self.done_events:
+            event.done = True
+        watcher.check_and_release()
+        for event in self.done_events:
+            event.done = False
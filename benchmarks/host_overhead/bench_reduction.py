@@ -0,0 +1,60 @@
+"""Host overhead of reductions.
+
+Axis normalization and kernel construction run without GPU. Calls are
+measured with the stub launcher, which requires a CUDA device.
+"""
+
+import numpy
+
+import cupy
+from cupy._core import _reduction
+
+import _stub
+
+
+class Axis(object):
+
+    params = [[None, 1, (0, 2), -1]]
+    param_names = ['axis']
+
+    def setup(self, axis):
+        self.shape = (10, 20, 30)
+        self.reduce_axis, self.out_axis = _reduction._get_axis(axis, 3)
+
+    def time_get_axis(self, axis):
+        _reduction._get_axis(axis, 3)
+
+    def time_get_out_shape(self, axis):
+        _reduction._get_out_shape(
+            self.shape, self.reduce_axis, self.out_axis, False)
+
+    def time_get_out_shape_keepdims(self, axis):
+        _reduction._get_out_shape(
+            self.shape, self.reduce_axis, self.out_axis, True)
+
+
+class ReductionKernelInit(object):
+
+    def time_init(self):
+        cupy.ReductionKernel(
+            'T x', 'T y', 'x', 'a + b', 'y = a', '0', 'bench_reduction_init')
+
+
+class ReductionKernelCall(object):
+
+    params = [[None, 1, (0, 2)], [False, True]]
+    param_names = ['axis', 'keepdims']
+
+    def setup(self, axis, keepdims):
+        _stub.require_device()
+        self._restore = _stub.install_launcher()
+        self.kernel = cupy.ReductionKernel(
+            'T x', 'T y', 'x', 'a + b', 'y = a', '0', 'bench_reduction_call')
+        self.a = cupy.empty((10, 20, 30), numpy.float32)
+        self.time_call(axis, keepdims)  # fill the caches
+
+    def teardown(self, axis, keepdims):
+        self._restore()
+
+    def time_call(self, axis, keepdims):
+        self.kernel(self.a, axis=axis, keepdims=keepdims)
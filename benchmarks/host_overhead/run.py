@@ -0,0 +1,127 @@
+"""Runs the host overhead benchmarks.
+
+The benchmarks follow the conventions of airspeed velocity (asv): each
+``bench_*.py`` module defines classes whose ``time_*`` methods are timed,
+optionally parametrized by ``params`` and ``param_names``, with ``setup``
+and ``teardown`` run around each parameter combination. A benchmark whose
+``setup`` raises ``NotImplementedError`` is skipped. The suite can be run
+by asv as well as by this script, which needs no extra dependency.
+
+Usage: python benchmarks/host_overhead/run.py [-k PATTERN] [--number N]
+       [--json FILE] [--compare FILE] [--threshold RATIO]
+"""
+
+import argparse
+import glob
+import importlib
+import inspect
+import itertools
+import json
+import os
+import sys
+import timeit
+
+
+def _discover(pattern):
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    for path in sorted(glob.glob(os.path.join(directory, 'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = importlib.import_module(module_name)
+        for class_name, cls in sorted(vars(module).items()):
+            if (not inspect.isclass(cls) or cls.__module__ != module_name
+                    or class_name.startswith('_')):
+                continue
+            for method_name in sorted(dir(cls)):
+                if not method_name.startswith('time_'):
+                    continue
+                name = '{}.{}.{}'.format(module_name, class_name, method_name)
+                if pattern is None or pattern in name:
+                    yield name, cls, method_name
+
+
+def _param_combinations(cls):
+    params = getattr(cls, 'params', [])
+    if not params:
+        return [()]
+    if not isinstance(params[0], (list, tuple)):
+        # A single parameter may be given without nesting as in asv.
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def _run(cls, method_name, params, number):
+    bench = cls()
+    try:
+        if hasattr(bench, 'setup'):
+            bench.setup(*params)
+    except NotImplementedError:
+        return None
+    try:
+        func = getattr(bench, method_name)
+        timer = timeit.Timer(lambda: func(*params))
+        if number is None:
+            number, _ = timer.autorange()
+        return min(timer.repeat(repeat=5, number=number)) / number
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
+
+
+def main(args):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-k', type=str, default=None, dest='pattern',
+                        help='Run only benchmarks whose names contain it')
+    parser.add_argument('--number', type=int, default=None,
+                        help='Number of calls per measurement (default: '
+                             'determined automatically)')
+    parser.add_argument('--json', type=str, default=None,
+                        help='Write the results to the JSON file')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='JSON file of the baseline results')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='Ratio to the baseline reported as regression '
+                             '(default: 1.2)')
+    params = parser.parse_args(args)
+
+    baseline = {}
+    if params.compare is not None:
+        with open(params.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    for name, cls, method_name in _discover(params.pattern):
+        for combination in _param_combinations(cls):
+            key = name
+            if combination:
+                key += '({})'.format(', '.join(map(repr, combination)))
+            t = _run(cls, method_name, combination, params.number)
+            if t is None:
+                print('{:<80} skipped'.format(key))
+                continue
+            results[key] = t
+            line = '{:<80} {:10.2f} us'.format(key, t * 1e6)
+            base = baseline.get(key)
+            if base:
+                ratio = t / base
+                line += '  {:5.2f}x'.format(ratio)
+                if ratio > params.threshold:
+                    regressions.append(key)
+                    line += '  REGRESSION'
+            print(line)
+            sys.stdout.flush()
+
+    if params.json is not None:
+        with open(params.json, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+    if regressions:
+        print('{} benchmark(s) regressed by more than {:.2f}x'.format(
+            len(regressions), params.threshold))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -43,10 +43,11 @@ cdef class Indexer:
     cdef:
         readonly Py_ssize_t size
         readonly shape_t shape
+        readonly bint index_32_bits
 
     cdef void init(self, const shape_t& shape)
 
     cdef function.CPointer get_pointer(self)
 
 
-cdef Indexer _indexer_init(const shape_t& shape)
+cpdef Indexer _indexer_init(const shape_t& shape)
@@ -39,6 +39,8 @@ cdef class Indexer:
     cdef void init(self, const shape_t& shape):
         self.shape = shape
         self.size = internal.prod(shape)
+        # The index is decomposed in 32-bit if it fits in unsigned int.
+        self.index_32_bits = self.size <= (1 << 31)
 
     @property
     def ndim(self):
@@ -50,7 +52,7 @@ cdef class Indexer:
         return indexer
 
 
-cdef inline Indexer _indexer_init(const shape_t& shape):
+cpdef inline Indexer _indexer_init(const shape_t& shape):
     cdef Indexer indexer = Indexer.__new__(Indexer)
     indexer.init(shape)
     return indexer
@@ -148,7 +148,9 @@ cdef class _Ops:
 cpdef create_ufunc(name, ops, routine=*, preamble=*, doc=*,
                    default_casting=*, loop_prep=*, out_ops=*)
 
-cdef tuple _get_arginfos(list args)
+cpdef tuple _get_arginfos(list args)
+
+cpdef list _warmup(kernel, Py_ssize_t nin, dtypes, shapes, dict kwargs)
 
 cdef str _get_kernel_params(tuple params, tuple arginfos)
 
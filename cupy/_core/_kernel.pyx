@@ -35,11 +35,10 @@ cdef inline bint _contains_zero(const shape_t& v) except? -1:
     return False
 
 
-cdef function.Function _get_simple_elementwise_kernel(
+cpdef str _get_simple_elementwise_kernel_code(
         tuple params, tuple arginfos, str operation, str name,
-        _TypeMap type_map, str preamble, str loop_prep='', str after_loop='',
-        tuple options=()):
-    module_code = string.Template('''
+        _TypeMap type_map, str preamble, str loop_prep='', str after_loop=''):
+    return string.Template('''
     ${typedef_preamble}
     ${preamble}
     extern "C" __global__ void ${name}(${params}) {
@@ -58,8 +57,98 @@ cdef function.Function _get_simple_elementwise_kernel(
         preamble=preamble,
         loop_prep=loop_prep,
         after_loop=after_loop)
-    module = compile_with_cache(module_code, options)
-    return module.get_function(name)
+
+
+cpdef str _get_vectorized_elementwise_kernel_code(
+        tuple params, tuple arginfos, str operation, str vec_load,
+        str vec_operation, str vec_store, str name, _TypeMap type_map,
+        str preamble, int vec_size):
+    # Each thread processes vec_size elements at once: vec_load loads the
+    # elements of the vectorized arrays, vec_operation is applied to each of
+    # them and vec_store stores the results. The remaining elements are
+    # processed one by one by operation.
+    return string.Template('''
+    ${typedef_preamble}
+    ${preamble}
+    extern "C" __global__ void ${name}(${params}) {
+      const ptrdiff_t _n_vec = _ind.size() / ${vec_size};
+      CUPY_FOR(_i_vec, _n_vec) {
+        ${vec_load}
+        #pragma unroll
+        for (int _k = 0; _k < ${vec_size}; ++_k) {
+          ptrdiff_t i = _i_vec * ${vec_size} + _k;
+          _ind.set(i);
+          ${vec_operation};
+        }
+        ${vec_store}
+      }
+      CUPY_FOR(_i_tail, _ind.size() - _n_vec * ${vec_size}) {
+        ptrdiff_t i = _n_vec * ${vec_size} + _i_tail;
+        _ind.set(i);
+        ${operation};
+      }
+    }
+    ''').substitute(
+        typedef_preamble=type_map.get_typedef_code(),
+        params=_get_kernel_params(params, arginfos),
+        operation=operation,
+        vec_load=vec_load,
+        vec_operation=vec_operation,
+        vec_store=vec_store,
+        vec_size=vec_size,
+        name=name,
+        preamble=preamble)
+
+
+cdef list _get_kernel_bundle(list codes, list names, tuple options=()):
+    # Compiles the kernels together in a single program to amortize the fixed
+    # cost of NVRTC invocations. Each kernel is enclosed in its own namespace
+    # so that the typedefs and preambles of the kernels do not conflict. As
+    # the kernels are declared as extern "C", kernels with the same name are
+    # split into separate programs.
+    cdef list groups = []
+    cdef list kernels = [None] * len(codes)
+    cdef function.Module module
+    for i, name in enumerate(names):
+        for group_names, indices in groups:
+            if name not in group_names:
+                group_names.add(name)
+                indices.append(i)
+                break
+        else:
+            groups.append(({name}, [i]))
+
+    for _, indices in groups:
+        module = None
+        if len(indices) > 1:
+            source = ''.join([
+                'namespace _cupy_bundle_%d {\n%s\n}\n' % (i, codes[i])
+                for i in indices])
+            try:
+                module = compile_with_cache(source, options)
+            except compiler.CompileException:
+                # Some preambles cannot be placed in a namespace (e.g.,
+                # #include directives); compile the kernels one by one.
+                pass
+        for i in indices:
+            if module is None:
+                kernels[i] = compile_with_cache(
+                    codes[i], options).get_function(names[i])
+            else:
+                kernels[i] = module.get_function(names[i])
+    return kernels
+
+
+cdef str _get_name_with_type(str name, tuple arginfos):
+    cdef _ArgInfo arginfo
+    inout_type_words = []
+    for arginfo in arginfos:
+        dtype = str(numpy.dtype(arginfo.dtype))
+        if arginfo.is_ndarray():
+            inout_type_words.append(dtype)
+        elif arginfo.is_scalar():
+            inout_type_words.append(dtype.rstrip('0123456789'))
+    return '{}__{}'.format(name, '_'.join(inout_type_words))
 
 
 cdef inline int _get_kind_score(int kind):
@@ -173,7 +262,8 @@ cdef class _ArgInfo:
     cdef _ArgInfo from_indexer(_carray.Indexer arg):
         cdef _ArgInfo ret = _ArgInfo.__new__(_ArgInfo)
         ret._init(
-            ARG_KIND_INDEXER, _carray.Indexer, None, arg.ndim, True, True)
+            ARG_KIND_INDEXER, _carray.Indexer, None, arg.ndim, True,
+            arg.index_32_bits)
         return ret
 
     @staticmethod
@@ -242,7 +332,7 @@ cdef class _ArgInfo:
         if self.arg_kind == ARG_KIND_SCALAR:
             return _get_typename(self.dtype)
         if self.arg_kind == ARG_KIND_INDEXER:
-            return 'CIndexer<%d>' % self.ndim
+            return 'CIndexer<%d, %d>' % (self.ndim, self.index_32_bits)
         if self.arg_kind == ARG_KIND_TEXTURE:
             return 'cudaTextureObject_t'
         assert False
@@ -261,7 +351,7 @@ cdef class _ArgInfo:
         return p.name
 
 
-cdef tuple _get_arginfos(list args):
+cpdef tuple _get_arginfos(list args):
     return tuple([_ArgInfo.from_arg(a) for a in args])
 
 
@@ -380,6 +470,115 @@ cdef shape_t _reduced_view_core(list args, tuple params, const shape_t& shape):
     return newshape
 
 
+# Minimum size of the calls of ufunc and ElementwiseKernel for which the
+# kernels with vectorized memory access are used. Smaller calls are handled
+# by the dispatch caches, whose kernels are not vectorized.
+cdef Py_ssize_t _vector_min_size = 1 << 16
+
+# Size of the vector memory access in bytes.
+cdef Py_ssize_t _vector_bytes = 16
+
+
+@cython.final
+cdef class _DispatchEntry:
+    # Result of the dispatch of a kernel call, reused by the calls with the
+    # same argument signature.
+
+    cdef:
+        readonly tuple in_types
+        readonly tuple out_types
+        readonly function.Function kern
+        readonly str name
+
+    def __init__(self, tuple in_types, tuple out_types,
+                 function.Function kern, str name):
+        self.in_types = in_types
+        self.out_types = out_types
+        self.kern = kern
+        self.name = name
+
+
+cdef bint _is_dispatchable(list in_args, shape_t& shape) except? -1:
+    # Returns True if the calls with the arguments can be dispatched through
+    # the cache, i.e., all the arrays are C-contiguous, 32-bit indexable and
+    # of the same shape (set to ``shape``), so that neither broadcasting nor
+    # the reduction of dimensions depends on the strides.
+    cdef ndarray arr
+    cdef bint found = False
+    for a in in_args:
+        if isinstance(a, ndarray):
+            arr = a
+            if not (arr._c_contiguous and arr._index_32_bits):
+                return False
+            if not found:
+                shape.assign(arr._shape.begin(), arr._shape.end())
+                found = True
+            elif not internal.vector_equal(arr._shape, shape):
+                return False
+        elif isinstance(a, texture.TextureObject):
+            return False
+    return found and internal.prod(shape) < _vector_min_size
+
+
+cdef int _get_vector_size(
+        list args, tuple params, Py_ssize_t size,
+        bint vectorize_outputs) except -1:
+    # Returns the number of elements processed at once by each thread of the
+    # vectorized kernel, or 1 if the arguments do not allow it. Non-raw input
+    # arrays (and output arrays if vectorize_outputs is True) are accessed by
+    # vectors; they must be C-contiguous and not broadcast, their elements
+    # must be of 1, 2 or 4 bytes and their data must be aligned to the size
+    # of the vectors.
+    cdef ParameterInfo p
+    cdef ndarray arr
+    cdef Py_ssize_t itemsize, max_itemsize = 0
+    cdef int vec_size
+    cdef list arrays = []
+    if size < _vector_min_size:
+        return 1
+    for i in range(len(args)):
+        a = args[i]
+        if isinstance(a, texture.TextureObject):
+            return 1
+        p = params[i]
+        if (not isinstance(a, ndarray) or p.raw
+                or not (p.is_const or vectorize_outputs)):
+            continue
+        arr = a
+        itemsize = arr.dtype.itemsize
+        if not (arr._c_contiguous and arr.size == size
+                and itemsize in (1, 2, 4) and arr.dtype.kind in 'biuf'):
+            return 1
+        max_itemsize = max(max_itemsize, itemsize)
+        arrays.append(arr)
+    if max_itemsize == 0:
+        return 1
+    vec_size = _vector_bytes // max_itemsize
+    for arr in arrays:
+        if arr.data.ptr % (vec_size * arr.dtype.itemsize) != 0:
+            return 1
+    return vec_size
+
+
+cdef shape_t _reduce_dispatch_dims(list args, const shape_t& shape):
+    # Equivalent to _reduce_dims for the arguments accepted by
+    # _is_dispatchable, which are reduced to 1-dim views.
+    cdef shape_t newshape
+    cdef shape_t newstrides
+    cdef ndarray arr
+    if shape.size() <= 1:
+        return shape
+    newshape.assign(<Py_ssize_t>1, internal.prod(shape))
+    newstrides.resize(1)
+    for i in range(len(args)):
+        a = args[i]
+        if isinstance(a, ndarray):
+            arr = a
+            newstrides[0] = arr.dtype.itemsize
+            args[i] = arr._view(newshape, newstrides, False, True)
+    return newshape
+
+
 cdef class ParameterInfo:
 
     def __init__(self, str param, bint is_const):
@@ -633,14 +832,15 @@ cdef list _get_out_args_with_params(
     return out_args
 
 
-@_util.memoize(for_each_device=True)
-def _get_elementwise_kernel(
+cdef str _get_elementwise_kernel_code(
         tuple arginfos, _TypeMap type_map,
         tuple params, str operation, str name,
-        str preamble, str loop_prep='', str after_loop='', tuple options=()):
+        str preamble, str loop_prep='', str after_loop='', int vec_size=1):
     cdef _ArgInfo arginfo
 
     op = []
+    vec_load = []
+    vec_op = []
     for p, arginfo in zip(params, arginfos):
         if arginfo.is_ndarray() and not p.raw:
             if p.is_const:
@@ -648,11 +848,51 @@ def _get_elementwise_kernel(
             else:
                 fmt = '{t} &{n} = _raw_{n}[_ind.get()];'
             op.append(fmt.format(t=p.ctype, n=p.name))
+            if p.is_const:
+                # Outputs are not vectorized as they may be read by the
+                # operation.
+                vec_load.append(
+                    'CVector<{t}, {v}> _vec_{n}; '
+                    '_raw_{n}.load_vector(_i_vec, _vec_{n});'.format(
+                        t=_get_typename(arginfo.dtype), v=vec_size,
+                        n=p.name))
+                fmt = 'const {t} &{n} = _vec_{n}[_k];'
+            vec_op.append(fmt.format(t=p.ctype, n=p.name))
     op.append(operation)
-    operation = '\n'.join(op)
-    return _get_simple_elementwise_kernel(
-        params, arginfos, operation, name, type_map,
-        preamble, loop_prep, after_loop, options)
+    vec_op.append(operation)
+    if vec_size > 1:
+        return _get_vectorized_elementwise_kernel_code(
+            params, arginfos, '\n'.join(op), '\n'.join(vec_load),
+            '\n'.join(vec_op), '', name, type_map, preamble, vec_size)
+    return _get_simple_elementwise_kernel_code(
+        params, arginfos, '\n'.join(op), name, type_map,
+        preamble, loop_prep, after_loop)
+
+
+@_util.memoize(for_each_device=True)
+def _get_elementwise_kernel(
+        tuple arginfos, _TypeMap type_map,
+        tuple params, str operation, str name,
+        str preamble, str loop_prep='', str after_loop='', tuple options=(),
+        int vec_size=1):
+    module_code = _get_elementwise_kernel_code(
+        arginfos, type_map, params, operation, name, preamble, loop_prep,
+        after_loop, vec_size)
+    module = compile_with_cache(module_code, options)
+    return module.get_function(name)
+
+
+cpdef list _warmup(kernel, Py_ssize_t nin, dtypes, shapes, dict kwargs):
+    # Calls kernel.compile_async with temporary arrays of each combination of
+    # dtypes and shapes.
+    cdef list futures = []
+    for in_dtypes in dtypes:
+        if not isinstance(in_dtypes, (tuple, list)):
+            in_dtypes = (in_dtypes,) * nin
+        for shape in shapes:
+            args = [ndarray(shape, dtype) for dtype in in_dtypes]
+            futures.append(kernel.compile_async(*args, **kwargs))
+    return futures
 
 
 cdef class ElementwiseKernel:
@@ -712,6 +952,9 @@ cdef class ElementwiseKernel:
         readonly dict kwargs
         readonly dict _params_type_memo
         readonly dict _elementwise_kernel_memo
+        readonly dict _dispatch_cache
+        readonly bint _dispatchable
+        readonly bint _vectorizable
 
     def __init__(self, in_params, out_params, operation,
                  name='kernel', reduce_dims=True, preamble='',
@@ -739,6 +982,15 @@ cdef class ElementwiseKernel:
         if 'i' in names:
             raise ValueError('Can not use \'i\' as a parameter name')
         self._elementwise_kernel_memo = {}
+        self._dispatch_cache = {}
+        # Calls are dispatched by the argument signature only if the shapes
+        # of all the arguments are reduced in the same way.
+        self._dispatchable = reduce_dims and self.nargs >= 2 and not any(
+            [p.raw for p in self.in_params + self.out_params])
+        # Kernels with loop_prep or after_loop may depend on the elements
+        # processed by each thread, which are changed by vectorization.
+        self._vectorizable = not (
+            kwargs.get('loop_prep') or kwargs.get('after_loop'))
         # This is for profiling mechanisms to auto infer a name
         self.__name__ = name
 
@@ -758,7 +1010,8 @@ cdef class ElementwiseKernel:
                 are `raw` and the range size cannot be determined
                 automatically.
             block_size (int): Number of threads per block. By default, the
-                value is set to 128.
+                value is chosen for each kernel as specified by the
+                ``CUPY_LAUNCH_CONFIG`` environment variable.
 
         Returns:
             If ``no_return`` has not set, arrays are returned according to the
@@ -767,18 +1020,192 @@ cdef class ElementwiseKernel:
 
         """
         cdef function.Function kern
-        cdef Py_ssize_t size, i
-        cdef list in_args, out_args
-        cdef tuple in_types, out_types, types
+        cdef _carray.Indexer indexer
         cdef shape_t shape
 
         size = kwargs.pop('size', -1)
         stream = kwargs.pop('stream', None)
-        block_size = kwargs.pop('block_size', 128)
+        block_size = kwargs.pop('block_size', None)
         if len(kwargs):
             raise TypeError('Wrong arguments %s' % kwargs)
-        if block_size <= 0:
+        if block_size is None:
+            # Use the default launch configuration of the kernel.
+            block_size = 0
+        elif block_size <= 0:
             raise ValueError('block_size must be greater than zero')
+
+        # Fast path: calls without outputs whose arrays are C-contiguous and
+        # of the same shape are dispatched by the argument signature.
+        dispatch_key = None
+        if self._dispatchable and size == -1 and len(args) == self.nin:
+            dev_id = device.get_device_id()
+            arg_list = _preprocess_args(dev_id, args, True)
+            if _is_dispatchable(arg_list, shape):
+                in_ndarray_types = tuple([
+                    a.dtype.type if isinstance(a, ndarray) else None
+                    for a in arg_list])
+                dispatch_key = (dev_id, in_ndarray_types, shape.size() == 0)
+                entry = self._dispatch_cache.get(dispatch_key)
+                if entry is not None:
+                    return self._call_dispatched(
+                        entry, arg_list, shape, block_size, stream)
+
+        ret, dev_id, inout_args, arginfos, type_map, vec_size = (
+            self._prepare_call(args, size))
+        if inout_args is None:
+            return ret
+        indexer = inout_args[-1]
+        kern = self._get_elementwise_kernel(
+            dev_id, arginfos, type_map, vec_size)
+        if dispatch_key is not None:
+            in_types, out_types, _ = self._decide_params_type(
+                dispatch_key[1], ())
+            self._dispatch_cache[dispatch_key] = _DispatchEntry(
+                in_types, out_types, kern, self.name)
+        kern.linear_launch(
+            (indexer.size + vec_size - 1) // vec_size, inout_args,
+            shared_mem=0, block_max_size=block_size, stream=stream)
+        return ret
+
+    cdef _call_dispatched(
+            self, _DispatchEntry entry, list in_args, const shape_t& shape,
+            block_size, stream):
+        cdef list inout_args
+        cdef shape_t reduced_shape
+        cdef _carray.Indexer indexer
+        out_args = [_ndarray_init(shape, t) for t in entry.out_types]
+        if self.no_return:
+            ret = None
+        elif not self.return_tuple and self.nout == 1:
+            ret = out_args[0]
+        else:
+            ret = tuple(out_args)
+
+        if _contains_zero(shape):
+            return ret
+
+        for i, x in enumerate(in_args):
+            if type(x) is _scalar.CScalar:
+                (<_scalar.CScalar>x).apply_dtype(entry.in_types[i])
+        inout_args = in_args + out_args
+        reduced_shape = _reduce_dispatch_dims(inout_args, shape)
+        indexer = _carray._indexer_init(reduced_shape)
+        inout_args.append(indexer)
+        if compiler._compile_stats_collectors:
+            compiler._record_memo_hit(entry.name)
+        entry.kern.linear_launch(indexer.size, inout_args, shared_mem=0,
+                                 block_max_size=block_size, stream=stream)
+        return ret
+
+    def compile_async(self, *args, **kwargs):
+        """Compiles the kernel for the given arguments in a background thread.
+
+        The arguments are the same as :meth:`__call__`, but the kernel is not
+        launched; output arrays not given are allocated to determine the
+        kernel specialization. This allows preparing kernels (e.g., while
+        loading data) without blocking the calling thread. Concurrent
+        requests for the same kernel are compiled only once.
+
+        Returns:
+            concurrent.futures.Future: A future resolving to the compiled
+            :class:`~cupy.cuda.Function`, or ``None`` if the arguments are
+            empty and thus no kernel is needed.
+
+        """
+        size = kwargs.pop('size', -1)
+        kwargs.pop('stream', None)
+        kwargs.pop('block_size', None)
+        if len(kwargs):
+            raise TypeError('Wrong arguments %s' % kwargs)
+
+        _, dev_id, inout_args, arginfos, type_map, vec_size = (
+            self._prepare_call(args, size))
+        if inout_args is None:
+            return compiler._completed_future(None)
+        key = (dev_id, arginfos, type_map, vec_size)
+        kern = self._elementwise_kernel_memo.get(key, None)
+        if kern is not None:
+            return compiler._completed_future(kern)
+        return compiler._submit_compile(
+            (self,) + key, dev_id, self._get_elementwise_kernel,
+            dev_id, arginfos, type_map, vec_size)
+
+    def warmup(self, dtypes, shapes=((1,),), *, bundle=False, **kwargs):
+        """Compiles the kernel for the given dtypes and shapes in background.
+
+        Temporary input arrays are created for each combination of
+        ``dtypes`` and ``shapes``, and passed to :meth:`compile_async`.
+
+        Args:
+            dtypes (sequence): Sequence of the input dtypes to compile for.
+                Each element is either a tuple of dtypes of the input
+                arguments, or a single dtype used for all the inputs.
+            shapes (sequence of tuples): Shapes of the input arrays.
+            bundle (bool): If ``True``, all the specializations are compiled
+                together in a single program, which amortizes the fixed cost
+                of each compiler invocation.
+            kwargs: Keyword arguments passed to :meth:`compile_async`.
+
+        Returns:
+            list: The futures returned by :meth:`compile_async`. If
+            ``bundle`` is ``True``, a list of a single future resolving to
+            the list of the compiled kernels is returned instead (empty if
+            all of them are already compiled).
+
+        """
+        if not bundle:
+            return _warmup(self, self.nin, dtypes, shapes, kwargs)
+
+        size = kwargs.pop('size', -1)
+        kwargs.pop('stream', None)
+        kwargs.pop('block_size', None)
+        if len(kwargs):
+            raise TypeError('Wrong arguments %s' % kwargs)
+        keys = []
+        dev_id = device.get_device_id()
+        for in_dtypes in dtypes:
+            if not isinstance(in_dtypes, (tuple, list)):
+                in_dtypes = (in_dtypes,) * self.nin
+            for shape in shapes:
+                args = tuple([ndarray(shape, dtype) for dtype in in_dtypes])
+                _, _, inout_args, arginfos, type_map, vec_size = (
+                    self._prepare_call(args, size))
+                key = (dev_id, arginfos, type_map, vec_size)
+                if (inout_args is not None and key not in keys
+                        and key not in self._elementwise_kernel_memo):
+                    keys.append(key)
+        if not keys:
+            return []
+        return [compiler._submit_compile(
+            (self,) + tuple(keys), dev_id, self._compile_bundle, keys)]
+
+    def _compile_bundle(self, list keys):
+        # Compiles the kernels for the (dev_id, arginfos, type_map, vec_size)
+        # keys in a single program. The kernels are named after the argument
+        # types to make the names unique in the program.
+        cdef list codes = [], names = [], kernels
+        for _, arginfos, type_map, vec_size in keys:
+            name = _get_name_with_type(self.name, arginfos)
+            names.append(name)
+            codes.append(_get_elementwise_kernel_code(
+                arginfos, type_map, self.params, self.operation, name,
+                self.preamble, self.kwargs.get('loop_prep', ''),
+                self.kwargs.get('after_loop', ''), vec_size))
+        kernels = _get_kernel_bundle(
+            codes, names, self.kwargs.get('options', ()))
+        for key, kern in zip(keys, kernels):
+            self._elementwise_kernel_memo[key] = kern
+        return kernels
+
+    cdef tuple _prepare_call(self, tuple args, Py_ssize_t size):
+        # Processes the arguments and returns
+        # (ret, dev_id, inout_args, arginfos, type_map, vec_size). inout_args
+        # is None if there is nothing to launch.
+        cdef Py_ssize_t i
+        cdef list in_args, out_args
+        cdef tuple in_types, out_types
+        cdef shape_t shape
+
         n_args = len(args)
         if n_args != self.nin and n_args != self.nargs:
             raise TypeError(
@@ -824,7 +1251,7 @@ cdef class ElementwiseKernel:
             ret = tuple(out_args)
 
         if _contains_zero(shape):
-            return ret
+            return ret, dev_id, None, None, None, 1
 
         for i, x in enumerate(in_args):
             if type(x) is _scalar.CScalar:
@@ -837,11 +1264,12 @@ cdef class ElementwiseKernel:
         indexer = _carray._indexer_init(shape)
         inout_args.append(indexer)
 
+        vec_size = 1
+        if self._vectorizable:
+            vec_size = _get_vector_size(
+                inout_args, self.params, indexer.size, False)
         arginfos = _get_arginfos(inout_args)
-        kern = self._get_elementwise_kernel(dev_id, arginfos, type_map)
-        kern.linear_launch(indexer.size, inout_args, shared_mem=0,
-                           block_max_size=block_size, stream=stream)
-        return ret
+        return ret, dev_id, inout_args, arginfos, type_map, vec_size
 
     cpdef tuple _decide_params_type(
             self, tuple in_args_dtype, tuple out_args_dtype):
@@ -855,17 +1283,21 @@ cdef class ElementwiseKernel:
         return ret
 
     cpdef function.Function _get_elementwise_kernel(
-            self, int dev_id, tuple arginfos, _TypeMap type_map):
+            self, int dev_id, tuple arginfos, _TypeMap type_map,
+            int vec_size=1):
         key = (
             dev_id,
             arginfos,
-            type_map)
+            type_map,
+            vec_size)
         kern = self._elementwise_kernel_memo.get(key, None)
         if kern is not None:
+            if compiler._compile_stats_collectors:
+                compiler._record_memo_hit(self.name)
             return kern
         kern = _get_elementwise_kernel(
             arginfos, type_map, self.params, self.operation,
-            self.name, self.preamble, **self.kwargs)
+            self.name, self.preamble, vec_size=vec_size, **self.kwargs)
 
         # Store the compiled kernel in the cache.
         # Potentially overwrite a duplicate cache entry because
@@ -874,13 +1306,16 @@ cdef class ElementwiseKernel:
         return kern
 
 
-cdef function.Function _get_ufunc_kernel(
+cdef str _get_ufunc_kernel_code(
         tuple in_types, tuple out_types, routine, tuple arginfos, params,
-        name, preamble, loop_prep):
+        name, preamble, loop_prep, int vec_size=1):
     cdef _ArgInfo arginfo
 
     types = []
     op = []
+    vec_load = []
+    vec_op = []
+    vec_store = []
     for i, x in enumerate(in_types):
         types.append(('in%d_type' % i, x))
         arginfo = arginfos[i]
@@ -888,21 +1323,46 @@ cdef function.Function _get_ufunc_kernel(
             op.append(
                 'const in{0}_type in{0}(_raw_in{0}[_ind.get()]);'
                 .format(i))
+            vec_load.append(
+                'CVector<{1}, {2}> _vec_in{0}; '
+                '_raw_in{0}.load_vector(_i_vec, _vec_in{0});'.format(
+                    i, _get_typename(arginfo.dtype), vec_size))
+            vec_op.append(
+                'const in{0}_type in{0}(_vec_in{0}[_k]);'.format(i))
 
     for i, x in enumerate(out_types):
         arginfo = arginfos[i + len(in_types)]
         types.append(('out%d_type' % i, arginfo.dtype))
         op.append('out{0}_type &out{0} = _raw_out{0}[_ind.get()];'.format(i))
+        vec_load.append('CVector<out{0}_type, {1}> _vec_out{0};'.format(
+            i, vec_size))
+        vec_op.append('out{0}_type &out{0} = _vec_out{0}[_k];'.format(i))
+        vec_store.append(
+            '_raw_out{0}.store_vector(_i_vec, _vec_out{0});'.format(i))
     type_map = _TypeMap(tuple(types))
 
     op.append(routine)
-    operation = '\n'.join(op)
-
-    return _get_simple_elementwise_kernel(
-        params, arginfos, operation, name, type_map, preamble,
+    vec_op.append(routine)
+    if vec_size > 1:
+        return _get_vectorized_elementwise_kernel_code(
+            params, arginfos, '\n'.join(op), '\n'.join(vec_load),
+            '\n'.join(vec_op), '\n'.join(vec_store), name, type_map,
+            preamble, vec_size)
+    return _get_simple_elementwise_kernel_code(
+        params, arginfos, '\n'.join(op), name, type_map, preamble,
         loop_prep=loop_prep)
 
 
+cdef function.Function _get_ufunc_kernel(
+        tuple in_types, tuple out_types, routine, tuple arginfos, params,
+        name, preamble, loop_prep, int vec_size=1):
+    module_code = _get_ufunc_kernel_code(
+        in_types, out_types, routine, arginfos, params, name, preamble,
+        loop_prep, vec_size)
+    module = compile_with_cache(module_code)
+    return module.get_function(name)
+
+
 cdef inline bint _check_should_use_min_scalar(list in_args) except? -1:
     cdef int kind, max_array_kind, max_scalar_kind
     cdef bint all_scalars
@@ -941,6 +1401,16 @@ cdef _min_scalar_type(x):
     return dt
 
 
+cdef tuple _get_in_types(list in_args):
+    # Returns the types of the input arguments used to guess the routine.
+    if _check_should_use_min_scalar(in_args):
+        return tuple([
+            a.dtype.type if isinstance(a, ndarray)
+            else _min_scalar_type(a)
+            for a in in_args])
+    return tuple([a.dtype.type for a in in_args])
+
+
 cdef class ufunc:
 
     """Universal function.
@@ -967,6 +1437,7 @@ cdef class ufunc:
         readonly tuple _params
         readonly dict _routine_cache
         readonly dict _kernel_memo
+        readonly dict _dispatch_cache
         readonly object __doc__
         readonly object __name__
         readonly object __module__
@@ -998,6 +1469,7 @@ cdef class ufunc:
             ParameterInfo('CIndexer _ind', False),)
         self._routine_cache = {}
         self._kernel_memo = {}
+        self._dispatch_cache = {}
 
     def __repr__(self):
         return '<ufunc \'%s\'>' % self.name
@@ -1059,6 +1531,20 @@ cdef class ufunc:
 
         dev_id = device.get_device_id()
         arg_list = _preprocess_args(dev_id, args, False)
+
+        # Fast path: calls without outputs whose arrays are C-contiguous and
+        # of the same shape are dispatched by the argument signature. The
+        # entries are only valid for the default casting rule.
+        dispatch_key = None
+        if (out is None and dtype is None and n_args == self.nin
+                and casting is self._default_casting):
+            if _is_dispatchable(arg_list, shape):
+                dispatch_key = (
+                    dev_id, _get_in_types(arg_list), shape.size() == 0)
+                entry = self._dispatch_cache.get(dispatch_key)
+                if entry is not None:
+                    return self._call_dispatched(entry, arg_list, shape)
+
         if out is None:
             in_args = arg_list[:self.nin]
             out_args = arg_list[self.nin:]
@@ -1100,34 +1586,115 @@ cdef class ufunc:
         indexer = _carray._indexer_init(shape)
         inout_args.append(indexer)
         arginfos = _get_arginfos(inout_args)
+        vec_size = 1
+        if not self._loop_prep:
+            vec_size = _get_vector_size(
+                inout_args, self._params, indexer.size, True)
+
+        kern = self._get_ufunc_kernel(dev_id, op, arginfos, vec_size)
+        if dispatch_key is not None:
+            self._dispatch_cache[dispatch_key] = _DispatchEntry(
+                op.in_types, op.out_types, kern,
+                self._get_name_with_type(arginfos))
+
+        kern.linear_launch(
+            (indexer.size + vec_size - 1) // vec_size, inout_args)
+        return ret
 
-        kern = self._get_ufunc_kernel(dev_id, op, arginfos)
+    cdef _call_dispatched(
+            self, _DispatchEntry entry, list in_args, const shape_t& shape):
+        cdef list inout_args
+        cdef shape_t reduced_shape
+        cdef _carray.Indexer indexer
+        out_args = [_ndarray_init(shape, t) for t in entry.out_types]
+        if self.nout == 1:
+            ret = out_args[0]
+        else:
+            ret = tuple(out_args)
 
-        kern.linear_launch(indexer.size, inout_args)
+        if _contains_zero(shape):
+            return ret
+
+        inout_args = []
+        for i, t in enumerate(entry.in_types):
+            x = in_args[i]
+            inout_args.append(
+                x if isinstance(x, ndarray) else
+                _scalar.CScalar.from_numpy_scalar_with_dtype(x, t))
+        inout_args.extend(out_args)
+        reduced_shape = _reduce_dispatch_dims(inout_args, shape)
+        indexer = _carray._indexer_init(reduced_shape)
+        inout_args.append(indexer)
+        if compiler._compile_stats_collectors:
+            compiler._record_memo_hit(entry.name)
+        entry.kern.linear_launch(indexer.size, inout_args)
         return ret
 
     cdef str _get_name_with_type(self, tuple arginfos):
-        cdef _ArgInfo arginfo
-        inout_type_words = []
-        for arginfo in arginfos:
-            dtype = str(numpy.dtype(arginfo.dtype))
-            if arginfo.is_ndarray():
-                inout_type_words.append(dtype)
-            elif arginfo.is_scalar():
-                inout_type_words.append(dtype.rstrip('0123456789'))
-        return '{}__{}'.format(self.name, '_'.join(inout_type_words))
+        return _get_name_with_type(self.name, arginfos)
+
+    def compile_all(self):
+        """Compiles the kernels of all the type signatures at once.
+
+        The kernels for C-contiguous array arguments (the most common case)
+        of all the type signatures listed in :attr:`types` are compiled
+        together, which is much faster than compiling them one by one at the
+        first call with each dtype. The vectorized kernels used for large
+        arrays of 1, 2 or 4-byte types are also compiled. Kernels for other
+        cases (e.g., non-contiguous arrays or Python scalar arguments) are
+        still compiled at the first call.
+
+        """
+        cdef _Op op
+        cdef int dev_id = device.get_device_id()
+        cdef int vec_size
+        cdef list keys = [], codes = [], names = []
+        indexer_info = _ArgInfo(
+            ARG_KIND_INDEXER, _carray.Indexer, None, 1, True, True)
+        for op in self._ops.ops:
+            if op.error_func is not None:
+                continue
+            types = op.in_types + op.out_types
+            arginfos = tuple([
+                _ArgInfo(ARG_KIND_NDARRAY, ndarray, t, 1, True, True)
+                for t in types]) + (indexer_info,)
+            vec_sizes = [1]
+            # See _get_vector_size.
+            if not self._loop_prep and all([
+                    numpy.dtype(t).itemsize in (1, 2, 4)
+                    and numpy.dtype(t).kind in 'biuf' for t in types]):
+                vec_sizes.append(_vector_bytes // max([
+                    numpy.dtype(t).itemsize for t in types]))
+            name = self._get_name_with_type(arginfos)
+            for vec_size in vec_sizes:
+                key = (dev_id, op, arginfos, vec_size)
+                if key in self._kernel_memo:
+                    continue
+                keys.append(key)
+                names.append(name)
+                codes.append(_get_ufunc_kernel_code(
+                    op.in_types, op.out_types, op.routine, arginfos,
+                    self._params, name, self._preamble, self._loop_prep,
+                    vec_size))
+        # The vectorized kernels share the names with the scalar ones, so
+        # they are compiled in another program.
+        for key, kern in zip(keys, _get_kernel_bundle(codes, names)):
+            self._kernel_memo[key] = kern
 
     cdef function.Function _get_ufunc_kernel(
-            self, int dev_id, _Op op, tuple arginfos):
+            self, int dev_id, _Op op, tuple arginfos, int vec_size):
         cdef function.Function kern
-        key = (dev_id, op, arginfos)
+        key = (dev_id, op, arginfos, vec_size)
         kern = self._kernel_memo.get(key, None)
         if kern is None:
             name = self._get_name_with_type(arginfos)
             kern = _get_ufunc_kernel(
                 op.in_types, op.out_types, op.routine, arginfos,
-                self._params, name, self._preamble, self._loop_prep)
+                self._params, name, self._preamble, self._loop_prep,
+                vec_size)
             self._kernel_memo[key] = kern
+        elif compiler._compile_stats_collectors:
+            compiler._record_memo_hit(self._get_name_with_type(arginfos))
         return kern
 
 
@@ -1213,14 +1780,7 @@ cdef class _Ops:
             self, str name, dict cache, list in_args, dtype, _Ops out_ops):
         cdef _Ops ops_
         if dtype is None:
-            use_raw_value = _check_should_use_min_scalar(in_args)
-            if use_raw_value:
-                in_types = tuple([
-                    a.dtype.type if isinstance(a, ndarray)
-                    else _min_scalar_type(a)
-                    for a in in_args])
-            else:
-                in_types = tuple([a.dtype.type for a in in_args])
+            in_types = _get_in_types(in_args)
             op = cache.get(in_types, ())
             if op is ():
                 op = self._guess_routine_from_in_types(in_types)
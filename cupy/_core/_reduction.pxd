@@ -28,13 +28,14 @@ cdef class _AbstractReductionKernel:
         list in_args, list out_args,
         const shape_t& a_shape, axis, dtype,
         bint keepdims, bint reduce_dims, int device_id,
-        stream, bint try_use_cub=*, bint sort_reduce_axis=*)
+        stream, bint try_use_cub=*, bint sort_reduce_axis=*,
+        bint compile_only=*)
 
     cdef void _launch(
         self, out_block_num, block_size, block_stride,
         in_args, out_args, in_shape, out_shape, types,
         map_expr, reduce_expr, post_map_expr, reduce_type,
-        stream, params)
+        stream, params, bint compile_only)
 
     cdef tuple _get_expressions_and_types(
         self, list in_args, list out_args, dtype)
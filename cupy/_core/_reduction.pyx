@@ -48,13 +48,25 @@ cpdef function.Function _create_reduction_function(
         name, block_size, reduce_type, params, arginfos, identity,
         pre_map_expr, reduce_expr, post_map_expr,
         _kernel._TypeMap type_map, input_expr, output_expr, preamble, options):
+    module_code = _get_reduction_kernel_code(
+        name, block_size, reduce_type, params, arginfos, identity,
+        pre_map_expr, reduce_expr, post_map_expr,
+        type_map, input_expr, output_expr, preamble)
+    module = compile_with_cache(module_code, options)
+    return module.get_function(name)
+
+
+cpdef str _get_reduction_kernel_code(
+        name, block_size, reduce_type, params, arginfos, identity,
+        pre_map_expr, reduce_expr, post_map_expr,
+        _kernel._TypeMap type_map, input_expr, output_expr, preamble):
     # A (incomplete) list of internal variables:
     # _J            : the index of an element in the array
     # _block_size   : the number of threads in a block; should be power of 2
     # _block_stride : the number of elements being processed by a block; should
     #                 be power of 2 and <= _block_size
 
-    module_code = string.Template('''
+    return string.Template('''
 ${type_preamble}
 ${preamble}
 #define REDUCE(a, b) (${reduce_expr})
@@ -120,8 +132,6 @@ extern "C" __global__ void ${name}(${params}) {
         input_expr=input_expr,
         output_expr=output_expr,
         preamble=preamble)
-    module = compile_with_cache(module_code, options)
-    return module.get_function(name)
 
 
 cpdef tuple _get_axis(object axis, Py_ssize_t ndim):
@@ -285,7 +295,10 @@ cdef class _AbstractReductionKernel:
             list in_args, list out_args,
             const shape_t& a_shape, axis, dtype,
             bint keepdims, bint reduce_dims, int device_id,
-            stream, bint try_use_cub=False, bint sort_reduce_axis=True):
+            stream, bint try_use_cub=False, bint sort_reduce_axis=True,
+            bint compile_only=False):
+        # If compile_only is True, only the kernel is compiled (or retrieved
+        # from the cache) and not launched.
         cdef tuple reduce_axis, out_axis, axis_permutes
         cdef tuple params, opt_params
         cdef tuple shape_and_strides
@@ -332,7 +345,11 @@ cdef class _AbstractReductionKernel:
                    _scalar.CScalar.from_numpy_scalar_with_dtype(x, t)
                    for x, t in zip(in_args, in_types)]
 
-        optimize_context = _optimize_config.get_current_context()
+        if compile_only:
+            try_use_cub = False
+            optimize_context = None
+        else:
+            optimize_context = _optimize_config.get_current_context()
         key = ()
         if optimize_context is not None:
             # Calculate a key unique to the reduction setting.
@@ -390,7 +407,7 @@ cdef class _AbstractReductionKernel:
             in_shape, out_shape,
             type_map,
             map_expr, reduce_expr, post_map_expr, reduce_type,
-            stream, params)
+            stream, params, compile_only)
 
         return ret
 
@@ -415,7 +432,7 @@ cdef class _AbstractReductionKernel:
             self._launch(
                 out_block_num, block_size, block_stride, in_args, out_args,
                 in_shape, out_shape, type_map, map_expr, reduce_expr,
-                post_map_expr, reduce_type, stream, self._params)
+                post_map_expr, reduce_type, stream, self._params, False)
 
         def suggest_func(trial):
             block_size_log = trial.suggest_int('block_size_log', 5, 9)
@@ -449,7 +466,7 @@ cdef class _AbstractReductionKernel:
             self, out_block_num, block_size, block_stride,
             in_args, out_args, in_shape, out_shape, type_map,
             map_expr, reduce_expr, post_map_expr, reduce_type,
-            stream, params):
+            stream, params, bint compile_only):
         cdef function.Function func
 
         inout_args = (
@@ -469,6 +486,8 @@ cdef class _AbstractReductionKernel:
             type_map,
             map_expr, reduce_expr, post_map_expr, reduce_type,
             block_size)
+        if compile_only:
+            return
 
         # Launch the kernel
         func.linear_launch(
@@ -714,8 +733,50 @@ cdef class ReductionKernel(_AbstractReductionKernel):
             ``__init__`` method.
 
         """
+        return self._call_with_args(args, kwargs, False)
+
+    def compile_async(self, *args, **kwargs):
+        """Compiles the kernel for the given arguments in a background thread.
+
+        The arguments are the same as :meth:`__call__`, but the kernel is not
+        launched. This allows preparing kernels (e.g., while loading data)
+        without blocking the calling thread. Concurrent requests for the same
+        arguments are compiled only once.
+
+        Returns:
+            concurrent.futures.Future: A future which is resolved when the
+            kernel is compiled.
+
+        """
+        cdef int dev_id = device.get_device_id()
+        key = (self, dev_id, _get_compile_key(args, kwargs))
+        return compiler._submit_compile(
+            key, dev_id, self._call_with_args, args, kwargs, True)
+
+    def warmup(self, dtypes, shapes=((1,),), **kwargs):
+        """Compiles the kernel for the given dtypes and shapes in background.
+
+        Temporary input arrays are created for each combination of
+        ``dtypes`` and ``shapes``, and passed to :meth:`compile_async`.
+
+        Args:
+            dtypes (sequence): Sequence of the input dtypes to compile for.
+                Each element is either a tuple of dtypes of the input
+                arguments, or a single dtype used for all the inputs.
+            shapes (sequence of tuples): Shapes of the input arrays.
+            kwargs: Keyword arguments passed to :meth:`compile_async`, such
+                as ``axis`` and ``keepdims``.
+
+        Returns:
+            list: The futures returned by :meth:`compile_async`.
+
+        """
+        return _kernel._warmup(self, self.nin, dtypes, shapes, kwargs)
+
+    def _call_with_args(self, tuple args, dict kwargs, bint compile_only):
         cdef shape_t broad_shape
 
+        kwargs = dict(kwargs)
         out = kwargs.pop('out', None)
         axis = kwargs.pop('axis', None)
         keepdims = kwargs.pop('keepdims', False)
@@ -741,10 +802,12 @@ cdef class ReductionKernel(_AbstractReductionKernel):
         out_args = _preprocess_args(dev_id, out_args, False)
         in_args = _broadcast(in_args, self.in_params, False, broad_shape)
 
-        return self._call(
+        ret = self._call(
             in_args, out_args,
             broad_shape, axis, None,
-            keepdims, self.reduce_dims, dev_id, stream, True, True)
+            keepdims, self.reduce_dims, dev_id, stream, True, True,
+            compile_only)
+        return None if compile_only else ret
 
     cdef tuple _get_expressions_and_types(
             self, list in_args, list out_args, dtype):
@@ -780,6 +843,24 @@ cdef class ReductionKernel(_AbstractReductionKernel):
             self.preamble, self.options)
 
 
+cdef tuple _get_compile_key(tuple args, dict kwargs):
+    # Summarizes the arguments that determine the compiled reduction kernel.
+    cdef list key = []
+    for a in args:
+        if isinstance(a, ndarray):
+            key.append((a.dtype, a.shape, a.strides))
+        else:
+            key.append(type(a))
+    out = kwargs.get('out', None)
+    if out is not None:
+        key.append((out.dtype, out.shape, out.strides))
+    axis = kwargs.get('axis', None)
+    if isinstance(axis, list):
+        axis = tuple(axis)
+    key.append((axis, bool(kwargs.get('keepdims', False))))
+    return tuple(key)
+
+
 @_util.memoize(for_each_device=True)
 def _ReductionKernel_get_cached_function(
         nin, nout, params, arginfos, _kernel._TypeMap type_map,
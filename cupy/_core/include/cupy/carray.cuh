@@ -208,6 +208,46 @@ struct Dim {
 };
 #endif
 
+namespace cupy {
+  // Types of the vectors of 4, 8 and 16 bytes loaded or stored at once.
+  template <int _bytes> struct _vector_storage {};
+  template <> struct _vector_storage<4> { typedef unsigned int type; };
+  template <> struct _vector_storage<8> { typedef uint2 type; };
+  template <> struct _vector_storage<16> { typedef uint4 type; };
+}
+
+// Vector of _size elements of T, which are loaded from or stored to a
+// contiguous array by a single memory access.
+//    CVector<float, 4> v;
+//    a.load_vector(i, v);  // loads a[4 * i], ..., a[4 * i + 3]
+//    v[0] += 1;
+//    a.store_vector(i, v);
+template <typename T, int _size>
+class CVector {
+public:
+  static const int size = _size;
+private:
+  typedef typename cupy::_vector_storage<sizeof(T) * _size>::type storage_t;
+  storage_t data_;
+
+public:
+  __device__ T& operator[](int k) {
+    return reinterpret_cast<T*>(&data_)[k];
+  }
+
+  __device__ const T& operator[](int k) const {
+    return reinterpret_cast<const T*>(&data_)[k];
+  }
+
+  __device__ void load(const T* data, ptrdiff_t i) {
+    data_ = reinterpret_cast<const storage_t*>(data)[i];
+  }
+
+  __device__ void store(T* data, ptrdiff_t i) const {
+    reinterpret_cast<storage_t*>(data)[i] = data_;
+  }
+};
+
 template <typename T, int _ndim, bool _c_contiguous=false, bool _use_32bit_indexing=false>
 class CArray {
 public:
@@ -338,6 +378,18 @@ public:
     return const_cast<T&>(const_cast<const CArray&>(*this)[i]);
   }
 
+  // Loads or stores the i-th vector of the elements. The array must be
+  // contiguous and the data must be aligned to the size of the vector.
+  template <int _size>
+  __device__ void load_vector(ptrdiff_t i, CVector<T, _size>& v) const {
+    v.load(data_, i);
+  }
+
+  template <int _size>
+  __device__ void store_vector(ptrdiff_t i, const CVector<T, _size>& v) {
+    v.store(data_, i);
+  }
+
 #ifdef CUPY_JIT_MODE
   template <typename Tuple, int dim>
   __forceinline__ __device__ const T& _indexing(const Tuple &idx, Dim<dim>, const char* ptr) const {
@@ -441,10 +493,13 @@ public:
   }
 };
 
-template <int _ndim>
+template <int _ndim, bool _use_32bit_indexing=false>
 class CIndexer {
 public:
   static const int ndim = _ndim;
+  // If true, the size must not exceed 2^31 so that the index is decomposed
+  // by 32-bit arithmetic without checking the size at runtime.
+  static const bool use_32bit_indexing = _use_32bit_indexing;
 private:
   ptrdiff_t size_;
   ptrdiff_t shape_[ndim];
@@ -515,7 +570,7 @@ public:
     // ndim == 0 case uses partial template specialization
     if (ndim == 1) {
       index_[0] = i;
-    } else if (size_ > 1LL << 31) {
+    } else if (!_use_32bit_indexing && size_ > 1LL << 31) {
       // 64-bit division is very slow on GPU
       this->_set(static_cast<unsigned long long int>(i));
     } else {
@@ -545,13 +600,14 @@ private:
   static unsigned long long int __device__ _log2(unsigned long long int x) { return __popcll(x-1); }
 };
 
-template <>
-class CIndexer<0> {
+template <bool _use_32bit_indexing>
+class CIndexer<0, _use_32bit_indexing> {
 private:
   ptrdiff_t size_;
 
 public:
   static const int ndim = 0;
+  static const bool use_32bit_indexing = _use_32bit_indexing;
 
   __device__ CIndexer() : size_(1) { }
 
@@ -1,6 +1,7 @@
 import pickle
 
 import cupy
+from cupy.cuda import compiler
 
 from cupy_backends.cuda.api cimport driver
 from cupy_backends.cuda.api cimport runtime
@@ -95,6 +96,22 @@ cdef class RawKernel:
     def kernel(self):
         return self._kernel()
 
+    def compile_async(self):
+        """Compiles the kernel for the current device in a background thread.
+
+        This allows preparing kernels (e.g., while loading data) without
+        blocking the calling thread. Concurrent requests for the same kernel
+        are compiled only once.
+
+        Returns:
+            concurrent.futures.Future: A future resolving to the compiled
+            :class:`~cupy.cuda.Function`.
+        """
+        cdef int dev = runtime.getDevice()
+        if self._kernel_cache and self._kernel_cache[dev] is not None:
+            return compiler._completed_future(self._kernel_cache[dev])
+        return compiler._submit_compile((self, dev), dev, self._kernel)
+
     def _kernel(self, log_stream=None):
         # The kernel is cached, so on the device where this has been called,
         # we would just look up from the cache, and do recompiling only when
@@ -116,6 +133,8 @@ cdef class RawKernel:
                 self.jitify, self.name_expressions, log_stream)
             ker = mod.get_function(self.name)
             self._kernel_cache[dev] = ker
+        elif compiler._compile_stats_collectors:
+            compiler._record_memo_hit(self.name)
         return ker
 
     # It is not possible to implement __reduce__ for a cdef class. The
@@ -1,12 +1,240 @@
+import os
+import queue
+import threading
 import warnings
+import zipfile
 
 import numpy
 
 import cupy
+from cupy import _util
+from cupy import cuda
+from cupy.cuda import pinned_memory
+from cupy_backends.cuda.api import runtime
 
 
 _support_allow_pickle = (numpy.lib.NumpyVersion(numpy.__version__) >= '1.10.0')
 
+# Size of each of the staging buffers used to stream an array between the
+# file and the device.
+_chunk_size = 16 * 1024 * 1024
+
+# Number of the staging buffers rotated while saving an array.
+_n_write_buffers = 3
+
+
+def _alloc_staging_buffer(size):
+    try:
+        mem = pinned_memory.alloc_pinned_memory(size)
+    except runtime.CUDARuntimeError as e:
+        if e.status != runtime.errorMemoryAllocation:
+            raise
+        warnings.warn(
+            'Using synchronous transfer as pinned memory ({} bytes) '
+            'could not be allocated. '
+            'This generally occurs because of insufficient host memory. '
+            'The original error was: {}'.format(size, e),
+            _util.PerformanceWarning)
+        return None, numpy.empty(size, dtype=numpy.uint8)
+    return mem, numpy.frombuffer(mem, numpy.uint8, size)
+
+
+def _is_streamable(dtype):
+    return dtype.char in '?bhilqBHILQefdFD' and dtype.isnative
+
+
+def _file_reader(fp):
+    readinto = getattr(fp, 'readinto', None)
+
+    def read(buf, offset):
+        n = buf.nbytes
+        if readinto is None:
+            data = fp.read(n)
+            got = len(data)
+            buf[:got] = numpy.frombuffer(data, numpy.uint8)
+        else:
+            view = memoryview(buf)
+            got = 0
+            while got < n:
+                r = readinto(view[got:])
+                if not r:
+                    break
+                got += r
+        if got != n:
+            raise ValueError(
+                'EOF: reading array data, expected {} bytes got {}'.format(
+                    n, got))
+    return read
+
+
+def _buffer_reader(arr):
+    src = arr.ravel(order='K').view(numpy.uint8)
+
+    def read(buf, offset):
+        buf[...] = src[offset:offset + buf.nbytes]
+    return read
+
+
+def _copy_to_device(read, out):
+    # Streams the data into ``out`` through a pair of staging buffers, so
+    # that reading a chunk on the host overlaps the transfer of the
+    # previous one and the host memory used is bounded by the buffers.
+    nbytes = out.nbytes
+    if nbytes == 0:
+        return
+    chunk = min(_chunk_size, nbytes)
+    buffers = [_alloc_staging_buffer(chunk)
+               for _ in range(2 if chunk < nbytes else 1)]
+    events = [None] * len(buffers)
+    stream = cuda.get_current_stream()
+    offset = 0
+    i = 0
+    while offset < nbytes:
+        n = min(chunk, nbytes - offset)
+        mem, host = buffers[i]
+        if events[i] is not None:
+            events[i].synchronize()
+        read(host[:n], offset)
+        dst = out.data + offset
+        if mem is None:
+            dst.copy_from_host(host.ctypes.data, n)
+        else:
+            dst.copy_from_host_async(mem.ptr, n, stream)
+            events[i] = stream.record()
+        offset += n
+        i = (i + 1) % len(buffers)
+    for (mem, _), event in zip(buffers, events):
+        if event is not None:
+            pinned_memory._add_to_watch_list(event, mem)
+
+
+def _copy_to_file(arr, fp):
+    # Streams the data of a contiguous array into ``fp`` through rotating
+    # staging buffers. A writer thread writes (and compresses, in the case
+    # of compressed zip members) each chunk while the following ones are
+    # transferred, so the host memory used is bounded by the buffers.
+    nbytes = arr.nbytes
+    if nbytes == 0:
+        return
+    chunk = min(_chunk_size, nbytes)
+    free = queue.Queue()
+    for _ in range(min(_n_write_buffers, -(-nbytes // chunk))):
+        free.put(_alloc_staging_buffer(chunk))
+    pending = queue.Queue()
+    errors = []
+
+    def write():
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            buf, event, n = item
+            try:
+                if event is not None:
+                    event.synchronize()
+                if not errors:
+                    fp.write(memoryview(buf[1][:n]))
+            except Exception as e:
+                errors.append(e)
+            free.put(buf)
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    try:
+        with arr.device:
+            stream = cuda.get_current_stream()
+            offset = 0
+            while offset < nbytes and not errors:
+                n = min(chunk, nbytes - offset)
+                buf = free.get()
+                mem, host = buf
+                src = arr.data + offset
+                if mem is None:
+                    src.copy_to_host(host.ctypes.data, n)
+                    event = None
+                else:
+                    src.copy_to_host_async(mem.ptr, n, stream)
+                    event = stream.record()
+                pending.put((buf, event, n))
+                offset += n
+    finally:
+        pending.put(None)
+        writer.join()
+    if errors:
+        raise errors[0]
+
+
+def _write_npy(fp, arr, allow_pickle):
+    if not (isinstance(arr, cupy.ndarray) and _is_streamable(arr.dtype)):
+        numpy.lib.format.write_array(
+            fp, numpy.asanyarray(cupy.asnumpy(arr)), allow_pickle=allow_pickle)
+        return
+    if not (arr.flags.c_contiguous or arr.flags.f_contiguous):
+        arr = cupy.ascontiguousarray(arr)
+    header = {
+        'descr': numpy.lib.format.dtype_to_descr(arr.dtype),
+        'fortran_order': not arr.flags.c_contiguous,
+        'shape': arr.shape,
+    }
+    try:
+        numpy.lib.format.write_array_header_1_0(fp, header)
+    except ValueError:
+        # The header is too large for the version 1.0.
+        numpy.lib.format.write_array_header_2_0(fp, header)
+    _copy_to_file(arr, fp)
+
+
+def _savez(file, args, kwds, compress):
+    if not hasattr(file, 'write'):
+        file = os.fspath(file)
+        if not file.endswith('.npz'):
+            file = file + '.npz'
+    arrays = dict(kwds)
+    for i, val in enumerate(args):
+        key = 'arr_%d' % i
+        if key in arrays:
+            raise ValueError(
+                'Cannot use un-named variables and keyword %s' % key)
+        arrays[key] = val
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(file, mode='w', compression=compression,
+                         allowZip64=True) as zip_file:
+        for key, val in arrays.items():
+            with zip_file.open(key + '.npy', 'w', force_zip64=True) as fp:
+                _write_npy(fp, val, True)
+
+
+def _read_npy_header(fp):
+    version = numpy.lib.format.read_magic(fp)
+    if version == (1, 0):
+        return numpy.lib.format.read_array_header_1_0(fp)
+    elif version == (2, 0):
+        return numpy.lib.format.read_array_header_2_0(fp)
+    return None
+
+
+def _load_npy(file):
+    # Reads an array in the ``.npy`` format into the current device without
+    # materializing it on the host. Returns ``None`` if the file is not in
+    # the format or the array cannot be streamed, leaving the file position
+    # unchanged.
+    if not hasattr(file, 'read'):
+        with open(os.fspath(file), 'rb') as f:
+            return _load_npy(f)
+    start = file.tell()
+    magic = file.read(len(numpy.lib.format.MAGIC_PREFIX))
+    file.seek(start)
+    if magic != numpy.lib.format.MAGIC_PREFIX:
+        return None
+    header = _read_npy_header(file)
+    if header is None or not _is_streamable(header[2]):
+        file.seek(start)
+        return None
+    shape, fortran_order, dtype = header
+    out = cupy.ndarray(shape, dtype, order='F' if fortran_order else 'C')
+    _copy_to_device(_file_reader(file), out)
+    return out
+
 
 class NpzFile(object):
 
@@ -21,6 +249,15 @@ class NpzFile(object):
         self.npz_file.__exit__(typ, val, traceback)
 
     def __getitem__(self, key):
+        zip_file = getattr(self.npz_file, 'zip', None)
+        if zip_file is not None:
+            names = zip_file.namelist()
+            member = key if key in names else key + '.npy'
+            if member in names:
+                with zip_file.open(member) as fp:
+                    arr = _load_npy(fp)
+                if arr is not None:
+                    return arr
         arr = self.npz_file[key]
         return cupy.array(arr)
 
@@ -31,15 +268,18 @@ class NpzFile(object):
 def load(file, mmap_mode=None, allow_pickle=None):
     """Loads arrays or pickled objects from ``.npy``, ``.npz`` or pickled file.
 
-    This function just calls ``numpy.load`` and then sends the arrays to the
-    current device. NPZ file is converted to NpzFile object, which defers the
+    Arrays in the ``.npy`` format are streamed to the current device in
+    chunks through pinned memory buffers, so that the whole array is never
+    materialized on the host and reading the file overlaps the transfer.
+    Other files are loaded by ``numpy.load`` and then sent to the current
+    device. NPZ file is converted to NpzFile object, which defers the
     transfer to the time of accessing the items.
 
     Args:
         file (file-like object or string): The file to read.
         mmap_mode (None, 'r+', 'r', 'w+', 'c'): If not ``None``, memory-map the
             file to construct an intermediate :class:`numpy.ndarray` object and
-            transfer it to the current device.
+            transfer it to the current device in chunks.
         allow_pickle (bool): Allow loading pickled object arrays stored in npy
             files. Reasons for disallowing pickles include security, as
             loading pickled data can execute arbitrary code. If pickles are
@@ -59,6 +299,11 @@ def load(file, mmap_mode=None, allow_pickle=None):
     .. seealso:: :func:`numpy.load`
 
     """
+    if mmap_mode is None:
+        arr = _load_npy(file)
+        if arr is not None:
+            return arr
+
     if _support_allow_pickle:
         allow_pickle = False if allow_pickle is None else allow_pickle
         obj = numpy.load(file, mmap_mode, allow_pickle)
@@ -68,6 +313,13 @@ def load(file, mmap_mode=None, allow_pickle=None):
         obj = numpy.load(file, mmap_mode)
 
     if isinstance(obj, numpy.ndarray):
+        if (mmap_mode is not None and _is_streamable(obj.dtype) and
+                (obj.flags.c_contiguous or obj.flags.f_contiguous)):
+            out = cupy.ndarray(
+                obj.shape, obj.dtype,
+                order='C' if obj.flags.c_contiguous else 'F')
+            _copy_to_device(_buffer_reader(obj), out)
+            return out
         return cupy.array(obj)
     elif isinstance(obj, numpy.lib.npyio.NpzFile):
         return NpzFile(obj)
@@ -81,7 +333,9 @@ def save(file, arr, allow_pickle=None):
     Args:
         file (file or str): File or filename to save.
         arr (array_like): Array to save. It should be able to feed to
-            :func:`cupy.asnumpy`.
+            :func:`cupy.asnumpy`. A :class:`cupy.ndarray` is transferred
+            to the host in chunks through pinned memory buffers, which are
+            written to the file while the following chunks are transferred.
         allow_pickle (bool): Allow saving object arrays using Python pickles.
             Reasons for disallowing pickles include security (loading pickled
             data can execute arbitrary code) and portability (pickled objects
@@ -99,7 +353,17 @@ def save(file, arr, allow_pickle=None):
     """
     if _support_allow_pickle:
         allow_pickle = True if allow_pickle is None else allow_pickle
-        numpy.save(file, cupy.asnumpy(arr), allow_pickle)
+        if isinstance(arr, cupy.ndarray):
+            if hasattr(file, 'write'):
+                _write_npy(file, arr, allow_pickle)
+            else:
+                file = os.fspath(file)
+                if not file.endswith('.npy'):
+                    file = file + '.npy'
+                with open(file, 'wb') as f:
+                    _write_npy(f, arr, allow_pickle)
+        else:
+            numpy.save(file, cupy.asnumpy(arr), allow_pickle)
     else:
         if allow_pickle is not None:
             warnings.warn('allow_pickle option is not supported in NumPy 1.9')
@@ -115,6 +379,11 @@ def savez(file, *args, **kwds):
     are used for accessing NpzFile object when the file is read by
     :func:`cupy.load` function.
 
+    Each :class:`cupy.ndarray` is transferred to the host in chunks through
+    pinned memory buffers, which are written to the file while the
+    following chunks are transferred, so that the whole array is never
+    materialized on the host.
+
     Args:
         file (file or str): File or filename to save.
         *args: Arrays with implicit keys.
@@ -123,24 +392,19 @@ def savez(file, *args, **kwds):
     .. seealso:: :func:`numpy.savez`
 
     """
-    args = map(cupy.asnumpy, args)
-    for key in kwds:
-        kwds[key] = cupy.asnumpy(kwds[key])
-    numpy.savez(file, *args, **kwds)
+    _savez(file, args, kwds, False)
 
 
 def savez_compressed(file, *args, **kwds):
     """Saves one or more arrays into a file in compressed ``.npz`` format.
 
     It is equivalent to :func:`cupy.savez` function except the output file is
-    compressed.
+    compressed. Each chunk is compressed by the writer thread while the
+    following chunks are transferred.
 
     .. seealso::
        :func:`cupy.savez` for more detail,
        :func:`numpy.savez_compressed`
 
     """
-    args = map(cupy.asnumpy, args)
-    for key in kwds:
-        kwds[key] = cupy.asnumpy(kwds[key])
-    numpy.savez_compressed(file, *args, **kwds)
+    _savez(file, args, kwds, True)
@@ -1,12 +1,24 @@
+import concurrent.futures
+import contextlib
 import copy
 import hashlib
 import math
+import mmap
 import os
 import re
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
 
 from cupy.cuda import device
 from cupy.cuda import function
@@ -401,8 +413,674 @@ def get_cache_dir():
     return os.environ.get('CUPY_CACHE_DIR', _default_cache_dir)
 
 
+def _get_int_env_variable(name, default):
+    val = os.environ.get(name)
+    if val is None or len(val) == 0:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        return default
+
+
+def _get_cache_limits():
+    # 0 (default) means unlimited, which is represented as None.
+    max_bytes = _get_int_env_variable('CUPY_CACHE_MAX_BYTES', 0)
+    max_entries = _get_int_env_variable('CUPY_CACHE_MAX_ENTRIES', 0)
+    return (max_bytes if max_bytes > 0 else None,
+            max_entries if max_entries > 0 else None)
+
+
+# Suffixes of the compiled binaries stored in the disk cache. The CUDA/HIP
+# source files optionally saved along with them (CUPY_CACHE_SAVE_CUDA_SOURCE)
+# are named ``<binary>.cu`` or ``<binary>.cpp`` and are evicted together.
+_cache_binary_suffixes = ('.cubin', '.hsaco')
+_cache_source_suffixes = ('.cu', '.cpp')
+
+# Statistics of the disk cache in this process.
+_disk_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+# Estimated usage of each cache directory as [n_bytes, n_entries]. This is
+# populated when the directory is scanned and updated on each write, so that
+# the directory does not have to be listed for every new kernel. Entries
+# written by other processes are accounted at the next scan.
+_disk_cache_usage = {}
+
+
+@contextlib.contextmanager
+def _cache_dir_lock(cache_dir):
+    # Serializes eviction among processes sharing the cache directory.
+    # Readers and writers are lock-free; they tolerate files removed
+    # concurrently. The lock is not available on Windows, where concurrent
+    # pruning may evict slightly more entries than needed.
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(cache_dir, '.lock'), 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _scan_disk_cache(cache_dir):
+    # Returns a list of (mtime, n_bytes, path) of the entries in the cache.
+    # The modification time of an entry is updated on each cache hit, so it
+    # represents the last access time regardless of the `noatime` mount
+    # option.
+    binaries = {}
+    sources = {}
+    try:
+        it = os.scandir(cache_dir)
+    except FileNotFoundError:
+        return []
+    with it:
+        for e in it:
+            name = e.name
+            if name.endswith(_cache_binary_suffixes):
+                table = binaries
+            elif name.endswith(_cache_source_suffixes):
+                table = sources
+                name = os.path.splitext(name)[0]
+            else:
+                continue
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                # Removed by another process.
+                continue
+            table[name] = st
+    entries = []
+    for name, st in binaries.items():
+        n_bytes = st.st_size
+        src_st = sources.get(name)
+        if src_st is not None:
+            n_bytes += src_st.st_size
+        entries.append((st.st_mtime, n_bytes, os.path.join(cache_dir, name)))
+    return entries
+
+
+def _remove_cache_entry(path):
+    for p in [path] + [path + ext for ext in _cache_source_suffixes]:
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+
+
+def prune_cache(max_bytes=None, max_entries=None, cache_dir=None):
+    """Evicts least recently used entries from the kernel cache on disk.
+
+    Entries are removed in the order of the last access until the total
+    size and the number of entries in the cache fit in the given budget.
+    This is safe to call while other processes are using the cache.
+
+    Args:
+        max_bytes (int): The maximum total size of the cache in bytes.
+            If ``None``, the value of ``CUPY_CACHE_MAX_BYTES`` is used.
+        max_entries (int): The maximum number of the cached kernels.
+            If ``None``, the value of ``CUPY_CACHE_MAX_ENTRIES`` is used.
+        cache_dir (str): The cache directory. If ``None``, the value
+            returned by :func:`get_cache_dir` is used.
+
+    Returns:
+        int: The number of evicted entries.
+
+    .. note::
+        Passing ``0`` evicts all entries, whereas ``0`` in the environment
+        variables means unlimited. Kernels stored in the packed archive
+        (see :func:`pack_cache`) are not subject to eviction.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    env_max_bytes, env_max_entries = _get_cache_limits()
+    if max_bytes is None:
+        max_bytes = env_max_bytes
+    if max_entries is None:
+        max_entries = env_max_entries
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    n_evicted = 0
+    with _cache_dir_lock(cache_dir):
+        entries = _scan_disk_cache(cache_dir)
+        total_bytes = sum([e[1] for e in entries])
+        n_entries = len(entries)
+        entries.sort()
+        for _, n_bytes, path in entries:
+            if ((max_bytes is None or total_bytes <= max_bytes) and
+                    (max_entries is None or n_entries <= max_entries)):
+                break
+            _remove_cache_entry(path)
+            total_bytes -= n_bytes
+            n_entries -= 1
+            n_evicted += 1
+    _disk_cache_stats['evictions'] += n_evicted
+    _disk_cache_usage[cache_dir] = [total_bytes, n_entries]
+    return n_evicted
+
+
+def cache_info(cache_dir=None):
+    """Returns the statistics of the kernel cache on disk.
+
+    Args:
+        cache_dir (str): The cache directory. If ``None``, the value
+            returned by :func:`get_cache_dir` is used.
+
+    Returns:
+        dict: A dictionary with the following keys:
+
+        - ``hits``, ``misses``, ``evictions``: The number of disk cache
+          hits, misses and evicted entries in this process.
+        - ``entries``, ``bytes``: The number of the cached kernels and their
+          total size in bytes currently on disk.
+        - ``max_bytes``, ``max_entries``: The configured budget (``None``
+          means unlimited).
+        - ``cache_dir``: The cache directory.
+        - ``archive_entries``, ``archive_bytes``: The number of kernels and
+          the size of the packed archive. Only present when
+          ``CUPY_CACHE_PACKED`` is enabled.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    entries = _scan_disk_cache(cache_dir)
+    n_bytes = sum([e[1] for e in entries])
+    _disk_cache_usage[cache_dir] = [n_bytes, len(entries)]
+    max_bytes, max_entries = _get_cache_limits()
+    info = dict(_disk_cache_stats)
+    info.update(
+        entries=len(entries), bytes=n_bytes, max_bytes=max_bytes,
+        max_entries=max_entries, cache_dir=cache_dir)
+    archive = _get_cache_archive(cache_dir)
+    if archive is not None:
+        archive._read_index()
+        info.update(archive_entries=len(archive),
+                    archive_bytes=archive.n_bytes())
+    return info
+
+
+def _read_cache_file(path):
+    # Returns the binary stored in the cache file, or None if the file does
+    # not exist or is corrupted.
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if len(data) >= 32:
+        hash_value = data[:32]
+        binary = data[32:]
+        binary_hash = hashlib.md5(binary).hexdigest().encode('ascii')
+        if hash_value == binary_hash:
+            # Mark the entry as recently used for LRU eviction.
+            try:
+                os.utime(path)
+            except OSError:
+                # e.g., read-only cache directory
+                pass
+            return binary
+    return None
+
+
+def _write_hashed_file(cache_dir, path, binary):
+    # Returns the number of bytes written.
+    binary_hash = hashlib.md5(binary).hexdigest().encode('ascii')
+
+    # shutil.move is not atomic operation, so it could result in a
+    # corrupted file. We detect it by appending md5 hash at the beginning
+    # of each cache file. If the file is corrupted, it will be ignored
+    # next time it is read.
+    with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as tf:
+        tf.write(binary_hash)
+        tf.write(binary)
+        temp_path = tf.name
+    shutil.move(temp_path, path)
+    return len(binary_hash) + len(binary)
+
+
+def _save_cuda_source(path, source, source_ext):
+    # Saves the source file along with the binary if requested, and returns
+    # the number of bytes written.
+    if not _get_bool_env_variable('CUPY_CACHE_SAVE_CUDA_SOURCE', False):
+        return 0
+    with open(path + source_ext, 'w') as f:
+        f.write(source)
+    return len(source)
+
+
+def _write_cache_file(cache_dir, path, binary, source, source_ext):
+    n_bytes = _write_hashed_file(cache_dir, path, binary)
+    n_bytes += _save_cuda_source(path, source, source_ext)
+
+    max_bytes, max_entries = _get_cache_limits()
+    if max_bytes is None and max_entries is None:
+        return
+    usage = _disk_cache_usage.get(cache_dir)
+    if usage is None:
+        prune_cache(max_bytes, max_entries, cache_dir)
+        return
+    usage[0] += n_bytes
+    usage[1] += 1
+    if ((max_bytes is not None and usage[0] > max_bytes) or
+            (max_entries is not None and usage[1] > max_entries)):
+        prune_cache(max_bytes, max_entries, cache_dir)
+
+
+_archive_name = 'kernel_cache.pack'
+
+# (kernel name, offset, size, md5 digest of the binary) of an entry in the
+# archive index.
+_archive_index_entry = struct.Struct('<48sQQ16s')
+
+
+class _KernelArchive(object):
+
+    """Append-only archive of compiled kernels.
+
+    The archive consists of two files: ``<path>`` holding the concatenated
+    binaries, and ``<path>.idx`` holding fixed-size (name, offset, size,
+    digest) records. The data file is memory-mapped on first use, so a
+    lookup costs a dict probe and a slice (and hashing the binary at the
+    first lookup of each entry). Entries are appended under the cache
+    directory lock, data first, so that readers in other processes never
+    observe an index record pointing to incomplete data. Entries whose
+    binary does not match the digest (e.g., a truncated or corrupted data
+    file) are ignored and can be appended again; the last record of a name
+    takes precedence.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._index = {}
+        self._index_bytes = 0
+        self._verified = set()
+        self._mmap = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._index)
+
+    def _read_index(self):
+        # Reads the records appended since the last call.
+        try:
+            with open(self.path + '.idx', 'rb') as f:
+                f.seek(self._index_bytes)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        entry_size = _archive_index_entry.size
+        n = len(data) // entry_size
+        for i in range(n):
+            name, offset, size, digest = _archive_index_entry.unpack_from(
+                data, i * entry_size)
+            name = name.rstrip(b'\0').decode('ascii')
+            self._index[name] = (offset, size, digest)
+            self._verified.discard(name)
+        self._index_bytes += n * entry_size
+
+    def _map(self, end):
+        mm = self._mmap
+        if mm is None or len(mm) < end:
+            # The old mapping is not closed explicitly as other threads may
+            # still be slicing it; it is released when unreferenced.
+            with open(self.path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap = mm
+        return mm
+
+    def get(self, name):
+        entry = self._index.get(name)
+        if entry is None:
+            with self._lock:
+                # Entries may have been appended by other processes.
+                self._read_index()
+                entry = self._index.get(name)
+            if entry is None:
+                return None
+        offset, size, digest = entry
+        end = offset + size
+        mm = self._mmap
+        if mm is None or len(mm) < end:
+            with self._lock:
+                try:
+                    mm = self._map(end)
+                except (OSError, ValueError):
+                    # The data file is missing or empty (mmap raises
+                    # ValueError for an empty file). Allows the entry to be
+                    # appended again.
+                    if self._index.get(name) == entry:
+                        del self._index[name]
+                    return None
+        binary = mm[offset:end]
+        if name not in self._verified:
+            if hashlib.md5(binary).digest() != digest:
+                with self._lock:
+                    # Allows the entry to be appended again.
+                    if self._index.get(name) == entry:
+                        del self._index[name]
+                return None
+            self._verified.add(name)
+        return binary
+
+    def append(self, name, binary):
+        encoded_name = name.encode('ascii')
+        assert len(encoded_name) <= 48
+        cache_dir = os.path.dirname(self.path)
+        with self._lock, _cache_dir_lock(cache_dir):
+            self._read_index()
+            if name in self._index:
+                return False
+            with open(self.path, 'ab') as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(binary)
+            with open(self.path + '.idx', 'ab') as f:
+                f.write(_archive_index_entry.pack(
+                    encoded_name, offset, len(binary),
+                    hashlib.md5(binary).digest()))
+            self._read_index()
+        return True
+
+    def n_bytes(self):
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+
+_cache_archives = {}
+
+
+def _get_cache_archive(cache_dir, create=False):
+    # Returns the archive in the cache directory when the packed cache is
+    # enabled (CUPY_CACHE_PACKED=1), otherwise None.
+    if not create and not _get_bool_env_variable('CUPY_CACHE_PACKED', False):
+        return None
+    archive = _cache_archives.get(cache_dir)
+    if archive is None:
+        archive = _KernelArchive(os.path.join(cache_dir, _archive_name))
+        _cache_archives[cache_dir] = archive
+    return archive
+
+
+def pack_cache(cache_dir=None, remove=False):
+    """Converts the kernel cache directory into a packed archive.
+
+    The valid kernels stored as individual files in the cache directory
+    are appended to ``kernel_cache.pack`` in the same directory. The archive
+    is used when ``CUPY_CACHE_PACKED`` is set to 1.
+
+    Args:
+        cache_dir (str): The cache directory. If ``None``, the value
+            returned by :func:`get_cache_dir` is used.
+        remove (bool): If ``True``, the individual files are removed after
+            being packed.
+
+    Returns:
+        int: The number of kernels newly added to the archive.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    archive = _get_cache_archive(cache_dir, create=True)
+    n_packed = 0
+    for _, _, path in _scan_disk_cache(cache_dir):
+        binary = _read_cache_file(path)
+        if binary is None:
+            continue
+        if archive.append(os.path.basename(path), binary):
+            n_packed += 1
+        if remove:
+            _remove_cache_entry(path)
+    if remove:
+        _disk_cache_usage.pop(cache_dir, None)
+    return n_packed
+
+
+def _read_cached_binary(cache_dir, name):
+    archive = _get_cache_archive(cache_dir)
+    if archive is not None:
+        binary = archive.get(name)
+        if binary is not None:
+            return binary
+    return _read_cache_file(os.path.join(cache_dir, name))
+
+
+def _write_cached_binary(cache_dir, name, binary, source, source_ext):
+    archive = _get_cache_archive(cache_dir)
+    if archive is not None:
+        if archive.append(name, binary):
+            # The source files are not packed nor subject to eviction.
+            _save_cuda_source(os.path.join(cache_dir, name), source,
+                              source_ext)
+    else:
+        _write_cache_file(cache_dir, os.path.join(cache_dir, name), binary,
+                          source, source_ext)
+
+
 _empty_file_preprocess_cache = {}
 
+# (path, size, mtime) of the NVRTC library loaded in the process, or False
+# if it cannot be determined.
+_nvrtc_library_identity = None
+
+
+def _get_nvrtc_library_identity():
+    # Identifies the NVRTC library file, which is replaced by patch-level
+    # updates without changing the version returned by nvrtcVersion. The
+    # path is found in the memory mappings of the process (Linux only).
+    global _nvrtc_library_identity
+    if _nvrtc_library_identity is None:
+        identity = False
+        try:
+            with open('/proc/self/maps') as f:
+                for line in f:
+                    path = line.split(None, 5)[-1].strip()
+                    if os.path.basename(path).startswith('libnvrtc.so'):
+                        st = os.stat(path)
+                        identity = (path, st.st_size, st.st_mtime_ns)
+                        break
+        except OSError:
+            pass
+        _nvrtc_library_identity = identity
+    return _nvrtc_library_identity
+
+
+def _get_preprocess_cache_path(cache_dir, env, identity):
+    name = hashlib.md5(repr((env, identity)).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, '%s.preprocess' % name)
+
+
+def _get_preprocess_fingerprint(env, options, arch, backend, cache_dir):
+    # Returns the result of preprocessing an empty source, which is a part
+    # of the cache key to detect changes of the compiler internals. It is
+    # stored in the disk cache when using NVRTC, whose output only depends on
+    # `env` (i.e., the NVRTC version and the options) and the library file.
+    # nvcc may be replaced without changing `env`, so it is always invoked,
+    # as well as NVRTC when the library file cannot be identified.
+    path = None
+    if cache_dir is not None and backend == 'nvrtc':
+        identity = _get_nvrtc_library_identity()
+        if identity:
+            path = _get_preprocess_cache_path(cache_dir, env, identity)
+            base = _read_cache_file(path)
+            if base is not None:
+                return base
+    start = time.perf_counter()
+    base = _preprocess('', options, arch, backend)
+    _record_compile_stats('preprocess', None, time.perf_counter() - start)
+    if path is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            _write_hashed_file(cache_dir, path, base)
+        except OSError:
+            # e.g., read-only cache directory
+            pass
+    return base
+
+
+# Memo of the cache keys (file names) of the sources compiled in the process.
+# Sources are often the same objects (e.g., the header source passed as
+# extra_source), for which the lookup is cheaper than hashing.
+_cache_key_memo = {}
+_cache_key_memo_size = 1024
+
+
+def _get_cache_key(env, base, source, extra_source, suffix):
+    # `base` is not a part of the memo key as it is determined by `env`.
+    memo_key = (env, source, extra_source, suffix)
+    name = _cache_key_memo.get(memo_key)
+    if name is None:
+        key_src = '%s %s %s %s' % (env, base, source, extra_source)
+        key_src = key_src.encode('utf-8')
+        name = hashlib.md5(key_src).hexdigest() + suffix
+        if len(_cache_key_memo) >= _cache_key_memo_size:
+            _cache_key_memo.clear()
+        _cache_key_memo[memo_key] = name
+    return name
+
+
+# name -> [lock, number of threads using the lock]
+_compile_locks = {}
+_compile_locks_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _compile_lock(name):
+    # Serializes the compilation of the same kernel among threads, so that
+    # concurrent requests (e.g., by `compile_async`) do not compile it twice.
+    with _compile_locks_lock:
+        entry = _compile_locks.get(name)
+        if entry is None:
+            entry = _compile_locks[name] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _compile_locks_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _compile_locks[name]
+
+
+_compile_executor = None
+_compile_futures = {}
+_compile_futures_lock = threading.Lock()
+
+
+def _compile_on_device(device_id, func, args):
+    with device.Device(device_id):
+        return func(*args)
+
+
+def _submit_compile(key, device_id, func, *args):
+    # Runs `func(*args)` on the given device in the background compile
+    # thread pool and returns a `concurrent.futures.Future`. While a request
+    # is pending, subsequent requests with the same key share its future.
+    global _compile_executor
+    with _compile_futures_lock:
+        future = _compile_futures.get(key)
+        if future is not None:
+            return future
+        if _compile_executor is None:
+            _compile_executor = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix='cupy_compile')
+        future = _compile_executor.submit(
+            _compile_on_device, device_id, func, args)
+        _compile_futures[key] = future
+    future.add_done_callback(lambda f: _pop_compile_future(key, f))
+    return future
+
+
+def _pop_compile_future(key, future):
+    with _compile_futures_lock:
+        if _compile_futures.get(key) is future:
+            del _compile_futures[key]
+
+
+def _completed_future(result):
+    future = concurrent.futures.Future()
+    future.set_result(result)
+    return future
+
+
+# Callables invoked with the arguments of each kernel compilation request
+# as keyword arguments. See cupyx.tools.precompile.
+_compile_recorders = []
+_compile_recorder_env_initialized = False
+
+
+def _record_compile(source, options, arch, extra_source, backend,
+                    enable_cooperative_groups, jitify):
+    global _compile_recorder_env_initialized
+    if not _compile_recorder_env_initialized:
+        _compile_recorder_env_initialized = True
+        path = os.environ.get('CUPY_CACHE_RECORD_MANIFEST')
+        if path:
+            # defer import to here to avoid circular dependency
+            from cupyx.tools import precompile
+            precompile._record_to_file(path)
+    if not _compile_recorders:
+        return
+    if arch is None:
+        if runtime.is_hip:
+            arch = device.Device().compute_capability
+        else:
+            arch = _get_arch()
+    for recorder in _compile_recorders:
+        recorder(source=source, options=tuple(options), arch=arch,
+                 extra_source=extra_source, backend=backend,
+                 enable_cooperative_groups=enable_cooperative_groups,
+                 jitify=jitify)
+
+
+# Callables invoked as ``collector(event, name, source_size, seconds)`` for
+# each step of kernel retrieval, where event is one of 'memo_hit', 'disk_hit',
+# 'disk_read', 'compile' and 'preprocess'. See cupyx.profiler.compile_stats.
+_compile_stats_collectors = []
+_kernel_name_pattern = re.compile(
+    r'__global__\s+void\s+(?:__launch_bounds__\s*\([^)]*\)\s*)?(\w+)')
+
+
+def _get_kernel_name(source):
+    # Kernels are identified by the first kernel function in the source.
+    match = _kernel_name_pattern.search(source)
+    return '<unknown>' if match is None else match.group(1)
+
+
+def _record_compile_stats(event, source, seconds):
+    if not _compile_stats_collectors:
+        return
+    name = '' if source is None else _get_kernel_name(source)
+    size = 0 if source is None else len(source)
+    for collector in _compile_stats_collectors:
+        collector(event, name, size, seconds)
+
+
+def _record_memo_hit(name):
+    # Called by kernel objects when the compiled kernel is found in their
+    # in-process memo.
+    for collector in _compile_stats_collectors:
+        collector('memo_hit', name, 0, 0.0)
+
+
+def _compile_to_cache(
+        source, options=(), arch=None, cache_dir=None, extra_source=None,
+        backend='nvrtc', enable_cooperative_groups=False, jitify=False):
+    # Stores the compiled kernel in the disk cache without loading it. This
+    # does not require a GPU when `arch` is given (except for relocatable
+    # device code, which is linked by the driver).
+    options = tuple(options)
+    if runtime.is_hip:
+        backend = 'hiprtc' if backend == 'nvrtc' else 'hipcc'
+        _compile_with_cache_hip(
+            source, options, arch, cache_dir, extra_source, backend,
+            load=False)
+    else:
+        _compile_with_cache_cuda(
+            source, options, arch, cache_dir, extra_source, backend,
+            enable_cooperative_groups, jitify=jitify, load=False)
+
 
 def compile_with_cache(
         source, options=(), arch=None, cache_dir=None, extra_source=None,
@@ -417,6 +1095,12 @@ def compile_with_cache(
     if name_expressions is not None and backend != 'nvrtc':
         raise NotImplementedError
 
+    if name_expressions is None:
+        # Kernels with name_expressions are always recompiled, so there is no
+        # point in recording them for precompilation.
+        _record_compile(source, options, arch, extra_source, backend,
+                        enable_cooperative_groups, jitify)
+
     # We silently ignore CUPY_CACHE_IN_MEMORY if nvcc/hipcc are in use, because
     # they must dump files to disk.
     cache_in_memory = (
@@ -438,7 +1122,7 @@ def compile_with_cache(
 def _compile_with_cache_cuda(
         source, options, arch, cache_dir, extra_source=None, backend='nvrtc',
         enable_cooperative_groups=False, name_expressions=None,
-        log_stream=None, cache_in_memory=False, jitify=False):
+        log_stream=None, cache_in_memory=False, jitify=False, load=True):
     # NVRTC does not use extra_source. extra_source is used for cache key.
     global _empty_file_preprocess_cache
     if cache_dir is None:
@@ -471,86 +1155,78 @@ def _compile_with_cache_cuda(
     base = _empty_file_preprocess_cache.get(env, None)
     if base is None:
         # This is for checking NVRTC/NVCC compiler internal version
-        base = _preprocess('', options, arch, backend)
+        base = _get_preprocess_fingerprint(
+            env, options, arch, backend,
+            None if cache_in_memory else cache_dir)
         _empty_file_preprocess_cache[env] = base
 
-    key_src = '%s %s %s %s' % (env, base, source, extra_source)
-    key_src = key_src.encode('utf-8')
-    name = '%s_2.cubin' % hashlib.md5(key_src).hexdigest()
+    name = _get_cache_key(env, base, source, extra_source, '_2.cubin')
 
     mod = function.Module()
 
-    if not cache_in_memory:
-        # Read from disk cache
-        if not os.path.isdir(cache_dir):
-            os.makedirs(cache_dir, exist_ok=True)
-
-        # To handle conflicts in concurrent situation, we adopt lock-free
-        # method to avoid performance degradation.
-        # We force recompiling to retrieve C++ mangled names if so desired.
-        path = os.path.join(cache_dir, name)
-        if os.path.exists(path) and not name_expressions:
-            with open(path, 'rb') as file:
-                data = file.read()
-            if len(data) >= 32:
-                hash = data[:32]
-                cubin = data[32:]
-                cubin_hash = hashlib.md5(cubin).hexdigest().encode('ascii')
-                if hash == cubin_hash:
-                    mod.load(cubin)
+    with _compile_lock(name):
+        if not cache_in_memory:
+            # Read from disk cache
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir, exist_ok=True)
+
+            # To handle conflicts among processes, we adopt lock-free method
+            # to avoid performance degradation. Within the process, threads
+            # requesting the same kernel wait for the first one to finish and
+            # then hit the disk cache (see _compile_lock).
+            # We force recompiling to retrieve C++ mangled names if so desired.
+            if not name_expressions:
+                start = time.perf_counter()
+                cubin = _read_cached_binary(cache_dir, name)
+                _record_compile_stats(
+                    'disk_read', source, time.perf_counter() - start)
+                if cubin is not None:
+                    _disk_cache_stats['hits'] += 1
+                    _record_compile_stats('disk_hit', source, 0.0)
+                    if load:
+                        mod.load(cubin)
                     return mod
-    else:
-        # Enforce compiling -- the resulting kernel will be cached elsewhere,
-        # so we do nothing
-        pass
-
-    if backend == 'nvrtc':
-        cu_name = '' if cache_in_memory else name + '.cu'
-        ptx, mapping = compile_using_nvrtc(
-            source, options, arch, cu_name, name_expressions,
-            log_stream, cache_in_memory, jitify)
-        if _is_cudadevrt_needed(options):
-            # for separate compilation
-            ls = function.LinkState()
-            ls.add_ptr_data(ptx, 'cupy.ptx')
-            _cudadevrt = _get_cudadevrt_path()
-            ls.add_ptr_file(_cudadevrt)
-            cubin = ls.complete()
+            _disk_cache_stats['misses'] += 1
         else:
-            cubin = ptx
-        mod._set_mapping(mapping)
-    elif backend == 'nvcc':
-        rdc = _is_cudadevrt_needed(options)
-        cubin = compile_using_nvcc(source, options, arch,
-                                   name + '.cu', code_type='cubin',
-                                   separate_compilation=rdc,
-                                   log_stream=log_stream)
-    else:
-        raise ValueError('Invalid backend %s' % backend)
+            # Enforce compiling -- the resulting kernel will be cached
+            # elsewhere, so we do nothing
+            pass
+
+        start = time.perf_counter()
+        if backend == 'nvrtc':
+            cu_name = '' if cache_in_memory else name + '.cu'
+            ptx, mapping = compile_using_nvrtc(
+                source, options, arch, cu_name, name_expressions,
+                log_stream, cache_in_memory, jitify)
+            if _is_cudadevrt_needed(options):
+                # for separate compilation
+                ls = function.LinkState()
+                ls.add_ptr_data(ptx, 'cupy.ptx')
+                _cudadevrt = _get_cudadevrt_path()
+                ls.add_ptr_file(_cudadevrt)
+                cubin = ls.complete()
+            else:
+                cubin = ptx
+            mod._set_mapping(mapping)
+        elif backend == 'nvcc':
+            rdc = _is_cudadevrt_needed(options)
+            cubin = compile_using_nvcc(source, options, arch,
+                                       name + '.cu', code_type='cubin',
+                                       separate_compilation=rdc,
+                                       log_stream=log_stream)
+        else:
+            raise ValueError('Invalid backend %s' % backend)
+        _record_compile_stats('compile', source, time.perf_counter() - start)
 
-    if not cache_in_memory:
-        # Write to disk cache
-        cubin_hash = hashlib.md5(cubin).hexdigest().encode('ascii')
-
-        # shutil.move is not atomic operation, so it could result in a
-        # corrupted file. We detect it by appending md5 hash at the beginning
-        # of each cache file. If the file is corrupted, it will be ignored
-        # next time it is read.
-        with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as tf:
-            tf.write(cubin_hash)
-            tf.write(cubin)
-            temp_path = tf.name
-        shutil.move(temp_path, path)
-
-        # Save .cu source file along with .cubin
-        if _get_bool_env_variable('CUPY_CACHE_SAVE_CUDA_SOURCE', False):
-            with open(path + '.cu', 'w') as f:
-                f.write(source)
-    else:
-        # we don't do any disk I/O
-        pass
+        if not cache_in_memory:
+            # Write to disk cache
+            _write_cached_binary(cache_dir, name, cubin, source, '.cu')
+        else:
+            # we don't do any disk I/O
+            pass
 
-    mod.load(cubin)
+    if load:
+        mod.load(cubin)
     return mod
 
 
@@ -745,7 +1421,7 @@ def _convert_to_hip_source(source, extra_source, is_hiprtc):
 def _compile_with_cache_hip(source, options, arch, cache_dir, extra_source,
                             backend='hiprtc', name_expressions=None,
                             log_stream=None, cache_in_memory=False,
-                            use_converter=True):
+                            use_converter=True, load=True):
     global _empty_file_preprocess_cache
 
     # TODO(leofang): this might be possible but is currently undocumented
@@ -779,72 +1455,65 @@ def _compile_with_cache_hip(source, options, arch, cache_dir, extra_source,
     base = _empty_file_preprocess_cache.get(env, None)
     if base is None:
         # This is for checking HIPRTC/HIPCC compiler internal version
+        start = time.perf_counter()
         if backend == 'hiprtc':
             base = _preprocess_hiprtc('', options)
         else:
             base = _preprocess_hipcc('', options)
+        _record_compile_stats(
+            'preprocess', None, time.perf_counter() - start)
         _empty_file_preprocess_cache[env] = base
 
-    key_src = '%s %s %s %s' % (env, base, source, extra_source)
-    key_src = key_src.encode('utf-8')
-    name = '%s.hsaco' % hashlib.md5(key_src).hexdigest()
+    name = _get_cache_key(env, base, source, extra_source, '.hsaco')
 
     mod = function.Module()
 
-    if not cache_in_memory:
-        # Read from disk cache
-        if not os.path.isdir(cache_dir):
-            os.makedirs(cache_dir, exist_ok=True)
-
-        # To handle conflicts in concurrent situation, we adopt lock-free
-        # method to avoid performance degradation.
-        # We force recompiling to retrieve C++ mangled names if so desired.
-        path = os.path.join(cache_dir, name)
-        if os.path.exists(path) and not name_expressions:
-            with open(path, 'rb') as f:
-                data = f.read()
-            if len(data) >= 32:
-                hash_value = data[:32]
-                binary = data[32:]
-                binary_hash = hashlib.md5(binary).hexdigest().encode('ascii')
-                if hash_value == binary_hash:
-                    mod.load(binary)
+    with _compile_lock(name):
+        if not cache_in_memory:
+            # Read from disk cache
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir, exist_ok=True)
+
+            # To handle conflicts among processes, we adopt lock-free method
+            # to avoid performance degradation. Within the process, threads
+            # requesting the same kernel wait for the first one to finish and
+            # then hit the disk cache (see _compile_lock).
+            # We force recompiling to retrieve C++ mangled names if so desired.
+            if not name_expressions:
+                start = time.perf_counter()
+                binary = _read_cached_binary(cache_dir, name)
+                _record_compile_stats(
+                    'disk_read', source, time.perf_counter() - start)
+                if binary is not None:
+                    _disk_cache_stats['hits'] += 1
+                    _record_compile_stats('disk_hit', source, 0.0)
+                    if load:
+                        mod.load(binary)
                     return mod
-    else:
-        # Enforce compiling -- the resulting kernel will be cached elsewhere,
-        # so we do nothing
-        pass
-
-    if backend == 'hiprtc':
-        # compile_using_nvrtc calls hiprtc for hip builds
-        binary, mapping = compile_using_nvrtc(
-            source, options, arch, name + '.cu', name_expressions,
-            log_stream, cache_in_memory)
-        mod._set_mapping(mapping)
-    else:
-        binary = compile_using_hipcc(source, options, arch, log_stream)
+            _disk_cache_stats['misses'] += 1
+        else:
+            # Enforce compiling -- the resulting kernel will be cached
+            # elsewhere, so we do nothing
+            pass
 
-    if not cache_in_memory:
-        # Write to disk cache
-        binary_hash = hashlib.md5(binary).hexdigest().encode('ascii')
+        start = time.perf_counter()
+        if backend == 'hiprtc':
+            # compile_using_nvrtc calls hiprtc for hip builds
+            binary, mapping = compile_using_nvrtc(
+                source, options, arch, name + '.cu', name_expressions,
+                log_stream, cache_in_memory)
+            mod._set_mapping(mapping)
+        else:
+            binary = compile_using_hipcc(source, options, arch, log_stream)
+        _record_compile_stats('compile', source, time.perf_counter() - start)
 
-        # shutil.move is not atomic operation, so it could result in a
-        # corrupted file. We detect it by appending md5 hash at the beginning
-        # of each cache file. If the file is corrupted, it will be ignored
-        # next time it is read.
-        with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as tf:
-            tf.write(binary_hash)
-            tf.write(binary)
-            temp_path = tf.name
-        shutil.move(temp_path, path)
-
-        # Save .cu source file along with .hsaco
-        if _get_bool_env_variable('CUPY_CACHE_SAVE_CUDA_SOURCE', False):
-            with open(path + '.cpp', 'w') as f:
-                f.write(source)
-    else:
-        # we don't do any disk I/O
-        pass
+        if not cache_in_memory:
+            # Write to disk cache
+            _write_cached_binary(cache_dir, name, binary, source, '.cpp')
+        else:
+            # we don't do any disk I/O
+            pass
 
-    mod.load(binary)
+    if load:
+        mod.load(binary)
     return mod
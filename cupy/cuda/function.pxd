@@ -10,6 +10,11 @@ cdef class Function:
     cdef:
         public Module module
         public intptr_t ptr
+        readonly str name
+        size_t _default_block_size
+        size_t _min_grid_size
+
+    cdef size_t _get_default_block_size(self) except 0
 
     cpdef linear_launch(self, size_t size, args, size_t shared_mem=*,
                         size_t block_max_size=*, stream=*,
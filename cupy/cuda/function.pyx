@@ -1,5 +1,6 @@
 # distutils: language = c++
 
+import os
 import numpy
 import warnings
 
@@ -208,6 +209,43 @@ cdef _launch(intptr_t func, Py_ssize_t grid0, int grid1, int grid2,
             <int>shared_mem, stream, <intptr_t>kargs.data(), <intptr_t>0)
 
 
+# How the default block size of linear_launch is chosen: 'occupancy' uses
+# the block size maximizing the occupancy of each function, and 'fixed' uses
+# _fixed_block_size.
+cdef str _launch_config = os.environ.get('CUPY_LAUNCH_CONFIG', 'occupancy')
+if _launch_config not in ('occupancy', 'fixed'):
+    warnings.warn(
+        'CUPY_LAUNCH_CONFIG must be either \'occupancy\' or \'fixed\': '
+        '{}. \'occupancy\' is used instead.'.format(_launch_config))
+    _launch_config = 'occupancy'
+
+cdef size_t _fixed_block_size = 128
+
+
+cpdef size_t _get_linear_block_size(
+        size_t size, size_t block_size, size_t min_grid_size):
+    # Returns the block size of a linear launch of ``size`` threads. When the
+    # launch with ``block_size`` would make fewer than ``min_grid_size``
+    # blocks, i.e., not all SMs are fully occupied, the block size is lowered
+    # (down to _fixed_block_size, in multiples of the warp size) to spread
+    # the threads over more SMs.
+    cdef size_t floor = min(block_size, _fixed_block_size)
+    if size >= block_size * min_grid_size:
+        return block_size
+    block_size = min(
+        block_size, ((size + min_grid_size - 1) // min_grid_size + 31) & ~31)
+    return max(block_size, floor)
+
+# Map from the kernel name to the list of the launch configurations chosen
+# for the functions of the name. See cupyx.profiler.get_launch_configs.
+cdef dict _launch_configs = {}
+
+
+cpdef dict _get_launch_configs():
+    return {name: [dict(config) for config in configs]
+            for name, configs in _launch_configs.items()}
+
+
 cdef class Function:
 
     """CUDA kernel function."""
@@ -215,6 +253,29 @@ cdef class Function:
     def __init__(self, Module module, str funcname):
         self.module = module  # to keep module loaded
         self.ptr = driver.moduleGetFunction(module.ptr, funcname)
+        self.name = funcname
+
+    cdef size_t _get_default_block_size(self) except 0:
+        # The launch configuration is determined at the first call and
+        # cached in the function.
+        cdef int min_grid_size = 0, block_size = _fixed_block_size
+        if self._default_block_size != 0:
+            return self._default_block_size
+        mode = _launch_config
+        if mode == 'occupancy' and not runtime._is_hip_environment:
+            min_grid_size, block_size = driver.occupancyMaxPotentialBlockSize(
+                self.ptr, 0, 0)
+        else:
+            # The occupancy API is not reliable in HIP.
+            mode = 'fixed'
+        self._default_block_size = block_size
+        self._min_grid_size = min_grid_size
+        _launch_configs.setdefault(self.name, []).append({
+            'mode': mode,
+            'block_size': block_size,
+            'min_grid_size': min_grid_size,
+        })
+        return block_size
 
     def __call__(self, tuple grid, tuple block, args, size_t shared_mem=0,
                  stream=None, enable_cooperative_groups=False):
@@ -228,9 +289,16 @@ cdef class Function:
             args, shared_mem, s, enable_cooperative_groups)
 
     cpdef linear_launch(self, size_t size, args, size_t shared_mem=0,
-                        size_t block_max_size=128, stream=None,
+                        size_t block_max_size=0, stream=None,
                         bint enable_cooperative_groups=False):
-        # TODO(beam2d): Tune it
+        # If block_max_size is 0, the default launch configuration of the
+        # function is used (see CUPY_LAUNCH_CONFIG).
+        if block_max_size == 0:
+            if shared_mem == 0:
+                block_max_size = _get_linear_block_size(
+                    size, self._get_default_block_size(), self._min_grid_size)
+            else:
+                block_max_size = _fixed_block_size
         cdef size_t gridx = min(
             0x7fffffffUL, (size + block_max_size - 1) // block_max_size)
         cdef size_t blockx = min(block_max_size, size)
@@ -61,8 +61,16 @@ cdef class MemoryPool:
     cpdef size_t used_bytes(self)
     cpdef size_t free_bytes(self)
     cpdef size_t total_bytes(self)
+    cpdef dict stats(self)
     cpdef set_limit(self, size=?, fraction=?)
     cpdef size_t get_limit(self)
+    cpdef set_release_policy(self, max_idle_seconds=?, high_watermark=?)
+    cpdef dict get_release_policy(self)
+    cpdef set_cross_stream_reuse(self, bint enabled=?)
+    cpdef bint get_cross_stream_reuse(self)
+    cpdef reserve(self, sizes, stream=?)
+    cpdef dict get_profile(self)
+    cpdef dump_profile(self, file)
 
 
 @cython.no_gc
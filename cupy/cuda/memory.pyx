@@ -6,8 +6,10 @@ import atexit
 import collections
 import ctypes
 import gc
+import json
 import os
 import threading
+import time
 import warnings
 import weakref
 
@@ -269,6 +271,10 @@ cdef class _Chunk:
         prev (Chunk): prev memory pointer if split from a larger allocation
         next (Chunk): next memory pointer if split from a larger allocation
         stream_ident (intptr_t): Value to uniquely identify the stream.
+        freed_at (float): Time (:func:`time.monotonic`) when the chunk is
+            put in the free list. Only recorded when a release policy is set.
+        free_event: Event recorded on the stream when the chunk is put in
+            the free list. Only recorded when cross-stream reuse is enabled.
     """
 
     cdef:
@@ -278,6 +284,8 @@ cdef class _Chunk:
         readonly intptr_t stream_ident
         public _Chunk prev
         public _Chunk next
+        readonly double freed_at
+        readonly object free_event
 
     def __init__(self, *args):
         # For debug
@@ -756,6 +764,140 @@ cpdef get_allocator():
         return allocator
 
 
+@cython.final
+cdef class _SlabClass:
+
+    """Free list of fixed-size blocks carved from larger chunks (slabs).
+
+    Small allocations are served from the free list without splitting and
+    merging chunks.
+    """
+
+    cdef:
+        # `_free_lock` of the pool must be acquired to access them.
+        readonly size_t block_size
+        readonly size_t n_blocks
+        # Pointers to the free blocks.
+        vector.vector[intptr_t] _free
+        # Chunks carved into blocks.
+        list _slabs
+
+    def __init__(self, size_t block_size):
+        self.block_size = block_size
+        self.n_blocks = 0
+        self._slabs = []
+
+    cdef add_slab(self, _Chunk chunk):
+        cdef size_t i, n = chunk.size // self.block_size
+        cdef intptr_t ptr = chunk.ptr()
+        self._slabs.append(chunk)
+        self.n_blocks += n
+        # Push in the reverse order to use lower addresses first.
+        for i in range(n, 0, -1):
+            self._free.push_back(ptr + (i - 1) * self.block_size)
+
+    cdef bint contains(self, intptr_t ptr):
+        cdef _Chunk chunk
+        for chunk in self._slabs:
+            if chunk.ptr() <= ptr < chunk.ptr() + <intptr_t>chunk.size:
+                return True
+        return False
+
+
+@cython.final
+cdef class _ThreadCache:
+
+    """Free chunks of a memory pool cached for a thread.
+
+    The chunks are kept in the ``_in_use`` map of the pool so that they can
+    be reused by the thread without acquiring the locks of the pool. The
+    cache is only accessed by the owner thread except when it is flushed, so
+    its lock is not contended.
+    """
+
+    cdef:
+        object _pool  # weakref to the pool
+        object _lock
+        # Map from chunk size to the list of chunks.
+        dict _bins
+        size_t _max_bytes
+        readonly size_t n_bytes
+        readonly size_t n_chunks
+        object __weakref__
+
+    def __init__(self, pool, size_t max_bytes):
+        self._pool = pool
+        self._lock = rlock.create_fastrlock()
+        self._bins = {}
+        self._max_bytes = max_bytes
+
+    def __dealloc__(self):
+        # Returns the chunks to the pool on the thread exit.
+        if _exit_mode:
+            return  # To avoid error at exit
+        self.flush()
+
+    cdef bint push(self, _Chunk chunk):
+        # Avoid allocating Python objects while holding the lock, which may
+        # invoke GC and free another memory to this cache.
+        cdef list free_list = self._bins.get(chunk.size, None)
+        if free_list is None:
+            free_list = []
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            if (self.n_bytes + chunk.size > self._max_bytes or
+                    len(free_list) >= _thread_cache_n_chunks):
+                return False
+            free_list = self._bins.setdefault(chunk.size, free_list)
+            free_list.append(chunk)
+            self.n_bytes += chunk.size
+            self.n_chunks += 1
+            return True
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+
+    cdef _Chunk pop(self, size_t size, intptr_t stream_ident):
+        cdef list free_list
+        cdef _Chunk chunk
+        cdef Py_ssize_t i
+        if self.n_chunks == 0:
+            return None
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            free_list = self._bins.get(size, None)
+            if free_list is None:
+                return None
+            for i in range(len(free_list) - 1, -1, -1):
+                chunk = free_list[i]
+                if chunk.stream_ident == stream_ident:
+                    del free_list[i]
+                    self.n_bytes -= size
+                    self.n_chunks -= 1
+                    return chunk
+            return None
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+
+    cpdef flush(self):
+        """Returns all the chunks to the pool."""
+        cdef dict bins
+        cdef _Chunk chunk
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            bins = self._bins
+            self._bins = {}
+            self.n_bytes = 0
+            self.n_chunks = 0
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+        pool = self._pool()
+        if pool is None:
+            return
+        for free_list in bins.itervalues():
+            for chunk in free_list:
+                (<SingleDeviceMemoryPool>pool).free(chunk.ptr(), chunk.size)
+
+
 @cython.final
 @cython.no_gc
 cdef class PooledMemory(BaseMemory):
@@ -769,6 +911,10 @@ cdef class PooledMemory(BaseMemory):
 
     cdef:
         readonly object pool
+        # The slab class if the memory is a block of a slab.
+        _SlabClass _slab_class
+        # The chunk if the memory is not a block of a slab.
+        _Chunk _chunk
 
     def __init__(self, _Chunk chunk, pool):
         self._init(chunk, pool)
@@ -778,6 +924,7 @@ cdef class PooledMemory(BaseMemory):
         self.size = chunk.size
         self.device_id = chunk.mem.device_id
         self.pool = pool
+        self._chunk = chunk
 
     cpdef free(self):
         """Frees the memory buffer and returns it to the memory pool.
@@ -808,7 +955,8 @@ cdef class PooledMemory(BaseMemory):
                                          mem_ptr=ptr,
                                          pmem_id=pmem_id)
                 try:
-                    (<SingleDeviceMemoryPool>pool).free(ptr, size)
+                    (<SingleDeviceMemoryPool>pool)._free(
+                        ptr, size, self._slab_class, self._chunk)
                 finally:
                     for hook in hooks.values():
                         hook.free_postprocess(device_id=device_id,
@@ -816,7 +964,8 @@ cdef class PooledMemory(BaseMemory):
                                               mem_ptr=ptr,
                                               pmem_id=pmem_id)
                 return
-        (<SingleDeviceMemoryPool>pool).free(ptr, size)
+        (<SingleDeviceMemoryPool>pool)._free(
+            ptr, size, self._slab_class, self._chunk)
 
     def __dealloc__(self):
         if _exit_mode:
@@ -826,6 +975,51 @@ cdef class PooledMemory(BaseMemory):
 
 cdef size_t _index_compaction_threshold = 512
 
+# Maximum number and bytes of blocks carved from a slab. Each size class of
+# each stream reserves one slab, so the bytes bound the memory held by
+# the slabs of large size classes.
+cdef size_t _slab_n_blocks = 64
+cdef size_t _slab_bytes = 1 << 20
+
+
+cdef inline size_t _get_slab_size(size_t block_size):
+    return block_size * max(1, min(_slab_n_blocks, _slab_bytes // block_size))
+
+# Maximum number of chunks of each size kept in a thread cache.
+cdef size_t _thread_cache_n_chunks = 8
+
+# Minimum interval in seconds between checks of the release policy.
+cdef double _release_check_interval = 0.1
+
+
+def _get_freed_at(_Chunk chunk):
+    return chunk.freed_at
+
+
+@cython.final
+cdef class _FreeEvent:
+
+    """An event recorded on the stream where a chunk is freed."""
+
+    cdef readonly intptr_t ptr
+
+    def __init__(self, intptr_t stream_ptr):
+        self.ptr = runtime.eventCreateWithFlags(runtime.eventDisableTiming)
+        runtime.eventRecord(self.ptr, stream_ptr)
+
+    def __dealloc__(self):
+        # Note: Cannot raise in the destructor! (cython/cython#1613)
+        if self.ptr and not _exit_mode:
+            runtime.eventDestroy(self.ptr)
+
+    @property
+    def done(self):
+        return runtime.eventQuery(self.ptr) == 0  # cudaSuccess
+
+
+def _record_free_event(intptr_t stream_ptr):
+    return _FreeEvent(stream_ptr)
+
 
 # cudaMalloc() is aligned to at least 512 bytes
 # cf. https://gist.github.com/sonots/41daaa6432b1c8b27ef782cd14064269
@@ -980,6 +1174,45 @@ cpdef inline dict _parse_limit_string(limit=None):
     return {'size': size, 'fraction': fraction}
 
 
+cpdef _parse_slab_threshold(threshold=None):
+    if threshold is None:
+        threshold = os.environ.get('CUPY_GPU_MEMORY_SLAB_THRESHOLD')
+    if not threshold:
+        return 0
+    threshold = int(threshold)
+    if threshold < 0:
+        raise ValueError(
+            'slab threshold out of range: {}'.format(threshold))
+    return threshold // ALLOCATION_UNIT_SIZE * ALLOCATION_UNIT_SIZE
+
+
+_profile_version = 1
+
+
+cpdef dict _load_profile(file):
+    if isinstance(file, str):
+        with open(file) as f:
+            return _load_profile(f)
+    data = json.load(file)
+    if data.get('version') != _profile_version:
+        raise ValueError(
+            'Unsupported memory pool profile version: {}'.format(
+                data.get('version')))
+    return {int(size): count for size, count in data['chunks'].items()}
+
+
+cpdef _parse_thread_cache_size(size=None):
+    if size is None:
+        size = os.environ.get('CUPY_GPU_MEMORY_THREAD_CACHE')
+    if not size:
+        return 0
+    size = int(size)
+    if size < 0:
+        raise ValueError(
+            'thread cache size out of range: {}'.format(size))
+    return size
+
+
 @cython.final
 cdef class SingleDeviceMemoryPool:
     """Memory pool implementation for single device.
@@ -990,6 +1223,22 @@ cdef class SingleDeviceMemoryPool:
       cudaMalloc.
     - If the cudaMalloc fails, the allocator will free all cached blocks that
       are not split and retry the allocation.
+    - If ``CUPY_GPU_MEMORY_SLAB_THRESHOLD`` is set, allocations up to the
+      threshold are served from fixed-size blocks carved from larger chunks
+      (slabs) of each size, which are kept on free lists without splitting
+      and merging. A slab holds up to 64 blocks and 1 MiB (or a single
+      block). The slabs are released by :meth:`free_all_blocks` once all
+      the blocks of their size and stream are freed. If a slab cannot be
+      allocated, the requested size is allocated as without slabs.
+    - If ``CUPY_GPU_MEMORY_THREAD_CACHE`` is set, each thread keeps a few
+      recently freed chunks of each size up to the given bytes, which are
+      reused by the same thread without acquiring the locks of the pool.
+      The caches are flushed to the pool on the thread exit and by
+      :meth:`free_all_blocks`.
+    - If cross-stream reuse is enabled (see :meth:`set_cross_stream_reuse`),
+      an allocation that finds no cached block for the current stream may
+      take a non-split free block of another stream once the work queued
+      on that stream before the block was freed has completed.
     """
 
     cdef:
@@ -1005,6 +1254,22 @@ cdef class SingleDeviceMemoryPool:
         # `_free_lock` must be acquired to access it.
         dict _arenas
 
+        # Map from stream identifier to the list of the slab classes (or
+        # None) indexed by the bin index of the block size.
+        # `_free_lock` must be acquired to access it.
+        dict _slabs
+
+        # Maximum size of allocations served from slabs (0 to disable).
+        size_t _slab_threshold
+
+        # Maximum bytes of the chunks cached for each thread (0 to disable),
+        # and maximum size of a chunk to be cached.
+        size_t _thread_cache_size
+        size_t _thread_cache_max_chunk
+        # Thread-local `_ThreadCache`, and the weak set of all the caches.
+        object _thread_local
+        object _thread_caches
+
         # Number of total bytes actually allocated on GPU.
         # `_total_bytes_lock` must be acquired to access it.
         size_t _total_bytes
@@ -1013,6 +1278,25 @@ cdef class SingleDeviceMemoryPool:
         # `_total_bytes_lock` must be acquired to access it.
         size_t _total_bytes_limit
 
+        # Number of times chunks are split and merged.
+        # `_free_lock` must be acquired to access them.
+        size_t _n_splits
+        size_t _n_merges
+
+        # Release policy (see set_release_policy).
+        # `_free_lock` must be acquired to access them.
+        bint _has_release_policy
+        double _max_idle_seconds  # negative if disabled
+        object _high_watermark  # None if disabled
+        double _next_release_check
+        size_t _n_released_chunks
+        size_t _released_bytes
+
+        # Whether free chunks can be reused on other streams.
+        # `_free_lock` must be acquired to access them.
+        bint _cross_stream_reuse
+        size_t _n_cross_stream_reuses
+
         object __weakref__
         object _weakref
         object _free_lock
@@ -1025,6 +1309,14 @@ cdef class SingleDeviceMemoryPool:
             allocator = _malloc
         self._in_use = {}
         self._arenas = {}
+        self._slabs = {}
+        self._slab_threshold = _parse_slab_threshold()
+        self._thread_cache_size = _parse_thread_cache_size()
+        self._thread_cache_max_chunk = (
+            self._thread_cache_size // _thread_cache_n_chunks)
+        self._thread_local = threading.local()
+        self._thread_caches = weakref.WeakSet()
+        self._max_idle_seconds = -1
         self._allocator = allocator
         self._weakref = weakref.ref(self)
         self._device_id = device.get_device_id()
@@ -1102,9 +1394,26 @@ cdef class SingleDeviceMemoryPool:
         cdef MemoryPointer ret
         if size == 0:
             return MemoryPointer(Memory(0), 0)
+        if self._has_release_policy:
+            self._apply_release_policy()
 
         stream_ident = _get_stream_identifier(
             stream_module.get_current_stream_ptr())
+        if size <= self._slab_threshold:
+            ret = self._slab_malloc(size, stream_ident)
+            if ret is not None:
+                return ret
+
+        if size <= self._thread_cache_max_chunk:
+            cache = getattr(self._thread_local, 'cache', None)
+            if cache is not None:
+                chunk = (<_ThreadCache>cache).pop(size, stream_ident)
+                if chunk is not None:
+                    pmem = PooledMemory.__new__(PooledMemory)
+                    pmem._init(chunk, self._weakref)
+                    ret = MemoryPointer.__new__(MemoryPointer)
+                    ret._init(pmem, 0)
+                    return ret
 
         # find best-fit, or a smallest larger allocation
         gc_mode = _lock_no_gc(self._free_lock)
@@ -1130,46 +1439,183 @@ cdef class SingleDeviceMemoryPool:
         ret._init(pmem, 0)
         return ret
 
-    cpdef free(self, intptr_t ptr, size_t size):
-        cdef _Chunk chunk, c
+    cdef MemoryPointer _slab_malloc(self, size_t size, intptr_t stream_ident):
+        # Returns None if a new slab cannot be allocated.
+        cdef _SlabClass slab_class
+        cdef _Chunk chunk = None
+        cdef intptr_t ptr = 0
+        cdef size_t slab_size = _get_slab_size(size)
+        cdef PooledMemory pmem
+        cdef MemoryPointer ret
 
-        rlock.lock_fastrlock(self._in_use_lock, -1, True)
+        gc_mode = _lock_no_gc(self._free_lock)
         try:
-            chunk = self._in_use.pop(ptr)
-        except KeyError:
-            raise RuntimeError('Cannot free out-of-pool memory')
+            slab_class = self._get_slab_class(size, stream_ident)
+            if slab_class._free.empty():
+                chunk = self._get_chunk(slab_size, stream_ident)
+                if chunk is not None:
+                    slab_class.add_slab(chunk)
+            if not slab_class._free.empty():
+                ptr = slab_class._free.back()
+                slab_class._free.pop_back()
         finally:
-            rlock.unlock_fastrlock(self._in_use_lock)
-        stream_ident = chunk.stream_ident
+            _unlock_no_gc(self._free_lock, gc_mode)
 
+        if ptr == 0:
+            # cudaMalloc if a cache is not found
+            try:
+                mem = self._try_malloc(slab_size)
+            except OutOfMemoryError:
+                # Falls back to the allocation of the requested size.
+                return None
+            chunk = _Chunk.__new__(_Chunk)
+            chunk._init(mem, 0, slab_size, stream_ident)
+            gc_mode = _lock_no_gc(self._free_lock)
+            try:
+                slab_class.add_slab(chunk)
+                ptr = slab_class._free.back()
+                slab_class._free.pop_back()
+            finally:
+                _unlock_no_gc(self._free_lock, gc_mode)
+
+        pmem = PooledMemory.__new__(PooledMemory)
+        pmem.ptr = ptr
+        pmem.size = size
+        pmem.device_id = self._device_id
+        pmem.pool = self._weakref
+        pmem._slab_class = slab_class
+        ret = MemoryPointer.__new__(MemoryPointer)
+        ret._init(pmem, 0)
+        return ret
+
+    cdef _SlabClass _get_slab_class(self, size_t size, intptr_t stream_ident):
+        # need self._free_lock
+        cdef list classes = self._slabs.get(stream_ident, None)
+        cdef size_t bin_index = _bin_index_from_size(size)
+        if classes is None:
+            self._slabs[stream_ident] = classes = (
+                [None] * (_bin_index_from_size(self._slab_threshold) + 1))
+        slab_class = classes[bin_index]
+        if slab_class is None:
+            classes[bin_index] = slab_class = _SlabClass(size)
+        return slab_class
+
+    cdef _ThreadCache _get_thread_cache(self):
+        cache = getattr(self._thread_local, 'cache', None)
+        if cache is None:
+            cache = _ThreadCache(self._weakref, self._thread_cache_size)
+            self._thread_local.cache = cache
+            self._thread_caches.add(cache)
+        return cache
+
+    cdef list _get_thread_caches(self):
+        return list(self._thread_caches)
+
+    cdef _free(self, intptr_t ptr, size_t size, _SlabClass slab_class,
+               _Chunk chunk):
+        if slab_class is None:
+            if (chunk is not None and
+                    chunk.size <= self._thread_cache_max_chunk and
+                    self._get_thread_cache().push(chunk)):
+                return
+            self.free(ptr, size)
+            return
         gc_mode = _lock_no_gc(self._free_lock)
         try:
-            arena = self._arena(stream_ident)
+            slab_class._free.push_back(ptr)
+        finally:
+            _unlock_no_gc(self._free_lock, gc_mode)
 
-            c = chunk.next
-            if c is not None and arena.remove_from_free_list(c):
-                chunk.merge(c)
+    cpdef free(self, intptr_t ptr, size_t size):
+        cdef _Chunk chunk
+        cdef _SlabClass slab_class
 
-            c = chunk.prev
-            if c is not None and arena.remove_from_free_list(c):
-                c.merge(chunk)
-                chunk = c
+        rlock.lock_fastrlock(self._in_use_lock, -1, True)
+        try:
+            chunk = self._in_use.pop(ptr, None)
+        finally:
+            rlock.unlock_fastrlock(self._in_use_lock)
 
-            arena.append_to_free_list(chunk)
+        gc_mode = _lock_no_gc(self._free_lock)
+        try:
+            if chunk is not None:
+                self._free_chunk(chunk)
+                return
+            # The memory may be a block of a slab.
+            if size <= self._slab_threshold:
+                for classes in self._slabs.itervalues():
+                    slab_class = classes[_bin_index_from_size(size)]
+                    if slab_class is not None and slab_class.contains(ptr):
+                        slab_class._free.push_back(ptr)
+                        return
         finally:
             _unlock_no_gc(self._free_lock, gc_mode)
+        raise RuntimeError('Cannot free out-of-pool memory')
+
+    cdef _free_chunk(self, _Chunk chunk):
+        # need self._free_lock
+        cdef _Chunk c
+        cdef _Arena arena = self._arena(chunk.stream_ident)
+
+        c = chunk.next
+        if c is not None and arena.remove_from_free_list(c):
+            chunk.merge(c)
+            self._n_merges += 1
+
+        c = chunk.prev
+        if c is not None and arena.remove_from_free_list(c):
+            c.merge(chunk)
+            chunk = c
+            self._n_merges += 1
+
+        if self._has_release_policy:
+            chunk.freed_at = time.monotonic()
+        if self._cross_stream_reuse and chunk.stream_ident >= 0:
+            # The per-thread default stream (negative identifier) cannot be
+            # recorded from other threads.
+            chunk.free_event = _record_free_event(chunk.stream_ident)
+        arena.append_to_free_list(chunk)
+
+    cdef _release_slabs(self, intptr_t stream_ident):
+        # Returns the slabs of which all the blocks are free to the arena.
+        # need self._free_lock
+        cdef list classes = self._slabs.get(stream_ident, None)
+        cdef _SlabClass slab_class
+        cdef _Chunk chunk
+        cdef bint in_use = False
+        if classes is None:
+            return
+        for i, slab_class in enumerate(classes):
+            if slab_class is None:
+                continue
+            if slab_class._free.size() != slab_class.n_blocks:
+                in_use = True
+                continue
+            for chunk in slab_class._slabs:
+                self._free_chunk(chunk)
+            classes[i] = None
+        if not in_use:
+            del self._slabs[stream_ident]
 
     cpdef free_all_blocks(self, stream=None):
         """Free all **non-split** chunks"""
         cdef intptr_t stream_ident
+        cdef _ThreadCache cache
+
+        for cache in self._get_thread_caches():
+            cache.flush()
 
         with LockAndNoGc(self._free_lock):
             # free blocks in all arenas
             if stream is None:
+                for stream_ident in list(self._slabs.iterkeys()):
+                    self._release_slabs(stream_ident)
                 for stream_ident in list(self._arenas.iterkeys()):
                     self._compact_index(stream_ident, True)
             else:
-                self._compact_index(_get_stream_identifier(stream.ptr), True)
+                stream_ident = _get_stream_identifier(stream.ptr)
+                self._release_slabs(stream_ident)
+                self._compact_index(stream_ident, True)
 
     cpdef free_all_free(self):
         warnings.warn(
@@ -1186,20 +1632,34 @@ cdef class SingleDeviceMemoryPool:
                 for v in arena._free:
                     if v is not None:
                         n += len(v)
+            for slab_class in self._iter_slab_classes():
+                n += slab_class._free.size()
         finally:
             rlock.unlock_fastrlock(self._free_lock)
+        for cache in self._get_thread_caches():
+            n += (<_ThreadCache>cache).n_chunks
         return n
 
     cpdef size_t used_bytes(self):
         cdef size_t size = 0
         cdef _Chunk chunk
+        cdef _SlabClass slab_class
         rlock.lock_fastrlock(self._in_use_lock, -1, True)
         try:
             for chunk in self._in_use.itervalues():
                 size += chunk.size
         finally:
             rlock.unlock_fastrlock(self._in_use_lock)
-        return size
+        rlock.lock_fastrlock(self._free_lock, -1, True)
+        try:
+            for slab_class in self._iter_slab_classes():
+                size += slab_class.block_size * (
+                    slab_class.n_blocks - slab_class._free.size())
+        finally:
+            rlock.unlock_fastrlock(self._free_lock)
+        # Chunks in the thread caches are kept in `_in_use`.
+        cached = self._thread_cache_bytes()
+        return size - cached if size > cached else 0
 
     cpdef size_t free_bytes(self):
         cdef size_t size = 0
@@ -1214,10 +1674,264 @@ cdef class SingleDeviceMemoryPool:
                         continue
                     for chunk in free_list:
                         size += chunk.size
+            for slab_class in self._iter_slab_classes():
+                size += slab_class.block_size * slab_class._free.size()
         finally:
             rlock.unlock_fastrlock(self._free_lock)
+        return size + self._thread_cache_bytes()
+
+    cdef size_t _thread_cache_bytes(self):
+        cdef size_t size = 0
+        for cache in self._get_thread_caches():
+            size += (<_ThreadCache>cache).n_bytes
         return size
 
+    cpdef dict stats(self):
+        cdef size_t i, n, bin_size, arena_bytes, arena_largest
+        cdef size_t free_bytes = 0, largest = 0, slab_free_bytes = 0
+        cdef dict arenas = {}, bins
+        cdef _Arena arena
+        cdef _SlabClass slab_class
+        cdef size_t used_bytes = self.used_bytes()
+
+        rlock.lock_fastrlock(self._free_lock, -1, True)
+        try:
+            for stream_ident, arena in self._arenas.iteritems():
+                bins = {}
+                arena_bytes = 0
+                arena_largest = 0
+                for i in range(arena._index.size()):
+                    free_list = arena._free[i]
+                    if not free_list:
+                        continue
+                    # All chunks in a bin have the same size.
+                    n = len(free_list)
+                    bin_size = (arena._index[i] + 1) * ALLOCATION_UNIT_SIZE
+                    bins[bin_size] = n
+                    arena_bytes += n * bin_size
+                    arena_largest = bin_size
+                arenas[stream_ident] = {
+                    'free_bytes': arena_bytes,
+                    'largest_free_chunk': arena_largest,
+                    'bins': bins,
+                }
+                free_bytes += arena_bytes
+                largest = max(largest, arena_largest)
+            for slab_class in self._iter_slab_classes():
+                slab_free_bytes += (
+                    slab_class.block_size * slab_class._free.size())
+            thread_cache_bytes = self._thread_cache_bytes()
+            n_splits = self._n_splits
+            n_merges = self._n_merges
+            n_released_chunks = self._n_released_chunks
+            released_bytes = self._released_bytes
+            n_cross_stream_reuses = self._n_cross_stream_reuses
+        finally:
+            rlock.unlock_fastrlock(self._free_lock)
+
+        return {
+            'used_bytes': used_bytes,
+            'free_bytes': free_bytes + slab_free_bytes + thread_cache_bytes,
+            'total_bytes': self.total_bytes(),
+            'slab_free_bytes': slab_free_bytes,
+            'thread_cache_bytes': thread_cache_bytes,
+            'largest_free_chunk': largest,
+            'fragmentation': (
+                0.0 if free_bytes == 0
+                else 1.0 - <double>largest / free_bytes),
+            'n_splits': n_splits,
+            'n_merges': n_merges,
+            'n_released_chunks': n_released_chunks,
+            'released_bytes': released_bytes,
+            'n_cross_stream_reuses': n_cross_stream_reuses,
+            'arenas': arenas,
+        }
+
+    cpdef set_release_policy(self, max_idle_seconds=None, high_watermark=None):
+        if max_idle_seconds is not None and max_idle_seconds < 0:
+            raise ValueError(
+                'max_idle_seconds out of range: {}'.format(max_idle_seconds))
+        if high_watermark is not None and high_watermark < 0:
+            raise ValueError(
+                'high_watermark out of range: {}'.format(high_watermark))
+        cdef _Arena arena
+        cdef _Chunk chunk
+        now = time.monotonic()
+        with LockAndNoGc(self._free_lock):
+            self._max_idle_seconds = (
+                -1 if max_idle_seconds is None else max_idle_seconds)
+            self._high_watermark = (
+                None if high_watermark is None else int(high_watermark))
+            self._has_release_policy = (
+                max_idle_seconds is not None or high_watermark is not None)
+            self._next_release_check = 0
+            # The idle time of the chunks already freed is counted from now.
+            for arena in self._arenas.itervalues():
+                for free_list in arena._free:
+                    if free_list:
+                        for chunk in free_list:
+                            chunk.freed_at = now
+
+    cpdef dict get_release_policy(self):
+        with LockAndNoGc(self._free_lock):
+            return {
+                'max_idle_seconds': (
+                    None if self._max_idle_seconds < 0
+                    else self._max_idle_seconds),
+                'high_watermark': self._high_watermark,
+            }
+
+    cpdef reserve(self, sizes, stream=None):
+        cdef list chunk_sizes = [], chunks = []
+        cdef size_t total = 0
+        cdef intptr_t stream_ident
+        cdef _Chunk chunk
+        cdef _Arena arena
+
+        if isinstance(sizes, str) or hasattr(sizes, 'read'):
+            sizes = _load_profile(sizes)
+        if isinstance(sizes, dict):
+            items = sizes.items()
+        else:
+            items = [(size, 1) for size in sizes]
+        for size, count in items:
+            if size < 0 or count < 0:
+                raise ValueError(
+                    'invalid size or count to reserve: {}, {}'.format(
+                        size, count))
+            if size == 0:
+                continue
+            size = _round_size(size)
+            chunk_sizes += [size] * count
+            total += size * count
+        if total == 0:
+            return
+
+        if stream is None:
+            stream_ident = _get_stream_identifier(
+                stream_module.get_current_stream_ptr())
+        else:
+            stream_ident = _get_stream_identifier(stream.ptr)
+        # Allocate each chunk separately so that the chunks are never merged
+        # with their neighbors and keep their sizes after being used.
+        for size in chunk_sizes:
+            mem = self._try_malloc(size)
+            chunk = _Chunk.__new__(_Chunk)
+            chunk._init(mem, 0, size, stream_ident)
+            chunks.append(chunk)
+        now = time.monotonic() if self._has_release_policy else 0
+        with LockAndNoGc(self._free_lock):
+            arena = self._arena(stream_ident)
+            for chunk in chunks:
+                chunk.freed_at = now
+                arena.append_to_free_list(chunk)
+
+    cpdef dict get_profile(self):
+        cdef dict profile = {}
+        cdef _Chunk chunk
+        cdef _Arena arena
+        cdef _SlabClass slab_class
+        rlock.lock_fastrlock(self._in_use_lock, -1, True)
+        try:
+            chunks = list(self._in_use.itervalues())
+        finally:
+            rlock.unlock_fastrlock(self._in_use_lock)
+        rlock.lock_fastrlock(self._free_lock, -1, True)
+        try:
+            for arena in self._arenas.itervalues():
+                for free_list in arena._free:
+                    if free_list:
+                        chunks += free_list
+            for slab_class in self._iter_slab_classes():
+                chunks += slab_class._slabs
+        finally:
+            rlock.unlock_fastrlock(self._free_lock)
+        for chunk in chunks:
+            profile[chunk.size] = profile.get(chunk.size, 0) + 1
+        return profile
+
+    cpdef dump_profile(self, file):
+        if isinstance(file, str):
+            with open(file, 'w') as f:
+                self.dump_profile(f)
+            return
+        profile = self.get_profile()
+        json.dump({
+            'version': _profile_version,
+            'chunks': {str(size): profile[size] for size in sorted(profile)},
+        }, file, indent=1)
+
+    cpdef set_cross_stream_reuse(self, bint enabled=True):
+        cdef _Arena arena
+        cdef _Chunk chunk
+        with LockAndNoGc(self._free_lock):
+            self._cross_stream_reuse = enabled
+            for arena in self._arenas.itervalues():
+                for free_list in arena._free:
+                    if not free_list:
+                        continue
+                    for chunk in free_list:
+                        chunk.free_event = None
+                        if enabled and chunk.stream_ident >= 0:
+                            chunk.free_event = _record_free_event(
+                                chunk.stream_ident)
+
+    cpdef bint get_cross_stream_reuse(self):
+        with LockAndNoGc(self._free_lock):
+            return self._cross_stream_reuse
+
+    cdef _apply_release_policy(self):
+        cdef double now = time.monotonic()
+        if now < self._next_release_check:
+            return
+        self._next_release_check = now + _release_check_interval
+        gc_mode = _lock_no_gc(self._free_lock)
+        try:
+            self._release_free_chunks(now)
+        finally:
+            _unlock_no_gc(self._free_lock, gc_mode)
+
+    cdef _release_free_chunks(self, double now):
+        # Releases the non-split free chunks idle for longer than
+        # `_max_idle_seconds`, and then the oldest ones while the total bytes
+        # exceed `_high_watermark`. need self._free_lock
+        cdef list candidates = []
+        cdef _Arena arena
+        cdef _Chunk chunk
+        cdef size_t n_released = 0, released_bytes = 0
+        cdef size_t total_bytes = self.total_bytes()
+        for arena in self._arenas.itervalues():
+            for free_list in arena._free:
+                if not free_list:
+                    continue
+                for chunk in free_list:
+                    if chunk.prev is None and chunk.next is None:
+                        candidates.append(chunk)
+        candidates.sort(key=_get_freed_at)
+        for chunk in candidates:
+            if not (
+                    (self._max_idle_seconds >= 0 and
+                     now - chunk.freed_at >= self._max_idle_seconds) or
+                    (self._high_watermark is not None and
+                     total_bytes - released_bytes > self._high_watermark)):
+                break
+            arena = self._arenas[chunk.stream_ident]
+            arena.remove_from_free_list(chunk)
+            n_released += 1
+            released_bytes += chunk.size
+        if n_released == 0:
+            return
+        self._n_released_chunks += n_released
+        self._released_bytes += released_bytes
+        with LockAndNoGc(self._total_bytes_lock):
+            self._total_bytes -= released_bytes
+
+    cdef list _iter_slab_classes(self):
+        # need self._free_lock
+        return [slab_class
+                for classes in self._slabs.itervalues()
+                for slab_class in classes if slab_class is not None]
+
     cpdef size_t total_bytes(self):
         with LockAndNoGc(self._total_bytes_lock):
             return self._total_bytes
@@ -1313,9 +2027,55 @@ cdef class SingleDeviceMemoryPool:
                 self._compact_index(stream_ident, False)
             remaining = chunk.split(size)
             if remaining is not None:
+                self._n_splits += 1
+                remaining.freed_at = chunk.freed_at
                 a.append_to_free_list(remaining)
             assert chunk.stream_ident == stream_ident
             return chunk
+        if self._cross_stream_reuse:
+            return self._claim_chunk(size, stream_ident)
+        return None
+
+    cdef object _claim_chunk(self, size_t size, intptr_t stream_ident):
+        # Takes a non-split free chunk of another stream of which the free
+        # event is done, and moves it to the arena of `stream_ident`.
+        # need self._free_lock
+        cdef set free_list
+        cdef size_t i, index
+        cdef _Chunk chunk, found
+        cdef _Arena arena
+        cdef size_t bin_index = _bin_index_from_size(size)
+        cdef _Arena a = self._arena(stream_ident)
+        for other_ident, arena in self._arenas.iteritems():
+            if other_ident == stream_ident:
+                continue
+            index = <size_t>(
+                algorithm.lower_bound(
+                    arena._index.begin(), arena._index.end(), bin_index)
+                - arena._index.begin())
+            for i in range(index, arena._index.size()):
+                if arena._flag.at(i) == 0:
+                    continue
+                found = None
+                free_list = arena._free[i]
+                for chunk in free_list:
+                    if (chunk.prev is None and chunk.next is None and
+                            chunk.free_event is not None and
+                            chunk.free_event.done):
+                        found = chunk
+                        break
+                if found is None:
+                    continue
+                arena.remove_from_free_list(found)
+                found.stream_ident = stream_ident
+                found.free_event = None
+                remaining = found.split(size)
+                if remaining is not None:
+                    self._n_splits += 1
+                    remaining.freed_at = found.freed_at
+                    a.append_to_free_list(remaining)
+                self._n_cross_stream_reuses += 1
+                return found
         return None
 
     cdef BaseMemory _try_malloc(self, size_t size):
@@ -1474,6 +2234,45 @@ cdef class MemoryPool:
         mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
         return mp.total_bytes()
 
+    cpdef dict stats(self):
+        """Gets the statistics of the pool for the current device.
+
+        This can be used to tell whether an out-of-memory error despite a
+        large amount of free bytes is due to fragmentation or to the
+        isolation of the free blocks among streams. It walks all the chunks
+        in use (as :meth:`used_bytes` and :meth:`total_bytes` do) and the
+        bins of the free lists under the locks of the pool, so polling it
+        frequently slows down the allocations in other threads.
+
+        Returns:
+            dict: The statistics with the following keys.
+
+            - ``used_bytes``, ``free_bytes``, ``total_bytes``: The same as
+              :meth:`used_bytes`, :meth:`free_bytes` and :meth:`total_bytes`.
+            - ``slab_free_bytes``: The bytes of free blocks in slabs (see
+              ``CUPY_GPU_MEMORY_SLAB_THRESHOLD``).
+            - ``thread_cache_bytes``: The bytes of free chunks kept in the
+              per-thread caches (see ``CUPY_GPU_MEMORY_THREAD_CACHE``).
+            - ``largest_free_chunk``: The size of the largest contiguous free
+              chunk in bytes.
+            - ``fragmentation``: ``1 - largest_free_chunk / F``, where ``F``
+              is the free bytes excluding slabs. ``0`` means that all the
+              free bytes are in a single chunk.
+            - ``n_splits``, ``n_merges``: The number of times free chunks are
+              split and merged.
+            - ``n_released_chunks``, ``released_bytes``: The number of chunks
+              and bytes released by the release policy (see
+              :meth:`set_release_policy`).
+            - ``n_cross_stream_reuses``: The number of free chunks of other
+              streams reused (see :meth:`set_cross_stream_reuse`).
+            - ``arenas``: A dict mapping each stream identifier to the dict
+              of ``free_bytes``, ``largest_free_chunk`` and ``bins`` (a dict
+              mapping the chunk size to the number of free chunks) of the
+              arena of the stream.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        return mp.stats()
+
     cpdef set_limit(self, size=None, fraction=None):
         """Sets the upper limit of memory allocation of the current device.
 
@@ -1513,6 +2312,124 @@ cdef class MemoryPool:
         mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
         return mp.get_limit()
 
+    cpdef set_release_policy(self, max_idle_seconds=None, high_watermark=None):
+        """Sets the policy to release free blocks of the current device.
+
+        By default, free blocks are kept in the pool until
+        :meth:`free_all_blocks` is called or an allocation fails. With a
+        release policy, the free blocks that are not split are released
+        in allocations (at most once every 0.1 seconds) without a background
+        thread.
+
+        If both of the arguments are ``None``, the policy is disabled.
+
+        Args:
+            max_idle_seconds (float): Free blocks kept unused for longer than
+                this duration in seconds are released.
+            high_watermark (int): While the total bytes acquired by the pool
+                exceed this size, free blocks are released from the least
+                recently freed one.
+
+        .. note::
+            The numbers of released blocks and bytes are reported as
+            ``n_released_chunks`` and ``released_bytes`` in :meth:`stats`.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        mp.set_release_policy(max_idle_seconds, high_watermark)
+
+    cpdef dict get_release_policy(self):
+        """Gets the release policy of the current device.
+
+        Returns:
+            dict: ``max_idle_seconds`` and ``high_watermark`` set by
+            :meth:`set_release_policy`.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        return mp.get_release_policy()
+
+    cpdef set_cross_stream_reuse(self, bint enabled=True):
+        """Enables reusing free blocks across streams on the current device.
+
+        Free blocks are cached per stream, so a block freed on a stream is
+        normally reused only by allocations on the same stream. When enabled,
+        an event is recorded on the stream each time a block is freed, and an
+        allocation that finds no cached block for its stream takes a free
+        block of another stream whose event has completed. The event is only
+        queried, so the allocation never waits for other streams.
+
+        Blocks split from a larger allocation and blocks freed on the
+        per-thread default stream are not reused across streams.
+
+        Args:
+            enabled (bool): Whether to enable cross-stream reuse.
+
+        .. note::
+            The number of blocks reused across streams is reported as
+            ``n_cross_stream_reuses`` in :meth:`stats`.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        mp.set_cross_stream_reuse(enabled)
+
+    cpdef bint get_cross_stream_reuse(self):
+        """Returns whether cross-stream reuse is enabled on the current device.
+
+        Returns:
+            bool: The value set by :meth:`set_cross_stream_reuse`.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        return mp.get_cross_stream_reuse()
+
+    cpdef reserve(self, sizes, stream=None):
+        """Reserves free blocks of the current device in advance.
+
+        Each block is allocated from the device separately and kept free in
+        the pool, so that the subsequent allocations of those sizes are
+        served from the pool without allocating from the device. As the
+        blocks are never merged with each other, they keep their sizes
+        after being allocated and freed. This is useful to warm up the pool
+        at the startup.
+
+        Args:
+            sizes: The sizes of the blocks to reserve. It can be an iterable
+                of sizes in bytes, a dict mapping sizes to the numbers of
+                blocks (e.g., the profile returned by :meth:`get_profile`),
+                or a path or file object of a profile written by
+                :meth:`dump_profile`.
+            stream (cupy.cuda.Stream): The stream for which the blocks are
+                reserved. The current stream is used by default.
+
+        .. note::
+            The reserved blocks are released by :meth:`free_all_blocks` like
+            the other free blocks. Blocks split by larger allocations are
+            released once the split blocks are freed and merged back.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        mp.reserve(sizes, stream)
+
+    cpdef dict get_profile(self):
+        """Gets the sizes of the blocks held by the pool of the current device.
+
+        Returns:
+            dict: Mapping from the block size in bytes to the number of
+            blocks, including both used and free blocks.
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        return mp.get_profile()
+
+    cpdef dump_profile(self, file):
+        """Writes the profile of the current device as a JSON file.
+
+        The profile of a warmed-up pool can be passed to :meth:`reserve` at
+        the next startup.
+
+        Args:
+            file (str or file object): Path or text file object.
+
+        .. seealso:: :meth:`get_profile`
+        """
+        mp = <SingleDeviceMemoryPool>self._pools[device.get_device_id()]
+        mp.dump_profile(file)
+
 
 cdef bint MemoryAsyncHasStat = (runtime.driverGetVersion() >= 11030)
 
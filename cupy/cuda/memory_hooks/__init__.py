@@ -1,6 +1,10 @@
 from cupy.cuda.memory_hooks import debug_print  # NOQA
 from cupy.cuda.memory_hooks import line_profile  # NOQA
+from cupy.cuda.memory_hooks import sampling  # NOQA
+from cupy.cuda.memory_hooks import trace  # NOQA
 
 # import class and function
 from cupy.cuda.memory_hooks.debug_print import DebugPrintHook  # NOQA
 from cupy.cuda.memory_hooks.line_profile import LineProfileHook  # NOQA
+from cupy.cuda.memory_hooks.sampling import SamplingProfileHook  # NOQA
+from cupy.cuda.memory_hooks.trace import AllocationTraceHook  # NOQA
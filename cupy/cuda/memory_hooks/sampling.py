@@ -0,0 +1,199 @@
+import math
+from os import path
+import random
+import sys
+
+from cupy.cuda import memory_hook
+
+
+_other = (('<other>', 0, '<other>'),)
+
+
+class SamplingProfileHook(memory_hook.MemoryHook):
+    """Sampling CuPy memory profiler.
+
+    Unlike :class:`~cupy.cuda.memory_hooks.LineProfileHook`, which walks
+    the stack on every allocation, this profiler inspects the stack only for
+    sampled allocations, so that it can be left enabled with a low overhead.
+    By default, allocations are sampled by a Poisson process over the
+    allocated bytes (on average once every ``sample_bytes`` bytes), and
+    each sample is weighted by the inverse of its sampling probability, so
+    that the reported numbers are unbiased estimates of the actual ones.
+
+    The samples are aggregated into a table keyed by the callsite (stack
+    trace). When the table reaches ``max_entries``, new callsites are
+    aggregated into a single ``<other>`` entry.
+
+    Example:
+        Code example::
+
+            from cupy.cuda import memory_hooks
+            hook = memory_hooks.SamplingProfileHook()
+            with hook:
+                # some CuPy codes
+            hook.print_report()
+            with open('cupy.folded', 'w') as f:
+                hook.dump_collapsed(f)
+
+        Output example of :meth:`print_report`::
+
+                 alloc   alloc%      inuse  count  callsite
+              512.00MB   80.00%      0.00B     16  test.py:12:train
+              128.00MB   20.00%   128.00MB      4  test.py:20:predict
+
+        The output of :meth:`dump_collapsed` can be rendered by
+        ``flamegraph.pl`` and compatible tools.
+
+    Args:
+        sample_bytes (int): Average number of bytes between the samples.
+        sample_every (int): If given, every ``sample_every``-th allocation
+            is sampled instead of sampling over the allocated bytes.
+        max_entries (int): Maximum number of callsites to aggregate.
+        max_depth (int): Maximum number of the innermost frames to record.
+            Default is 0 (no limit).
+        seed (int): Seed of the sampling.
+    """
+
+    name = 'SamplingProfileHook'
+
+    def __init__(self, sample_bytes=512 * 1024, sample_every=None,
+                 max_entries=4096, max_depth=0, seed=None):
+        if sample_bytes <= 0:
+            raise ValueError(
+                'sample_bytes must be positive: {}'.format(sample_bytes))
+        if sample_every is not None and sample_every <= 0:
+            raise ValueError(
+                'sample_every must be positive: {}'.format(sample_every))
+        self._sample_bytes = sample_bytes
+        self._sample_every = sample_every
+        self._max_entries = max_entries
+        self._max_depth = max_depth
+        self._filename = path.abspath(__file__)
+        self._random = random.Random(seed)
+        # Map from stack to [alloc_count, alloc_bytes, inuse_bytes, samples]
+        self._table = {}
+        # Map from sampled pointer to the stack and the estimated bytes.
+        self._live = {}
+        self._countdown = self._next_countdown()
+
+    def _next_countdown(self):
+        if self._sample_every is not None:
+            return self._sample_every
+        return self._random.expovariate(1.0 / self._sample_bytes)
+
+    # callback
+    def malloc_postprocess(self, device_id, size, mem_size, mem_ptr,
+                           pmem_id):
+        if self._sample_every is not None:
+            self._countdown -= 1
+        else:
+            self._countdown -= mem_size
+        if self._countdown > 0 or mem_ptr == 0:
+            return
+        self._countdown = self._next_countdown()
+
+        if self._sample_every is not None:
+            weight = self._sample_every
+        else:
+            # Inverse of the probability that the allocation is sampled.
+            weight = 1.0 / -math.expm1(-mem_size / self._sample_bytes)
+        est_bytes = mem_size * weight
+        stack = self._extract_stack()
+        entry = self._table.get(stack)
+        if entry is None:
+            if len(self._table) >= self._max_entries:
+                stack = _other
+                entry = self._table.get(stack)
+            if entry is None:
+                entry = self._table[stack] = [0.0, 0.0, 0.0, 0]
+        entry[0] += weight
+        entry[1] += est_bytes
+        entry[2] += est_bytes
+        entry[3] += 1
+        self._live[mem_ptr] = (entry, est_bytes)
+
+    # callback
+    def free_postprocess(self, device_id, mem_size, mem_ptr, pmem_id):
+        live = self._live.pop(mem_ptr, None)
+        if live is not None:
+            entry, est_bytes = live
+            entry[2] -= est_bytes
+
+    def _extract_stack(self):
+        frames = []
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename != self._filename:
+                frames.append((code.co_filename, frame.f_lineno, code.co_name))
+                if 0 < self._max_depth <= len(frames):
+                    break
+            frame = frame.f_back
+        frames.reverse()
+        return tuple(frames)
+
+    def get_samples(self):
+        """Returns the aggregated samples.
+
+        Returns:
+            list of dict: Each dict has ``stack`` (list of
+            ``filename:lineno:function`` from the outermost frame),
+            ``alloc_count``, ``alloc_bytes`` and ``inuse_bytes`` (estimated
+            numbers) and ``samples`` (the number of samples), sorted by
+            ``alloc_bytes`` in the descending order.
+        """
+        samples = [{
+            'stack': ['%s:%d:%s' % frame for frame in stack],
+            'alloc_count': entry[0],
+            'alloc_bytes': entry[1],
+            'inuse_bytes': entry[2],
+            'samples': entry[3],
+        } for stack, entry in self._table.items()]
+        samples.sort(key=lambda s: s['alloc_bytes'], reverse=True)
+        return samples
+
+    def print_report(self, file=sys.stdout, limit=20):
+        """Prints the callsites allocating the most bytes.
+
+        Args:
+            file: Output file-like object.
+            limit (int): Maximum number of callsites to print.
+        """
+        samples = self.get_samples()
+        total = sum([s['alloc_bytes'] for s in samples]) or 1.0
+        file.write('%10s %8s %10s %6s  %s\n' % (
+            'alloc', 'alloc%', 'inuse', 'count', 'callsite'))
+        for s in samples[:limit]:
+            file.write('%10s %7.2f%% %10s %6d  %s\n' % (
+                _humanized_size(s['alloc_bytes']),
+                100.0 * s['alloc_bytes'] / total,
+                _humanized_size(s['inuse_bytes']),
+                round(s['alloc_count']),
+                s['stack'][-1] if s['stack'] else '<unknown>'))
+        file.flush()
+
+    def dump_collapsed(self, file=sys.stdout, inuse=False):
+        """Writes the samples in the collapsed stack format of flame graphs.
+
+        Each line consists of the frames joined by ``;`` from the outermost
+        one and the estimated bytes.
+
+        Args:
+            file: Output file-like object.
+            inuse (bool): If ``True``, the bytes still in use are written
+                instead of the allocated bytes.
+        """
+        key = 'inuse_bytes' if inuse else 'alloc_bytes'
+        for s in self.get_samples():
+            value = int(round(s[key]))
+            if value > 0:
+                file.write('%s %d\n' % (';'.join(s['stack']), value))
+        file.flush()
+
+
+def _humanized_size(size):
+    for unit in ['', 'K', 'M', 'G', 'T', 'P', 'E']:
+        if size < 1024.0:
+            return '%3.2f%sB' % (size, unit)
+        size /= 1024.0
+    return '%.2f%sB' % (size, 'Z')
@@ -0,0 +1,151 @@
+import json
+import os
+import sys
+import time
+
+import numpy
+
+from cupy.cuda import memory_hook
+from cupy.cuda import stream as stream_module
+
+
+# Event codes of the trace records.
+MALLOC = 0
+FREE = 1
+ALLOC = 2
+
+_magic = b'CPTRACE1'
+
+# Layout of a trace record (packed, little endian).
+trace_dtype = numpy.dtype([
+    ('event', '<u1'),
+    ('device_id', '<u1'),
+    ('callsite', '<u4'),
+    ('size', '<u8'),
+    ('ptr', '<u8'),
+    ('stream', '<i8'),
+    ('timestamp', '<f8'),
+])
+
+_no_callsite = 0xffffffff
+
+
+def read_trace(file):
+    """Reads a trace written by :class:`AllocationTraceHook`.
+
+    Args:
+        file (str or file object): Path or binary file object of the trace.
+
+    Returns:
+        numpy.ndarray: Structured array of the trace records. The fields are
+        ``event`` (``MALLOC``, ``FREE`` or ``ALLOC``), ``device_id``,
+        ``callsite``, ``size``, ``ptr``, ``stream`` and ``timestamp``.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            return read_trace(f)
+    magic = file.read(len(_magic))
+    if magic != _magic:
+        raise ValueError('Not an allocation trace: {!r}'.format(magic))
+    data = file.read()
+    n = len(data) // trace_dtype.itemsize
+    return numpy.frombuffer(
+        data, dtype=trace_dtype, count=n).copy()
+
+
+class AllocationTraceHook(memory_hook.MemoryHook):
+    """Memory hook that records allocations into a compact binary trace.
+
+    Each ``malloc`` and ``free`` of the memory pool (and each allocation
+    from the device made by the pool) is written as a fixed-size record
+    holding the rounded size, the pointer, the current stream, the time
+    elapsed since the hook is created and the callsite ID. The trace can be
+    loaded with :func:`read_trace` and replayed without GPU by
+    :mod:`cupyx.tools.pool_simulator`.
+
+    Callsite IDs index :attr:`callsites`, the list of the innermost frames
+    (``filename:lineno:function``) outside CuPy that requested the memory.
+    Use :meth:`dump_callsites` to save them.
+
+    Example:
+        Code example::
+
+            from cupy.cuda import memory_hooks
+            with open('trace.bin', 'wb') as f:
+                hook = memory_hooks.AllocationTraceHook(f)
+                with hook:
+                    # some CuPy codes
+            hook.dump_callsites('trace.callsites.json')
+
+    Args:
+        file: Binary file object to write the trace to.
+        callsite (bool): If ``False``, callsites are not recorded, which
+            reduces the overhead of the hook.
+
+    Attributes:
+        callsites (list of str): Callsites indexed by the callsite ID.
+    """
+
+    name = 'AllocationTraceHook'
+
+    def __init__(self, file, callsite=True):
+        self.file = file
+        self.callsites = []
+        self._callsite = callsite
+        self._callsite_ids = {}
+        self._start = time.perf_counter()
+        self._record = numpy.zeros(1, dtype=trace_dtype)
+        self._cupy_dir = os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))))
+        file.write(_magic)
+
+    def _get_callsite(self):
+        if not self._callsite:
+            return _no_callsite
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename.startswith(
+                self._cupy_dir):
+            frame = frame.f_back
+        if frame is None:
+            return _no_callsite
+        code = frame.f_code
+        key = (code.co_filename, frame.f_lineno, code.co_name)
+        callsite_id = self._callsite_ids.get(key)
+        if callsite_id is None:
+            callsite_id = self._callsite_ids[key] = len(self.callsites)
+            self.callsites.append('%s:%d:%s' % key)
+        return callsite_id
+
+    def _write(self, event, device_id, size, ptr):
+        record = self._record
+        record['event'] = event
+        record['device_id'] = device_id
+        record['callsite'] = self._get_callsite()
+        record['size'] = size
+        record['ptr'] = ptr
+        record['stream'] = stream_module.get_current_stream().ptr
+        record['timestamp'] = time.perf_counter() - self._start
+        self.file.write(record.tobytes())
+
+    def alloc_postprocess(self, device_id, mem_size, mem_ptr):
+        if mem_ptr:
+            self._write(ALLOC, device_id, mem_size, mem_ptr)
+
+    def malloc_postprocess(self, device_id, size, mem_size, mem_ptr,
+                           pmem_id):
+        if mem_ptr:
+            self._write(MALLOC, device_id, mem_size, mem_ptr)
+
+    def free_postprocess(self, device_id, mem_size, mem_ptr, pmem_id):
+        self._write(FREE, device_id, mem_size, mem_ptr)
+
+    def dump_callsites(self, file):
+        """Writes :attr:`callsites` as a JSON list.
+
+        Args:
+            file (str or file object): Path or text file object.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w') as f:
+                return self.dump_callsites(f)
+        json.dump(self.callsites, file, indent=1)
@@ -26,13 +26,33 @@ cdef class PinnedMemoryPool:
     cdef:
         object _alloc
         dict _in_use
-        object _free
+        # Map from block size to the list of (freed time, memory).
+        dict _free
         object __weakref__
         object _weakref
         object _lock
         size_t _allocation_unit_size
+        size_t _total_bytes
+        size_t _total_bytes_limit
+        double _max_idle_seconds  # negative if disabled
+        double _next_release_check
+        size_t _n_allocs
+        size_t _n_best_fit_reuses
+        size_t _n_released_blocks
+        size_t _released_bytes
 
     cpdef PinnedMemoryPointer malloc(self, size_t size)
+    cdef _pop_free(self, size_t size)
+    cdef _alloc_block(self, size_t size)
     cpdef free(self, intptr_t ptr, size_t size)
     cpdef free_all_blocks(self)
     cpdef n_free_blocks(self)
+    cpdef size_t used_bytes(self)
+    cpdef size_t free_bytes(self)
+    cpdef size_t total_bytes(self)
+    cpdef dict stats(self)
+    cpdef set_limit(self, size=*)
+    cpdef size_t get_limit(self)
+    cpdef set_release_policy(self, max_idle_seconds=*)
+    cpdef get_release_policy(self)
+    cdef _apply_release_policy(self)
@@ -1,11 +1,12 @@
 # distutils: language = c++
 
-import collections
+import time
 import weakref
 
 from fastrlock cimport rlock
 
 from cupy_backends.cuda.api import runtime
+from cupy.cuda.memory import OutOfMemoryError
 
 from cupy._core cimport internal
 from cupy_backends.cuda.api cimport runtime
@@ -183,6 +184,12 @@ cpdef PinnedMemoryPointer _malloc(size_t size):
 
 
 cdef object _current_allocator = _malloc
+
+# A free block is reused for an allocation up to this times smaller.
+cdef size_t _max_reuse_ratio = 4
+
+# Minimum interval in seconds between checks of the release policy.
+cdef double _release_check_interval = 0.1
 cdef _EventWatcher _watcher = _EventWatcher()
 
 
@@ -268,8 +275,16 @@ cdef class PinnedMemoryPool:
 
     Note that it preserves all allocated memory buffers even if the user
     explicitly release the one. Those released memory buffers are held by the
-    memory pool as *free blocks*, and reused for further memory allocations of
-    the same size.
+    memory pool as *free blocks*, and reused for further memory allocations.
+
+    - The sizes of the blocks are rounded up to a power of two (at least 512
+      bytes). An allocation is served from the free blocks of the same size
+      or, if there are none, the smallest free block up to 4 times larger.
+      Otherwise a new block is allocated with ``cudaHostAlloc``.
+    - If a limit is set by :meth:`set_limit` and a new block would exceed
+      it, all the free blocks are released before the allocation.
+    - If a release policy is set by :meth:`set_release_policy`, free blocks
+      left unused for a while are released in allocations.
 
     Args:
         allocator (function): The base CuPy pinned memory allocator. It is
@@ -280,14 +295,14 @@ cdef class PinnedMemoryPool:
 
     def __init__(self, allocator=_malloc):
         self._in_use = {}
-        self._free = collections.defaultdict(list)
+        self._free = {}
         self._alloc = allocator
         self._weakref = weakref.ref(self)
         self._lock = rlock.create_fastrlock()
         self._allocation_unit_size = 512
+        self._max_idle_seconds = -1
 
     cpdef PinnedMemoryPointer malloc(self, size_t size):
-        cdef list free
         cdef size_t unit
 
         if size == 0:
@@ -298,24 +313,52 @@ cdef class PinnedMemoryPool:
         size = internal.clp2(((size + unit - 1) // unit) * unit)
         rlock.lock_fastrlock(self._lock, -1, True)
         try:
-            free = self._free[size]
-            if free:
-                mem = free.pop()
-            else:
-                try:
-                    mem = self._alloc(size).mem
-                except runtime.CUDARuntimeError as e:
-                    if e.status != runtime.errorMemoryAllocation:
-                        raise
-                    self.free_all_blocks()
-                    mem = self._alloc(size).mem
-
+            if self._max_idle_seconds >= 0:
+                self._apply_release_policy()
+            mem = self._pop_free(size)
+            if mem is None:
+                mem = self._alloc_block(size)
             self._in_use[mem.ptr] = mem
         finally:
             rlock.unlock_fastrlock(self._lock)
         pmem = PooledPinnedMemory(mem, self._weakref)
         return PinnedMemoryPointer(pmem, 0)
 
+    cdef _pop_free(self, size_t size):
+        # Returns the free block of the best-fit size (need self._lock).
+        cdef list free = self._free.get(size)
+        cdef size_t best = 0, block_size
+        if not free:
+            for block_size, free in self._free.items():
+                if (free and size < block_size <= size * _max_reuse_ratio
+                        and (best == 0 or block_size < best)):
+                    best = block_size
+            if best == 0:
+                return None
+            free = self._free[best]
+            self._n_best_fit_reuses += 1
+        _, mem = free.pop()
+        return mem
+
+    cdef _alloc_block(self, size_t size):
+        # need self._lock
+        if (self._total_bytes_limit != 0 and
+                self._total_bytes + size > self._total_bytes_limit):
+            self.free_all_blocks()
+            if self._total_bytes + size > self._total_bytes_limit:
+                raise OutOfMemoryError(
+                    size, self._total_bytes, self._total_bytes_limit)
+        try:
+            mem = self._alloc(size).mem
+        except runtime.CUDARuntimeError as e:
+            if e.status != runtime.errorMemoryAllocation:
+                raise
+            self.free_all_blocks()
+            mem = self._alloc(size).mem
+        self._total_bytes += mem.size
+        self._n_allocs += 1
+        return mem
+
     cpdef free(self, intptr_t ptr, size_t size):
         cdef list free
         rlock.lock_fastrlock(self._lock, -1, True)
@@ -323,8 +366,11 @@ cdef class PinnedMemoryPool:
             mem = self._in_use.pop(ptr, None)
             if mem is None:
                 raise RuntimeError('Cannot free out-of-pool memory')
-            free = self._free[size]
-            free.append(mem)
+            free = self._free.get(size)
+            if free is None:
+                free = self._free[size] = []
+            free.append((
+                time.monotonic() if self._max_idle_seconds >= 0 else 0, mem))
         finally:
             rlock.unlock_fastrlock(self._lock)
 
@@ -332,6 +378,9 @@ cdef class PinnedMemoryPool:
         """Release free all blocks."""
         rlock.lock_fastrlock(self._lock, -1, True)
         try:
+            for free in self._free.values():
+                for _, mem in free:
+                    self._total_bytes -= mem.size
             self._free.clear()
         finally:
             rlock.unlock_fastrlock(self._lock)
@@ -350,3 +399,158 @@ cdef class PinnedMemoryPool:
         finally:
             rlock.unlock_fastrlock(self._lock)
         return n
+
+    cpdef size_t used_bytes(self):
+        """Gets the total number of bytes used by the pool.
+
+        Returns:
+            int: The total number of bytes used by the pool.
+        """
+        cdef size_t size = 0
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            for mem in self._in_use.values():
+                size += mem.size
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+        return size
+
+    cpdef size_t free_bytes(self):
+        """Gets the total number of bytes acquired but not used by the pool.
+
+        Returns:
+            int: The total number of bytes acquired but not used by the pool.
+        """
+        cdef size_t size = 0
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            for free in self._free.values():
+                for _, mem in free:
+                    size += mem.size
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+        return size
+
+    cpdef size_t total_bytes(self):
+        """Gets the total number of bytes acquired by the pool.
+
+        Returns:
+            int: The total number of bytes acquired by the pool.
+        """
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            return self._total_bytes
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+
+    cpdef dict stats(self):
+        """Gets the statistics of the pool.
+
+        Returns:
+            dict: ``used_bytes``, ``free_bytes``, ``total_bytes`` and
+            ``n_free_blocks``, ``bins`` (mapping from the block size to the
+            number of free blocks), ``n_allocs`` (the number of blocks
+            allocated by the base allocator), ``n_best_fit_reuses`` (the
+            number of allocations served from larger free blocks), and
+            ``n_released_blocks`` and ``released_bytes`` by the release
+            policy.
+        """
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            return {
+                'used_bytes': self.used_bytes(),
+                'free_bytes': self.free_bytes(),
+                'total_bytes': self._total_bytes,
+                'n_free_blocks': self.n_free_blocks(),
+                'bins': {size: len(free)
+                         for size, free in sorted(self._free.items())
+                         if free},
+                'n_allocs': self._n_allocs,
+                'n_best_fit_reuses': self._n_best_fit_reuses,
+                'n_released_blocks': self._n_released_blocks,
+                'released_bytes': self._released_bytes,
+            }
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+
+    cpdef set_limit(self, size=None):
+        """Sets the upper limit of the bytes acquired by the pool.
+
+        Args:
+            size (int): Limit size in bytes. If ``None`` or ``0``, the limit
+                is disabled.
+        """
+        if size is None:
+            size = 0
+        if size < 0:
+            raise ValueError(
+                'memory limit size out of range: {}'.format(size))
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            self._total_bytes_limit = size
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+
+    cpdef size_t get_limit(self):
+        """Gets the upper limit of the bytes acquired by the pool.
+
+        Returns:
+            int: The number of bytes (``0`` if unlimited).
+        """
+        return self._total_bytes_limit
+
+    cpdef set_release_policy(self, max_idle_seconds=None):
+        """Sets the policy to release free blocks.
+
+        Free blocks kept unused for longer than ``max_idle_seconds`` are
+        released in allocations (at most once every 0.1 seconds) without a
+        background thread.
+
+        Args:
+            max_idle_seconds (float): Idle duration in seconds. If ``None``,
+                the policy is disabled.
+        """
+        if max_idle_seconds is not None and max_idle_seconds < 0:
+            raise ValueError(
+                'max_idle_seconds out of range: {}'.format(max_idle_seconds))
+        now = time.monotonic()
+        rlock.lock_fastrlock(self._lock, -1, True)
+        try:
+            self._max_idle_seconds = (
+                -1 if max_idle_seconds is None else max_idle_seconds)
+            self._next_release_check = 0
+            # The idle time of the blocks already freed is counted from now.
+            for size, free in self._free.items():
+                self._free[size] = [(now, mem) for _, mem in free]
+        finally:
+            rlock.unlock_fastrlock(self._lock)
+
+    cpdef get_release_policy(self):
+        """Gets the release policy.
+
+        Returns:
+            dict: ``max_idle_seconds`` set by :meth:`set_release_policy`.
+        """
+        return {
+            'max_idle_seconds': (
+                None if self._max_idle_seconds < 0
+                else self._max_idle_seconds),
+        }
+
+    cdef _apply_release_policy(self):
+        # need self._lock
+        cdef double now = time.monotonic()
+        cdef Py_ssize_t i
+        cdef list free
+        if now < self._next_release_check:
+            return
+        self._next_release_check = now + _release_check_interval
+        for free in self._free.values():
+            # Blocks are appended in the order of the freed time.
+            i = 0
+            while i < len(free) and now - free[i][0] >= self._max_idle_seconds:
+                self._total_bytes -= free[i][1].size
+                self._released_bytes += free[i][1].size
+                self._n_released_blocks += 1
+                i += 1
+            del free[:i]
@@ -7,6 +7,7 @@ from cupyx._scatter import scatter_min  # NOQA
 
 from cupyx import linalg  # NOQA
 from cupyx import time  # NOQA
+from cupyx import profiler  # NOQA
 from cupyx import scipy  # NOQA
 from cupyx import optimizing  # NOQA
 from cupyx import lapack  # NOQA
@@ -21,3 +22,7 @@ from cupyx._pinned_array import empty_pinned  # NOQA
 from cupyx._pinned_array import empty_like_pinned  # NOQA
 from cupyx._pinned_array import zeros_pinned  # NOQA
 from cupyx._pinned_array import zeros_like_pinned  # NOQA
+
+from cupyx._transfer import asnumpy_async  # NOQA
+from cupyx._transfer import asarray_batch  # NOQA
+from cupyx._transfer import asnumpy_batch  # NOQA
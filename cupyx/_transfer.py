@@ -0,0 +1,162 @@
+import numpy
+
+import cupy
+from cupy import cuda
+from cupy.cuda import pinned_memory
+from cupyx._pinned_array import empty_pinned
+
+
+# Alignment of each array packed into a batch buffer, which matches the
+# alignment of the allocations of the memory pool.
+_batch_alignment = 256
+
+
+def asnumpy_async(a, stream=None, order='C', out=None):
+    """Copies an array to the pinned host memory asynchronously.
+
+    Unlike :func:`cupy.asnumpy`, which returns an array on the pageable
+    memory (which makes the copy synchronous), the array is copied into
+    a NumPy array backed by the pinned memory pool, so that the copy runs
+    asynchronously with the host and can be overlapped with the following
+    computation. The returned array must not be read before the returned
+    event is done.
+
+    Args:
+        a (cupy.ndarray): The source array. Objects supporting
+            ``__cuda_array_interface__`` are also accepted.
+        stream (cupy.cuda.Stream): CUDA stream on which the copy runs. The
+            current stream is used by default.
+        order ({'C', 'F', 'A'}): The memory layout of the host array. When
+            ``order`` is 'A', it uses 'F' if ``a`` is fortran-contiguous and
+            'C' otherwise. Ignored if ``out`` is given.
+        out (numpy.ndarray): The output array to be written to. It should be
+            backed by the pinned memory (e.g., allocated with
+            :func:`cupyx.empty_pinned`) for the copy to be asynchronous.
+
+    Returns:
+        tuple: The host array and the :class:`cupy.cuda.Event` recorded on
+        the stream after the copy.
+
+    .. seealso:: :func:`cupy.asnumpy`, :meth:`cupy.ndarray.get`
+
+    """
+    if not isinstance(a, cupy.ndarray):
+        if not hasattr(a, '__cuda_array_interface__'):
+            raise TypeError(
+                'Unsupported type {}'.format(type(a)))
+        a = cupy.asarray(a)
+    if stream is None:
+        stream = cuda.get_current_stream()
+    if out is None:
+        order = order.upper()
+        if order == 'A':
+            order = 'F' if a.flags.f_contiguous else 'C'
+        if order not in ('C', 'F'):
+            raise ValueError('unsupported order: {}'.format(order))
+        out = empty_pinned(a.shape, a.dtype, order)
+    # The contiguous temporary, if required, must be made on the stream so
+    # that it is not reused before the copy finishes.
+    with stream:
+        a.get(stream=stream, out=out)
+    return out, stream.record()
+
+
+def _batch_offsets(arrays):
+    offsets = []
+    total = 0
+    for a in arrays:
+        offsets.append(total)
+        total += -(-a.nbytes // _batch_alignment) * _batch_alignment
+    return offsets, total
+
+
+def asarray_batch(arrays, stream=None):
+    """Copies many host arrays to the device at once.
+
+    The arrays are packed into one pinned staging buffer and sent to a
+    single device allocation by one host-to-device copy, instead of an
+    allocation and a copy for each array as :func:`cupy.asarray` does. It
+    is much faster when there are many small arrays.
+
+    Args:
+        arrays (sequence of array_like): The host arrays.
+        stream (cupy.cuda.Stream): CUDA stream on which the copy runs. The
+            current stream is used by default.
+
+    Returns:
+        list of cupy.ndarray: C-contiguous arrays on the current device.
+        They are views of the same allocation, which is freed when all of
+        them are deleted.
+
+    .. seealso:: :func:`cupy.asarray`, :func:`cupyx.asnumpy_batch`
+
+    """
+    arrays = [numpy.asarray(a) for a in arrays]
+    for a in arrays:
+        if a.dtype.char not in '?bhilqBHILQefdFD':
+            raise ValueError('Unsupported dtype %s' % a.dtype)
+    if stream is None:
+        stream = cuda.get_current_stream()
+    offsets, total = _batch_offsets(arrays)
+    # The destination is allocated on the stream written by the copy, so that
+    # it is not reused by another stream before the copy finishes.
+    with stream:
+        mem = cuda.alloc(total)
+    if total != 0:
+        staging = pinned_memory.alloc_pinned_memory(total)
+        for a, offset in zip(arrays, offsets):
+            numpy.copyto(numpy.frombuffer(
+                staging, a.dtype, a.size, offset).reshape(a.shape), a)
+        mem.copy_from_host_async(staging.ptr, total, stream)
+        pinned_memory._add_to_watch_list(stream.record(), staging)
+    return [cupy.ndarray(a.shape, a.dtype, memptr=mem + offset)
+            for a, offset in zip(arrays, offsets)]
+
+
+def asnumpy_batch(arrays, stream=None):
+    """Copies many device arrays to the host at once.
+
+    The arrays are packed into one device buffer and sent to a single
+    pinned host buffer by one device-to-host copy, instead of a copy and a
+    synchronization for each array as :func:`cupy.asnumpy` does.
+
+    Args:
+        arrays (sequence of cupy.ndarray): The device arrays. Objects
+            supporting ``__cuda_array_interface__`` are also accepted.
+        stream (cupy.cuda.Stream): CUDA stream on which the copy runs. The
+            current stream is used by default.
+
+    Returns:
+        list of numpy.ndarray: C-contiguous arrays, which are views of the
+        same pinned memory buffer.
+
+    .. seealso:: :func:`cupy.asnumpy`, :func:`cupyx.asarray_batch`
+
+    """
+    converted = []
+    for a in arrays:
+        if not isinstance(a, cupy.ndarray):
+            if not hasattr(a, '__cuda_array_interface__'):
+                raise TypeError(
+                    'Unsupported type {}'.format(type(a)))
+            a = cupy.asarray(a)
+        converted.append(a)
+    arrays = converted
+    if stream is None:
+        stream = cuda.get_current_stream()
+    offsets, total = _batch_offsets(arrays)
+    out = empty_pinned((total,), numpy.uint8)
+    if total != 0:
+        # The staging buffer is allocated on the stream written by the copies
+        # (see asarray_batch).
+        with stream:
+            mem = cuda.alloc(total)
+            for a, offset in zip(arrays, offsets):
+                if a.size != 0:
+                    a = cupy.ascontiguousarray(a)
+                    (mem + offset).copy_from_device_async(
+                        a.data, a.nbytes, stream)
+        mem.copy_to_host_async(out.ctypes.data, total, stream)
+        stream.synchronize()
+    return [out[offset:offset + a.nbytes].view(a.dtype).reshape(a.shape)
+            for a, offset in zip(arrays, offsets)]
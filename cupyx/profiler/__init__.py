@@ -0,0 +1,3 @@
+from cupyx.profiler._compile_stats import compile_stats  # NOQA
+from cupyx.profiler._compile_stats import CompileStats  # NOQA
+from cupyx.profiler._launch_config import get_launch_configs  # NOQA
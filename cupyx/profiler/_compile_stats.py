@@ -0,0 +1,148 @@
+import contextlib
+import json
+import threading
+
+from cupy.cuda import compiler
+
+
+class CompileStats(object):
+
+    """Statistics of kernel compilation and kernel cache lookups.
+
+    Kernels are identified by the name of the (first) kernel function in the
+    source. For each kernel, the following items are recorded:
+
+    - ``memo_hits``: The number of times the kernel is found in the
+      in-process memo of :class:`~cupy.ElementwiseKernel`,
+      :class:`~cupy.RawKernel` or ufuncs.
+    - ``disk_hits``: The number of times the kernel is loaded from the disk
+      cache.
+    - ``compiles``: The number of times the kernel is compiled.
+    - ``compile_seconds``: The total time spent in compiling the kernel.
+    - ``disk_read_seconds``: The total time spent in reading the disk cache,
+      including misses.
+    - ``source_size``: The size of the source code of the kernel.
+
+    A kernel compiled repeatedly usually indicates that its source or
+    compile options change between calls (e.g., a value embedded in the
+    source), which makes the kernel cache ineffective.
+
+    .. seealso:: :func:`cupyx.profiler.compile_stats`
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kernels = {}
+        self._preprocess_seconds = 0.0
+
+    def _record(self, event, name, source_size, seconds):
+        with self._lock:
+            if event == 'preprocess':
+                self._preprocess_seconds += seconds
+                return
+            stats = self._kernels.get(name)
+            if stats is None:
+                stats = {
+                    'memo_hits': 0,
+                    'disk_hits': 0,
+                    'compiles': 0,
+                    'compile_seconds': 0.0,
+                    'disk_read_seconds': 0.0,
+                    'source_size': 0,
+                }
+                self._kernels[name] = stats
+            if source_size:
+                stats['source_size'] = source_size
+            if event == 'memo_hit':
+                stats['memo_hits'] += 1
+            elif event == 'disk_hit':
+                stats['disk_hits'] += 1
+            elif event == 'disk_read':
+                stats['disk_read_seconds'] += seconds
+            elif event == 'compile':
+                stats['compiles'] += 1
+                stats['compile_seconds'] += seconds
+
+    @property
+    def kernels(self):
+        """dict: Statistics keyed by kernel name."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._kernels.items()}
+
+    def total(self):
+        """Returns the statistics summed over all kernels.
+
+        Returns:
+            dict: The summed statistics (except for ``source_size``) and
+            ``preprocess_seconds``, the time spent in preprocessing an empty
+            source to obtain the compiler version for the cache key.
+        """
+        ret = {
+            'memo_hits': 0,
+            'disk_hits': 0,
+            'compiles': 0,
+            'compile_seconds': 0.0,
+            'disk_read_seconds': 0.0,
+        }
+        for stats in self.kernels.values():
+            for key in ret:
+                ret[key] += stats[key]
+        with self._lock:
+            ret['preprocess_seconds'] = self._preprocess_seconds
+        return ret
+
+    def to_dict(self):
+        """Returns the statistics as a JSON-serializable dict."""
+        return {'kernels': self.kernels, 'total': self.total()}
+
+    def to_json(self, path=None, **kwargs):
+        """Exports the statistics in JSON.
+
+        Args:
+            path (str): If given, the statistics are written to the file.
+            kwargs: Keyword arguments passed to :func:`json.dumps`.
+
+        Returns:
+            str: The statistics in JSON.
+        """
+        ret = json.dumps(self.to_dict(), **kwargs)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(ret)
+        return ret
+
+    def __repr__(self):
+        total = self.total()
+        return ('<CompileStats kernels={} memo_hits={} disk_hits={} '
+                'compiles={} compile_seconds={:.3f}>'.format(
+                    len(self._kernels), total['memo_hits'],
+                    total['disk_hits'], total['compiles'],
+                    total['compile_seconds']))
+
+
+@contextlib.contextmanager
+def compile_stats(stats=None):
+    """Collects kernel compilation and kernel cache statistics.
+
+    All threads are recorded while the context is active.
+
+    Args:
+        stats (CompileStats): If given, the statistics are accumulated to
+            it instead of a new one.
+
+    Yields:
+        CompileStats: The collected statistics.
+
+    .. admonition:: Example
+
+        >>> with cupyx.profiler.compile_stats() as stats:
+        ...     cupy.arange(10).sum()
+        >>> stats.to_json('compile_stats.json')  # doctest: +SKIP
+    """
+    if stats is None:
+        stats = CompileStats()
+    compiler._compile_stats_collectors.append(stats._record)
+    try:
+        yield stats
+    finally:
+        compiler._compile_stats_collectors.remove(stats._record)
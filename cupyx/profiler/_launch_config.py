@@ -0,0 +1,33 @@
+from cupy.cuda import function
+
+
+def get_launch_configs():
+    """Returns the launch configurations chosen for kernels.
+
+    When a kernel is launched without an explicit block size (e.g., ufuncs
+    and :class:`~cupy.ElementwiseKernel` without the ``block_size``
+    option), CuPy chooses the block size at its first launch and reuses it.
+    The block size is the one maximizing the occupancy of the kernel
+    reported by ``cuOccupancyMaxPotentialBlockSize``, or a fixed size
+    (128) when the environment variable ``CUPY_LAUNCH_CONFIG`` is set to
+    ``fixed`` or on ROCm. Launches too small to make ``min_grid_size``
+    blocks of the size use smaller blocks (down to 128 threads) instead.
+
+    Returns:
+        dict: Map from the kernel function name to the list of the
+        configurations chosen for the functions of the name (one for each
+        device). Kernels of ufuncs and :class:`~cupy.ElementwiseKernel` are
+        named after the argument types (e.g.,
+        ``cupy_add__float32_float32_float32``). Each configuration is a
+        dict with ``mode`` (``'occupancy'`` or ``'fixed'``), ``block_size``
+        and ``min_grid_size`` (the minimum grid size to achieve the maximum
+        occupancy, or ``0`` if the mode is ``'fixed'``). ``block_size`` is
+        the size used for launches large enough.
+
+    .. admonition:: Example
+
+        >>> cupy.arange(10) + 1  # doctest: +SKIP
+        >>> cupyx.profiler.get_launch_configs()  # doctest: +SKIP
+        {'cupy_add__int64_int64_int64': [{'mode': 'occupancy', ...}]}
+    """
+    return function._get_launch_configs()
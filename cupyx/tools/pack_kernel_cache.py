@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+
+"""
+Kernel Cache Packer
+
+Converts the kernel cache directory into a single archive, which is used
+when ``CUPY_CACHE_PACKED=1`` is set.
+
+Usage: python -m cupyx.tools.pack_kernel_cache [--cache-dir DIR] [--remove]
+"""
+
+import argparse
+import sys
+
+from cupy.cuda import compiler
+
+
+def main(args):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Kernel cache directory (default: '
+                             'CUPY_CACHE_DIR or ~/.cupy/kernel_cache)')
+    parser.add_argument('--remove', action='store_true', default=False,
+                        help='Remove the individual cache files after '
+                             'packing')
+    params = parser.parse_args(args)
+
+    n_packed = compiler.pack_cache(params.cache_dir, remove=params.remove)
+    print('Packed {} kernel(s)'.format(n_packed))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+
+"""
+Memory Pool Simulator
+
+Replays an allocation trace recorded by
+:class:`cupy.cuda.memory_hooks.AllocationTraceHook` against a model of the
+binning and splitting of :class:`cupy.cuda.SingleDeviceMemoryPool` (or
+alternative policies) without GPU, and reports the peak reserved bytes,
+fragmentation and allocation counts.
+
+Usage: python -m cupyx.tools.pool_simulator trace.bin [--rounding pow2]
+       [--no-split] [--shared-arena] [--limit BYTES] [--device ID]
+"""
+
+import argparse
+import bisect
+import json
+import sys
+
+from cupy.cuda.memory_hooks import trace as trace_module
+
+
+_allocation_unit_size = 512
+
+
+class _Chunk(object):
+
+    __slots__ = ('size', 'stream', 'prev', 'next')
+
+    def __init__(self, size, stream):
+        self.size = size
+        self.stream = stream
+        self.prev = None
+        self.next = None
+
+
+class _Arena(object):
+
+    # Free chunks binned by ``(size - 1) // 512``. Each bin is a dict used as
+    # an ordered set so that the replay is deterministic.
+
+    def __init__(self):
+        self.index = []
+        self.free = {}
+
+    def append(self, chunk):
+        bin_index = (chunk.size - 1) // _allocation_unit_size
+        free_list = self.free.get(bin_index)
+        if free_list is None:
+            bisect.insort(self.index, bin_index)
+            free_list = self.free[bin_index] = {}
+        free_list[chunk] = None
+
+    def remove(self, chunk):
+        bin_index = (chunk.size - 1) // _allocation_unit_size
+        free_list = self.free.get(bin_index)
+        if free_list is None or chunk not in free_list:
+            return False
+        del free_list[chunk]
+        if not free_list:
+            self._remove_bin(bin_index)
+        return True
+
+    def pop(self, size):
+        # Returns the most recently freed chunk of the smallest bin that fits.
+        i = bisect.bisect_left(
+            self.index, (size - 1) // _allocation_unit_size)
+        if i == len(self.index):
+            return None
+        bin_index = self.index[i]
+        free_list = self.free[bin_index]
+        chunk, _ = free_list.popitem()
+        if not free_list:
+            self._remove_bin(bin_index)
+        return chunk
+
+    def _remove_bin(self, bin_index):
+        del self.free[bin_index]
+        del self.index[bisect.bisect_left(self.index, bin_index)]
+
+    def chunks(self):
+        for free_list in self.free.values():
+            yield from free_list
+
+
+class PoolSimulator(object):
+
+    """Model of the memory pool replaying allocations.
+
+    Args:
+        rounding (str): ``'unit'`` rounds the allocation sizes up to a
+            multiple of 512 bytes as the memory pool does. ``'pow2'`` rounds
+            them up to a power of two.
+        split (bool): If ``False``, free chunks larger than the request are
+            used as is instead of being split.
+        per_stream (bool): If ``False``, all streams share one arena.
+        limit (int): Upper limit of the reserved bytes (0 for unlimited).
+            When an allocation would exceed it, non-split free chunks are
+            released and the allocation is retried, as the memory pool does.
+    """
+
+    def __init__(self, rounding='unit', split=True, per_stream=True,
+                 limit=0):
+        if rounding not in ('unit', 'pow2'):
+            raise ValueError('Unknown rounding: {}'.format(rounding))
+        self.rounding = rounding
+        self.split = split
+        self.per_stream = per_stream
+        self.limit = limit
+        self._arenas = {}
+        self._in_use = {}
+        self.used_bytes = 0
+        self.reserved_bytes = 0
+        self.peak_used_bytes = 0
+        self.peak_reserved_bytes = 0
+        self.waste_at_peak = 0.0
+        self.n_mallocs = 0
+        self.n_frees = 0
+        self.n_unmatched_frees = 0
+        self.n_device_allocs = 0
+        self.n_device_frees = 0
+        self.n_splits = 0
+        self.n_merges = 0
+        self.n_oom = 0
+
+    def _round_size(self, size):
+        unit = _allocation_unit_size
+        size = (size + unit - 1) // unit * unit
+        if self.rounding == 'pow2':
+            size = 1 << max(size - 1, 0).bit_length()
+        return size
+
+    def _arena(self, stream):
+        arena = self._arenas.get(stream)
+        if arena is None:
+            arena = self._arenas[stream] = _Arena()
+        return arena
+
+    def _release_free_chunks(self):
+        for arena in self._arenas.values():
+            for chunk in list(arena.chunks()):
+                if chunk.prev is None and chunk.next is None:
+                    arena.remove(chunk)
+                    self.reserved_bytes -= chunk.size
+                    self.n_device_frees += 1
+
+    def malloc(self, ptr, size, stream=0):
+        """Allocates ``size`` bytes identified by ``ptr`` on the stream."""
+        if size == 0:
+            return
+        size = self._round_size(size)
+        if not self.per_stream:
+            stream = 0
+        self.n_mallocs += 1
+        arena = self._arena(stream)
+        chunk = arena.pop(size)
+        if chunk is not None:
+            if self.split and chunk.size > size:
+                remaining = _Chunk(chunk.size - size, stream)
+                chunk.size = size
+                remaining.next = chunk.next
+                if remaining.next is not None:
+                    remaining.next.prev = remaining
+                chunk.next = remaining
+                remaining.prev = chunk
+                arena.append(remaining)
+                self.n_splits += 1
+        else:
+            if self.limit and self.reserved_bytes + size > self.limit:
+                self._release_free_chunks()
+                if self.reserved_bytes + size > self.limit:
+                    self.n_oom += 1
+                    return
+            chunk = _Chunk(size, stream)
+            self.reserved_bytes += size
+            self.n_device_allocs += 1
+        self._in_use[ptr] = chunk
+        self.used_bytes += chunk.size
+        self.peak_used_bytes = max(self.peak_used_bytes, self.used_bytes)
+        if self.reserved_bytes > self.peak_reserved_bytes:
+            self.peak_reserved_bytes = self.reserved_bytes
+            self.waste_at_peak = 1.0 - self.used_bytes / self.reserved_bytes
+
+    def free(self, ptr):
+        """Frees the memory allocated with ``ptr``."""
+        chunk = self._in_use.pop(ptr, None)
+        if chunk is None:
+            self.n_unmatched_frees += 1
+            return
+        self.n_frees += 1
+        self.used_bytes -= chunk.size
+        arena = self._arena(chunk.stream)
+        c = chunk.next
+        if c is not None and arena.remove(c):
+            chunk.size += c.size
+            chunk.next = c.next
+            if c.next is not None:
+                c.next.prev = chunk
+            self.n_merges += 1
+        c = chunk.prev
+        if c is not None and arena.remove(c):
+            c.size += chunk.size
+            c.next = chunk.next
+            if chunk.next is not None:
+                chunk.next.prev = c
+            chunk = c
+            self.n_merges += 1
+        arena.append(chunk)
+
+    def fragmentation(self):
+        """Returns ``1 - largest free chunk / free bytes`` of the pool."""
+        sizes = [chunk.size for arena in self._arenas.values()
+                 for chunk in arena.chunks()]
+        if not sizes:
+            return 0.0
+        return 1.0 - max(sizes) / sum(sizes)
+
+    def replay(self, records, device_id=None):
+        """Replays trace records.
+
+        Args:
+            records (numpy.ndarray): Records returned by
+                :func:`cupy.cuda.memory_hooks.trace.read_trace`.
+            device_id (int): If given, only the records of the device are
+                replayed.
+        """
+        if device_id is not None:
+            records = records[records['device_id'] == device_id]
+        malloc = trace_module.MALLOC
+        free = trace_module.FREE
+        for event, size, ptr, stream in zip(
+                records['event'].tolist(), records['size'].tolist(),
+                records['ptr'].tolist(), records['stream'].tolist()):
+            if event == malloc:
+                self.malloc(ptr, size, stream)
+            elif event == free:
+                self.free(ptr)
+
+    def report(self):
+        """Returns the statistics of the replay as a dict."""
+        return {
+            'peak_reserved_bytes': self.peak_reserved_bytes,
+            'peak_used_bytes': self.peak_used_bytes,
+            'reserved_bytes': self.reserved_bytes,
+            'used_bytes': self.used_bytes,
+            'waste_at_peak': self.waste_at_peak,
+            'fragmentation': self.fragmentation(),
+            'n_mallocs': self.n_mallocs,
+            'n_frees': self.n_frees,
+            'n_unmatched_frees': self.n_unmatched_frees,
+            'n_device_allocs': self.n_device_allocs,
+            'n_device_frees': self.n_device_frees,
+            'n_splits': self.n_splits,
+            'n_merges': self.n_merges,
+            'n_oom': self.n_oom,
+        }
+
+
+def simulate(trace, device_id=0, **policy):
+    """Replays a trace and returns the report.
+
+    Args:
+        trace (str, file object or numpy.ndarray): Trace file or records.
+        device_id (int): Device whose records are replayed.
+        policy: Keyword arguments of :class:`PoolSimulator`.
+
+    Returns:
+        dict: The report of :meth:`PoolSimulator.report`.
+    """
+    if not hasattr(trace, 'dtype'):
+        trace = trace_module.read_trace(trace)
+    simulator = PoolSimulator(**policy)
+    simulator.replay(trace, device_id)
+    return simulator.report()
+
+
+def main(args):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('trace', type=str,
+                        help='Trace file written by AllocationTraceHook')
+    parser.add_argument('--device', type=int, default=0,
+                        help='Device ID to replay (default: 0)')
+    parser.add_argument('--rounding', choices=('unit', 'pow2'),
+                        default='unit', help='Rounding of allocation sizes')
+    parser.add_argument('--no-split', action='store_true', default=False,
+                        help='Do not split free chunks')
+    parser.add_argument('--shared-arena', action='store_true',
+                        default=False,
+                        help='Share free chunks among streams')
+    parser.add_argument('--limit', type=int, default=0,
+                        help='Limit of the reserved bytes (default: '
+                             'unlimited)')
+    params = parser.parse_args(args)
+
+    report = simulate(
+        params.trace, params.device, rounding=params.rounding,
+        split=not params.no_split, per_stream=not params.shared_arena,
+        limit=params.limit)
+    print(json.dumps(report, indent=1))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
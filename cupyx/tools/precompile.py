@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+
+"""
+Kernel Precompiler
+
+Rebuilds the kernel cache from manifests recorded by setting the
+``CUPY_CACHE_RECORD_MANIFEST`` environment variable (or by using
+:func:`record`), so that the kernel cache can be warmed up in advance
+(e.g., when building a container image).
+
+Usage: python -m cupyx.tools.precompile manifest.json [manifest.json ...]
+"""
+
+import argparse
+import atexit
+import concurrent.futures
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+
+
+_manifest_version = 1
+
+
+class KernelManifest(object):
+
+    """A deduplicated set of kernel compilation requests.
+
+    Each entry holds the arguments of ``compile_with_cache`` that determine
+    the cached binary (source, options, architecture, backend, etc.). A
+    manifest is stored as a plain JSON file, so it can be parsed and merged
+    without a GPU.
+    """
+
+    def __init__(self, entries=()):
+        self._entries = {}
+        self._lock = threading.Lock()
+        for entry in entries:
+            self.add(**entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter([self._entries[key] for key in sorted(self._entries)])
+
+    def add(self, source, options=(), arch=None, extra_source=None,
+            backend='nvrtc', enable_cooperative_groups=False, jitify=False):
+        """Adds a compilation request.
+
+        Returns:
+            bool: ``True`` if the request was not in the manifest.
+        """
+        entry = {
+            'source': source,
+            'options': list(options),
+            'arch': None if arch is None else str(arch),
+            'extra_source': extra_source,
+            'backend': backend,
+            'enable_cooperative_groups': bool(enable_cooperative_groups),
+            'jitify': bool(jitify),
+        }
+        key = hashlib.sha1(
+            json.dumps(entry, sort_keys=True).encode('utf-8')).hexdigest()
+        with self._lock:
+            if key in self._entries:
+                return False
+            self._entries[key] = entry
+        return True
+
+    def merge(self, other):
+        """Adds all requests in another manifest.
+
+        Returns:
+            int: The number of requests newly added.
+        """
+        return sum([self.add(**entry) for entry in other])
+
+    @classmethod
+    def load(cls, path):
+        """Loads a manifest from a JSON file."""
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != _manifest_version:
+            raise ValueError(
+                'Unsupported manifest version: {}'.format(data.get('version')))
+        return cls(data['kernels'])
+
+    def save(self, path):
+        """Saves the manifest to a JSON file atomically."""
+        data = {'version': _manifest_version, 'kernels': list(self)}
+        dirname = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+                'w', dir=dirname, delete=False) as f:
+            json.dump(data, f, indent=1)
+            temp_path = f.name
+        os.replace(temp_path, path)
+
+
+def _save_merged(manifest, path):
+    # Merges with the manifest recorded by other runs, if any.
+    if os.path.exists(path):
+        manifest.merge(KernelManifest.load(path))
+    manifest.save(path)
+
+
+@contextlib.contextmanager
+def record(path=None):
+    """Records the kernels compiled in the context.
+
+    Args:
+        path (str): If given, the recorded kernels are merged into the
+            manifest file on exiting the context.
+
+    Yields:
+        KernelManifest: The manifest being recorded.
+    """
+    from cupy.cuda import compiler
+
+    manifest = KernelManifest()
+    compiler._compile_recorders.append(manifest.add)
+    try:
+        yield manifest
+    finally:
+        compiler._compile_recorders.remove(manifest.add)
+        if path is not None:
+            _save_merged(manifest, path)
+
+
+def _record_to_file(path):
+    # Records all kernels compiled in this process into the manifest file
+    # at exit (CUPY_CACHE_RECORD_MANIFEST).
+    from cupy.cuda import compiler
+
+    manifest = KernelManifest()
+    compiler._compile_recorders.append(manifest.add)
+    atexit.register(_save_merged, manifest, path)
+
+
+def _compile_entry(entry, cache_dir):
+    from cupy.cuda import compiler
+
+    try:
+        compiler._compile_to_cache(
+            entry['source'], tuple(entry['options']), entry['arch'],
+            cache_dir, entry['extra_source'], entry['backend'],
+            entry['enable_cooperative_groups'], entry['jitify'])
+    except Exception as e:
+        return '{}: {}'.format(type(e).__name__, e)
+    return None
+
+
+def precompile(manifest, cache_dir=None, n_workers=None):
+    """Compiles all kernels in the manifest into the kernel cache.
+
+    Args:
+        manifest (KernelManifest): The kernels to compile.
+        cache_dir (str): The cache directory. If ``None``, the default cache
+            directory is used.
+        n_workers (int): The number of worker processes. If ``None``, the
+            number of CPUs is used.
+
+    Returns:
+        list: Error messages of the kernels failed to compile.
+    """
+    entries = list(manifest)
+    if not entries:
+        return []
+    # Use spawn to keep the CUDA state of the parent process (if any) away
+    # from the workers.
+    ctx = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=ctx) as executor:
+        results = executor.map(
+            _compile_entry, entries, [cache_dir] * len(entries))
+        return [r for r in results if r is not None]
+
+
+def main(args):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('manifests', type=str, nargs='+',
+                        help='Manifest files to compile')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Kernel cache directory (default: '
+                             'CUPY_CACHE_DIR or ~/.cupy/kernel_cache)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of worker processes')
+    parser.add_argument('--merge', type=str, default=None,
+                        help='Write the merged manifest to the file '
+                             'instead of compiling')
+    params = parser.parse_args(args)
+
+    manifest = KernelManifest()
+    for path in params.manifests:
+        manifest.merge(KernelManifest.load(path))
+
+    if params.merge is not None:
+        manifest.save(params.merge)
+        print('Merged {} kernel(s) into {}'.format(
+            len(manifest), params.merge))
+        return
+
+    errors = precompile(manifest, params.cache_dir, params.jobs)
+    for error in errors:
+        print(error, file=sys.stderr)
+    print('Compiled {} kernel(s), {} failed'.format(
+        len(manifest) - len(errors), len(errors)))
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
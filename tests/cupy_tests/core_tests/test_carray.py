@@ -2,6 +2,9 @@ import unittest
 
 import cupy
 from cupy import testing
+from cupy._core import _carray
+from cupy._core import _kernel
+from cupy._core import _reduction
 
 
 class TestCArray(unittest.TestCase):
@@ -47,6 +50,49 @@ class TestCArray(unittest.TestCase):
         testing.assert_array_equal(y, x)
 
 
+@testing.parameterize(
+    {'shape': (), 'index_32_bits': True},
+    {'shape': (10, 20), 'index_32_bits': True},
+    {'shape': (2 ** 16, 2 ** 15), 'index_32_bits': True},
+    {'shape': (2 ** 16, 2 ** 15 + 1), 'index_32_bits': False},
+    {'shape': (2 ** 20, 2 ** 20, 2), 'index_32_bits': False},
+)
+class TestCIndexer32Bits(unittest.TestCase):
+    # The generated code is checked without launching the kernels.
+
+    def test_indexer(self):
+        indexer = _carray._indexer_init(self.shape)
+        assert indexer.index_32_bits == self.index_32_bits
+
+    def test_arginfo(self):
+        arginfo, = _kernel._get_arginfos([_carray._indexer_init(self.shape)])
+        assert arginfo.index_32_bits == self.index_32_bits
+        # The bitness is a part of the kernel cache keys.
+        small = _carray._indexer_init((1,) * len(self.shape))
+        other, = _kernel._get_arginfos([small])
+        assert (arginfo == other) == self.index_32_bits
+
+    def test_elementwise_code(self):
+        params = _kernel._get_param_info('CIndexer _ind', False)
+        arginfos = _kernel._get_arginfos([_carray._indexer_init(self.shape)])
+        code = _kernel._get_simple_elementwise_kernel_code(
+            params, arginfos, '', 'test_kernel', _kernel._TypeMap(()), '')
+        assert 'CIndexer<{}, {}> _ind'.format(
+            len(self.shape), int(self.index_32_bits)) in code
+
+    def test_reduction_code(self):
+        params = _kernel._get_param_info(
+            'CIndexer _in_ind, CIndexer _out_ind', False)
+        arginfos = _kernel._get_arginfos([
+            _carray._indexer_init(self.shape), _carray._indexer_init(())])
+        code = _reduction._get_reduction_kernel_code(
+            'test_reduction', 128, 'float', params, arginfos, '0', 'a',
+            'a + b', 'a', _kernel._TypeMap(()), '', '', '')
+        assert 'CIndexer<{}, {}> _in_ind'.format(
+            len(self.shape), int(self.index_32_bits)) in code
+        assert 'CIndexer<0, 1> _out_ind' in code
+
+
 @testing.parameterize(
     {'size': 2 ** 31 - 1024},
     {'size': 2 ** 31},
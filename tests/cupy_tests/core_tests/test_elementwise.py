@@ -1,6 +1,7 @@
 import unittest
 
 import numpy
+import pytest
 
 import cupy
 from cupy import _core
@@ -136,3 +137,171 @@ class TestElementwiseType(unittest.TestCase):
         a = xp.array([xp.iinfo(dtype).min + 1], dtype=dtype)
         b = xp.int8(-1)
         return a + b
+
+
+@testing.gpu
+class TestUfuncDispatchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.ufunc = _core.create_ufunc(
+            'test_dispatch_cache', ('bb->b', 'ii->i', 'ff->f', 'dd->d'),
+            'out0 = in0 + in1')
+
+    def test_dispatch_cache(self):
+        ufunc = self.ufunc
+        a = testing.shaped_arange((2, 3), cupy, numpy.float32)
+        testing.assert_array_equal(ufunc(a, a), a * 2)
+        assert len(ufunc._dispatch_cache) == 1
+        entry, = ufunc._dispatch_cache.values()
+        # Repeated calls with the same signature use the cached entry.
+        b = testing.shaped_arange((4, 5, 6), cupy, numpy.float32)
+        testing.assert_array_equal(ufunc(b, b), b * 2)
+        testing.assert_array_equal(ufunc(b[0], b[1]), b[0] + b[1])
+        assert list(ufunc._dispatch_cache.values()) == [entry]
+        assert len(ufunc._kernel_memo) == 1
+        # 0-dim arrays are dispatched separately.
+        testing.assert_array_equal(ufunc(a[0, 0], a[0, 1]), a[0, 0] + 1)
+        assert len(ufunc._dispatch_cache) == 2
+
+    def test_dispatch_cache_dtypes(self):
+        ufunc = self.ufunc
+        a = testing.shaped_arange((2, 3), cupy, numpy.int32)
+        b = testing.shaped_arange((2, 3), cupy, numpy.float32)
+        for _ in range(2):
+            c = ufunc(a, b)
+            assert c.dtype == numpy.float64
+            testing.assert_array_equal(c, a + b)
+            c = ufunc(a, a)
+            assert c.dtype == numpy.int32
+        assert len(ufunc._dispatch_cache) == 2
+
+    def test_dispatch_cache_scalar(self):
+        ufunc = self.ufunc
+        a = testing.shaped_arange((2, 3), cupy, numpy.int8)
+        for _ in range(2):
+            # The routine depends on the value of the scalar.
+            c = ufunc(a, 1)
+            assert c.dtype == numpy.int8
+            testing.assert_array_equal(c, a + 1)
+            c = ufunc(a, 1000)
+            assert c.dtype == numpy.int32
+            testing.assert_array_equal(c, a.astype(numpy.int32) + 1000)
+        assert len(ufunc._dispatch_cache) == 2
+
+    def test_dispatch_cache_casting(self):
+        ufunc = self.ufunc
+        a = testing.shaped_arange((2, 3), cupy, numpy.int32)
+        b = testing.shaped_arange((2, 3), cupy, numpy.float32)
+        testing.assert_array_equal(ufunc(a, b), a + b)
+        assert len(ufunc._dispatch_cache) == 1
+        # The cached entry does not bypass the check of the casting rule.
+        with pytest.raises(TypeError):
+            ufunc(a, b, casting='no')
+        testing.assert_array_equal(ufunc(a, b, casting='unsafe'), a + b)
+        assert len(ufunc._dispatch_cache) == 1
+
+    def test_not_dispatched(self):
+        ufunc = self.ufunc
+        a = testing.shaped_arange((2, 3), cupy, numpy.float32)
+        # Non-contiguous arrays, broadcasting, output and dtype arguments
+        testing.assert_array_equal(ufunc(a.T, a.T), a.T * 2)
+        testing.assert_array_equal(ufunc(a, a[0]), a + a[0])
+        out = cupy.empty_like(a)
+        ufunc(a, a, out=out)
+        testing.assert_array_equal(out, a * 2)
+        testing.assert_array_equal(ufunc(a, a, dtype=numpy.float64), a * 2)
+        assert len(ufunc._dispatch_cache) == 0
+
+    def test_empty(self):
+        ufunc = self.ufunc
+        a = cupy.empty((0, 3), numpy.float32)
+        assert ufunc(a, a).shape == (0, 3)
+        assert len(ufunc._dispatch_cache) == 0
+        b = testing.shaped_arange((2, 3), cupy, numpy.float32)
+        ufunc(b, b)
+        assert ufunc(a, a).shape == (0, 3)
+
+
+@testing.gpu
+class TestUfuncVectorized(unittest.TestCase):
+
+    size = 2 ** 16 + 3
+
+    def setUp(self):
+        self.ufunc = _core.create_ufunc(
+            'test_vectorized', ('bb->b', 'ee->e', 'ff->f', 'dd->d'),
+            'out0 = in0 + in1')
+
+    def _get_vec_sizes(self):
+        return sorted(key[3] for key in self.ufunc._kernel_memo)
+
+    def check_vectorized(self, dtype, vec_size):
+        a = testing.shaped_random((self.size,), cupy, dtype, seed=0)
+        b = testing.shaped_random((self.size,), cupy, dtype, seed=1)
+        testing.assert_array_equal(self.ufunc(a, b), a + b)
+        assert self._get_vec_sizes() == [vec_size]
+
+    def test_int8(self):
+        self.check_vectorized(numpy.int8, 16)
+
+    def test_float16(self):
+        self.check_vectorized(numpy.float16, 8)
+
+    def test_float32(self):
+        self.check_vectorized(numpy.float32, 4)
+
+    def test_float64(self):
+        self.check_vectorized(numpy.float64, 1)
+
+    def test_out(self):
+        a = testing.shaped_random((3, self.size), cupy, numpy.float32)
+        out = cupy.zeros_like(a)
+        self.ufunc(a, a, out=out)
+        testing.assert_array_equal(out, a * 2)
+        self.ufunc(out, a, out=out)
+        testing.assert_array_equal(out, a * 3)
+        assert self._get_vec_sizes() == [4]
+
+    def test_not_vectorized(self):
+        a = testing.shaped_random((self.size + 1,), cupy, numpy.float32)
+        # Misaligned, non-contiguous, broadcast and small arrays
+        testing.assert_array_equal(self.ufunc(a[1:], a[:-1]), a[1:] + a[:-1])
+        testing.assert_array_equal(self.ufunc(a[::2], a[::2]), a[::2] * 2)
+        testing.assert_array_equal(self.ufunc(a, a[0]), a + a[0])
+        testing.assert_array_equal(self.ufunc(a[:10], a[:10]), a[:10] * 2)
+        assert self._get_vec_sizes() == [1]
+
+
+@testing.gpu
+class TestUfuncCompileAll(unittest.TestCase):
+
+    def test_compile_all(self):
+        ufunc = _core.create_ufunc(
+            'test_compile_all', ('ii->i', 'll->l', 'ff->f', 'dd->d'),
+            'out0 = in0 + in1')
+        assert len(ufunc._kernel_memo) == 0
+        ufunc.compile_all()
+        # The vectorized kernels of 4-byte types are also compiled.
+        assert len(ufunc._kernel_memo) == 6
+        assert sorted([key[-1] for key in ufunc._kernel_memo]) == [
+            1, 1, 1, 1, 4, 4]
+        kernels = list(ufunc._kernel_memo.values())
+        # The scalar and vectorized kernels are in a program each.
+        assert len(set(k.module for k in kernels)) == 2
+
+        # The compiled kernels are used for C-contiguous arrays
+        a = testing.shaped_arange((2, 3), cupy, numpy.float32)
+        testing.assert_array_equal(ufunc(a, a), a * 2)
+        assert len(ufunc._kernel_memo) == 6
+
+        # The vectorized kernels are used for large arrays
+        a = testing.shaped_arange((1 << 17,), cupy, numpy.int32)
+        testing.assert_array_equal(ufunc(a, a), a * 2)
+        assert len(ufunc._kernel_memo) == 6
+
+    def test_compile_all_loop_prep(self):
+        ufunc = _core.create_ufunc(
+            'test_compile_all_loop_prep', ('ii->i', 'ff->f'),
+            'out0 = in0 + in1', loop_prep='int unused = 0;')
+        ufunc.compile_all()
+        assert sorted([key[-1] for key in ufunc._kernel_memo]) == [1, 1]
@@ -6,6 +6,7 @@ import numpy
 import cupy
 from cupy._core import core
 from cupy.cuda import compiler
+from cupy.cuda import function
 from cupy.cuda import runtime
 from cupy import testing
 
@@ -216,3 +217,28 @@ extern "C" __global__ void test_kernel(const double* a,
 
         expected = a_cpu + 55.0
         testing.assert_array_equal(x, expected)
+
+
+class TestGetLinearBlockSize(unittest.TestCase):
+
+    def test_large(self):
+        # Enough threads to launch min_grid_size blocks.
+        assert function._get_linear_block_size(1 << 24, 1024, 160) == 1024
+        assert function._get_linear_block_size(1024 * 160, 1024, 160) == 1024
+
+    def test_medium(self):
+        # The block size is lowered to launch min_grid_size blocks.
+        block_size = function._get_linear_block_size(100000, 1024, 160)
+        assert block_size == 640
+        assert -(-100000 // block_size) >= 157
+
+    def test_small(self):
+        assert function._get_linear_block_size(1000, 1024, 160) == 128
+        assert function._get_linear_block_size(1, 1024, 160) == 128
+
+    def test_small_occupancy_block_size(self):
+        # The block size is never raised above the one maximizing occupancy.
+        assert function._get_linear_block_size(1000, 64, 320) == 64
+
+    def test_fixed(self):
+        assert function._get_linear_block_size(1000, 128, 0) == 128
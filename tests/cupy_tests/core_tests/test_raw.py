@@ -1142,6 +1142,27 @@ assert ker.enable_cooperative_groups
 '''
 
 
+@testing.gpu
+class TestRawCompileAsync(unittest.TestCase):
+
+    def test_compile_async(self):
+        kern = cupy.RawKernel(_test_source1, 'test_sum')
+        future = kern.compile_async()
+        assert future.result() is kern.kernel
+        assert kern.compile_async().result() is kern.kernel
+
+    def test_compile_async_dedup(self):
+        kern = cupy.RawKernel(_test_source1, 'test_sum')
+        futures = [kern.compile_async() for _ in range(4)]
+        kernels = [f.result() for f in futures]
+        assert all(k is kernels[0] for k in kernels)
+
+    def test_compile_async_error(self):
+        kern = cupy.RawKernel('invalid source', 'test_sum')
+        with pytest.raises(compiler.CompileException):
+            kern.compile_async().result()
+
+
 # Pickling/unpickling a RawModule should always success, whereas
 # pickling/unpickling a RawKernel would fail if we don't enforce
 # recompiling after unpickling it.
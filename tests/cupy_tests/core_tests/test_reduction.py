@@ -157,6 +157,33 @@ class TestReductionKernelNonContiguous(
         self.check_int8_sum(self.shape, trans=self.trans, axis=self.axis)
 
 
+@testing.gpu
+class TestReductionKernelCompileAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.kernel = cupy.ReductionKernel(
+            'T x', 'T out', 'x', 'a + b', 'out = a', '0',
+            'test_compile_async_sum')
+
+    def test_compile_async(self):
+        x = testing.shaped_arange((4, 5), cupy, cupy.float32)
+        future = self.kernel.compile_async(x, axis=1)
+        assert future.result() is None
+        testing.assert_array_equal(self.kernel(x, axis=1), x.sum(axis=1))
+
+    def test_compile_async_invalid(self):
+        x = testing.shaped_arange((4, 5), cupy, cupy.float32)
+        with pytest.raises(TypeError):
+            self.kernel.compile_async(x, invalid=1).result()
+
+    def test_warmup(self):
+        futures = self.kernel.warmup(
+            [cupy.float32, cupy.int64], shapes=[(4, 5)], axis=0)
+        assert len(futures) == 2
+        for future in futures:
+            future.result()
+
+
 @testing.gpu
 class TestReductionKernelInvalidArgument(unittest.TestCase):
 
@@ -243,6 +243,135 @@ class TestUserkernelManualBlockSize(unittest.TestCase):
         testing.assert_array_equal(y, x + 1)
 
 
+@testing.gpu
+class TestElementwiseKernelDispatchCache(unittest.TestCase):
+
+    def test_dispatch_cache(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x, T y', 'T z', 'z = x + y', 'test_dispatch_cache')
+        x = testing.shaped_arange((2, 3), cupy, cupy.float32)
+        for _ in range(2):
+            testing.assert_array_equal(kernel(x, x), x * 2)
+            testing.assert_array_equal(kernel(x, 1), x + 1)
+        y = testing.shaped_arange((4, 5), cupy, cupy.float32)
+        testing.assert_array_equal(kernel(y, y), y * 2)
+        assert len(kernel._dispatch_cache) == 2
+        assert len(kernel._elementwise_kernel_memo) == 2
+        # Non-contiguous arrays and outputs are not dispatched.
+        testing.assert_array_equal(kernel(y.T, y.T), y.T * 2)
+        z = cupy.empty_like(x)
+        kernel(x, x, z)
+        testing.assert_array_equal(z, x * 2)
+        assert len(kernel._dispatch_cache) == 2
+
+    def test_dispatch_cache_block_size(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x', 'T y', 'y = x * 2', 'test_dispatch_cache_block_size')
+        x = testing.shaped_arange((1000,), cupy, cupy.int32)
+        kernel(x)
+        testing.assert_array_equal(kernel(x, block_size=32), x * 2)
+
+    def test_raw_not_dispatched(self):
+        kernel = cupy.ElementwiseKernel(
+            'raw T x', 'T y', 'y = x[i]', 'test_raw_not_dispatched')
+        x = testing.shaped_arange((10,), cupy, cupy.float32)
+        y = cupy.empty_like(x)
+        kernel(x, y)
+        testing.assert_array_equal(y, x)
+        assert not kernel._dispatchable
+
+
+@testing.gpu
+class TestElementwiseKernelVectorized(unittest.TestCase):
+
+    size = 2 ** 16 + 3
+
+    def _get_vec_sizes(self, kernel):
+        return sorted(key[3] for key in kernel._elementwise_kernel_memo)
+
+    def test_vectorized(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x, U y', 'T z', 'z = x * y + i', 'test_vectorized')
+        x = testing.shaped_random((self.size,), cupy, cupy.float32, seed=0)
+        y = testing.shaped_random((self.size,), cupy, cupy.int8, seed=1)
+        z = kernel(x, y)
+        expected = x * y + cupy.arange(self.size, dtype=cupy.float32)
+        testing.assert_allclose(z, expected)
+        # The vectors of 4 elements are loaded for both inputs.
+        assert self._get_vec_sizes(kernel) == [4]
+
+    def test_inout(self):
+        # Outputs read by the operation are accessed element by element.
+        kernel = cupy.ElementwiseKernel(
+            'T x', 'T y', 'y += x', 'test_vectorized_inout')
+        x = testing.shaped_random((3, self.size), cupy, cupy.float32)
+        y = cupy.ones_like(x)
+        kernel(x, y)
+        testing.assert_array_equal(y, x + 1)
+        assert self._get_vec_sizes(kernel) == [4]
+
+    def test_not_vectorized(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x', 'T y', 'y = x', 'test_not_vectorized',
+            loop_prep='int _unused = 0')
+        assert not kernel._vectorizable
+        x = testing.shaped_random((self.size,), cupy, cupy.float32)
+        testing.assert_array_equal(kernel(x), x)
+        kernel = cupy.ElementwiseKernel(
+            'T x', 'T y', 'y = x', 'test_not_vectorized_misaligned')
+        testing.assert_array_equal(kernel(x[1:]), x[1:])
+        assert self._get_vec_sizes(kernel) == [1]
+
+
+class TestElementwiseKernelCompileAsync(unittest.TestCase):
+
+    def test_compile_async(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x, T y', 'T z', 'z = x + y', 'test_compile_async')
+        x = testing.shaped_arange((2, 3), cupy, cupy.float32)
+        future = kernel.compile_async(x, 1)
+        assert isinstance(future.result(), cupy.cuda.Function)
+        # The compiled kernel is reused
+        assert kernel.compile_async(x, 1).result() is future.result()
+        testing.assert_array_equal(kernel(x, 1), x + 1)
+
+    def test_compile_async_empty(self):
+        kernel = cupy.ElementwiseKernel('T x', 'T z', 'z = x')
+        x = cupy.empty((0,), cupy.float32)
+        assert kernel.compile_async(x).result() is None
+
+    def test_compile_async_invalid(self):
+        kernel = cupy.ElementwiseKernel('T x', 'T z', 'z = x')
+        with pytest.raises(TypeError):
+            kernel.compile_async()
+
+    def test_warmup(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x, T y', 'T z', 'z = x + y', 'test_warmup')
+        futures = kernel.warmup(
+            [cupy.float32, (cupy.int32, cupy.int32)], shapes=[(3,), (2, 3)])
+        assert len(futures) == 4
+        kernels = [f.result() for f in futures]
+        assert all(isinstance(k, cupy.cuda.Function) for k in kernels)
+        # C-contiguous arrays are reduced to 1-dim
+        assert kernels[0] is kernels[1]
+
+    def test_warmup_bundle(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x, T y', 'T z', 'z = x + y', 'test_warmup_bundle')
+        futures = kernel.warmup(
+            [cupy.float32, cupy.int32, cupy.float64], shapes=[(3,), (2, 3)],
+            bundle=True)
+        assert len(futures) == 1
+        kernels = futures[0].result()
+        assert len(kernels) == 3
+        assert len(set(k.module for k in kernels)) == 1
+        x = testing.shaped_arange((2, 3), cupy, cupy.int32)
+        testing.assert_array_equal(kernel(x, x), x * 2)
+        # All the specializations are already compiled
+        assert kernel.warmup([cupy.int32], bundle=True) == []
+
+
 @testing.parameterize(*testing.product({
     'dimensions': ((64, 0, 0), (64, 32, 0), (64, 32, 19)),
 }))
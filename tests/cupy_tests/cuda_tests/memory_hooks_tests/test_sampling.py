@@ -0,0 +1,91 @@
+import io
+import unittest
+
+from cupy.cuda import memory
+from cupy.cuda import memory_hooks
+from cupy import testing
+
+
+@testing.gpu
+class TestSamplingProfileHook(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = memory.MemoryPool()
+
+    def test_sample_every(self):
+        hook = memory_hooks.SamplingProfileHook(sample_every=2)
+        with hook:
+            ps = [self.pool.malloc(1000) for _ in range(4)]
+            del ps[:2]
+        samples = hook.get_samples()
+        assert len(samples) == 1
+        sample, = samples
+        assert sample['samples'] == 2
+        assert sample['alloc_count'] == 4
+        assert sample['alloc_bytes'] == 4 * 1024
+        assert sample['inuse_bytes'] == 2 * 1024
+        assert sample['stack'][-1].endswith(':<listcomp>') or (
+            sample['stack'][-1].endswith(':test_sample_every'))
+        del ps
+
+    def test_sample_bytes(self):
+        hook = memory_hooks.SamplingProfileHook(sample_bytes=1, seed=0)
+        with hook:
+            p = self.pool.malloc(1024 * 1024)
+            del p
+        sample, = hook.get_samples()
+        # Large allocations are always sampled with the weight of ~1.
+        assert sample['alloc_count'] == 1
+        assert sample['alloc_bytes'] == 1024 * 1024
+        assert sample['inuse_bytes'] == 0
+
+    def test_not_sampled(self):
+        hook = memory_hooks.SamplingProfileHook(sample_every=100)
+        with hook:
+            p = self.pool.malloc(1000)
+            del p
+        assert hook.get_samples() == []
+
+    def test_max_entries(self):
+        hook = memory_hooks.SamplingProfileHook(
+            sample_every=1, max_entries=1)
+        with hook:
+            p1 = self.pool.malloc(1000)
+            p2 = self.pool.malloc(1000)
+        samples = hook.get_samples()
+        assert len(samples) == 2
+        assert ['<other>:0:<other>'] in [s['stack'] for s in samples]
+        del p1, p2
+
+    def test_max_depth(self):
+        hook = memory_hooks.SamplingProfileHook(sample_every=1, max_depth=1)
+        with hook:
+            p = self.pool.malloc(1000)
+        sample, = hook.get_samples()
+        assert len(sample['stack']) == 1
+        assert sample['stack'][0].endswith(':test_max_depth')
+        del p
+
+    def test_output(self):
+        hook = memory_hooks.SamplingProfileHook(sample_every=1)
+        with hook:
+            p = self.pool.malloc(1000)
+        f = io.StringIO()
+        hook.print_report(file=f)
+        lines = f.getvalue().splitlines()
+        assert len(lines) == 2
+        assert '100.00%' in lines[1]
+        assert lines[1].endswith(':test_output')
+
+        f = io.StringIO()
+        hook.dump_collapsed(file=f)
+        stack, value = f.getvalue().rstrip('\n').rsplit(' ', 1)
+        assert stack.split(';')[-1].endswith(':test_output')
+        assert value == '1024'
+        del p
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            memory_hooks.SamplingProfileHook(sample_bytes=0)
+        with self.assertRaises(ValueError):
+            memory_hooks.SamplingProfileHook(sample_every=0)
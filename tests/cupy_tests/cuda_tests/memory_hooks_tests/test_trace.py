@@ -0,0 +1,63 @@
+import io
+import json
+import unittest
+
+import numpy
+
+import cupy.cuda
+from cupy.cuda import memory
+from cupy.cuda import memory_hooks
+from cupy.cuda.memory_hooks import trace
+from cupy import testing
+
+
+@testing.gpu
+class TestAllocationTraceHook(unittest.TestCase):
+
+    def setUp(self):
+        self.file = io.BytesIO()
+        self.pool = memory.MemoryPool()
+
+    def test_trace(self):
+        hook = memory_hooks.AllocationTraceHook(self.file)
+        stream = cupy.cuda.Stream()
+        with cupy.cuda.Device(0):
+            with hook:
+                mem = self.pool.malloc(1)
+                ptr1 = mem.ptr
+                del mem
+                with stream:
+                    mem = self.pool.malloc(1000)
+                    ptr2 = mem.ptr
+                    del mem
+        self.file.seek(0)
+        records = trace.read_trace(self.file)
+        assert records['event'].tolist() == [
+            trace.ALLOC, trace.MALLOC, trace.FREE,
+            trace.ALLOC, trace.MALLOC, trace.FREE]
+        assert records['size'].tolist() == [512, 512, 512, 1024, 1024, 1024]
+        assert records['ptr'].tolist() == [
+            ptr1, ptr1, ptr1, ptr2, ptr2, ptr2]
+        assert records['stream'].tolist()[3:] == [stream.ptr] * 3
+        assert (records['device_id'] == 0).all()
+        assert (numpy.diff(records['timestamp']) >= 0).all()
+        callsite = hook.callsites[records['callsite'][1]]
+        assert callsite.endswith(':test_trace')
+
+        f = io.StringIO()
+        hook.dump_callsites(f)
+        assert json.loads(f.getvalue()) == hook.callsites
+
+    def test_no_callsite(self):
+        hook = memory_hooks.AllocationTraceHook(self.file, callsite=False)
+        with hook:
+            mem = self.pool.malloc(1)
+            del mem
+        self.file.seek(0)
+        records = trace.read_trace(self.file)
+        assert (records['callsite'] == 0xffffffff).all()
+        assert hook.callsites == []
+
+    def test_invalid_trace(self):
+        with self.assertRaises(ValueError):
+            trace.read_trace(io.BytesIO(b'invalid'))
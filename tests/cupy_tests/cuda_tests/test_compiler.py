@@ -1,4 +1,6 @@
+import os
 import pickle
+import tempfile
 import unittest
 from unittest import mock
 
@@ -125,3 +127,249 @@ class TestExceptionPicklable(unittest.TestCase):
         e2 = pickle.loads(pickle.dumps(e1))
         assert e1.args == e2.args
         assert str(e1) == str(e2)
+
+
+class TestDiskCacheEviction(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, atime, size=100):
+        path = os.path.join(self.cache_dir, name)
+        compiler._write_cache_file(
+            self.cache_dir, path, b'x' * size, 'source', '.cu')
+        os.utime(path, (atime, atime))
+        return path
+
+    def test_cache_info(self):
+        self._write('a_2.cubin', 1)
+        self._write('b_2.cubin', 2)
+        info = compiler.cache_info(self.cache_dir)
+        assert info['entries'] == 2
+        assert info['bytes'] == 2 * (32 + 100)
+        assert info['cache_dir'] == self.cache_dir
+
+    def test_read_hit_and_corrupted(self):
+        path = self._write('a_2.cubin', 1)
+        assert compiler._read_cache_file(path) == b'x' * 100
+        with open(path, 'r+b') as f:
+            f.write(b'0' * 32)
+        assert compiler._read_cache_file(path) is None
+        assert compiler._read_cache_file(path + '_missing') is None
+
+    def test_prune_entries_lru(self):
+        a = self._write('a_2.cubin', 1)
+        b = self._write('b_2.cubin', 2)
+        c = self._write('c_2.cubin', 3)
+        # Reading `a` marks it as the most recently used entry
+        compiler._read_cache_file(a)
+        assert compiler.prune_cache(
+            max_entries=2, cache_dir=self.cache_dir) == 1
+        assert os.path.exists(a)
+        assert not os.path.exists(b)
+        assert os.path.exists(c)
+
+    def test_prune_bytes(self):
+        self._write('a_2.cubin', 1)
+        self._write('b_2.cubin', 2)
+        self._write('c_2.cubin', 3)
+        assert compiler.prune_cache(
+            max_bytes=150, cache_dir=self.cache_dir) == 2
+        info = compiler.cache_info(self.cache_dir)
+        assert info['entries'] == 1
+        assert info['bytes'] == 132
+
+    def test_prune_removes_source(self):
+        path = self._write('a_2.cubin', 1)
+        with open(path + '.cu', 'w') as f:
+            f.write('source')
+        assert compiler.cache_info(self.cache_dir)['bytes'] == 132 + 6
+        assert compiler.prune_cache(
+            max_entries=0, cache_dir=self.cache_dir) == 1
+        assert not os.path.exists(path + '.cu')
+
+    def test_prune_unlimited(self):
+        self._write('a_2.cubin', 1)
+        with mock.patch.dict(os.environ, {'CUPY_CACHE_MAX_BYTES': '0',
+                                          'CUPY_CACHE_MAX_ENTRIES': '0'}):
+            assert compiler.prune_cache(cache_dir=self.cache_dir) == 0
+
+    def test_budget_on_write(self):
+        with mock.patch.dict(os.environ, {'CUPY_CACHE_MAX_ENTRIES': '2'}):
+            for i in range(4):
+                self._write('k{}_2.cubin'.format(i), i)
+            info = compiler.cache_info(self.cache_dir)
+        assert info['entries'] == 2
+        assert info['max_entries'] == 2
+
+
+class TestKernelArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self):
+        compiler._cache_archives.pop(self.cache_dir, None)
+        self.temp_dir.cleanup()
+
+    def test_append_get(self):
+        path = os.path.join(self.cache_dir, compiler._archive_name)
+        archive = compiler._KernelArchive(path)
+        assert archive.get('a_2.cubin') is None
+        assert archive.append('a_2.cubin', b'aaa')
+        assert not archive.append('a_2.cubin', b'aaa')
+        assert archive.append('b_2.cubin', b'bb')
+        assert archive.get('a_2.cubin') == b'aaa'
+        assert archive.get('b_2.cubin') == b'bb'
+
+        # Entries appended by another process are visible
+        other = compiler._KernelArchive(path)
+        assert other.get('b_2.cubin') == b'bb'
+        other.append('c_2.cubin', b'c')
+        assert archive.get('c_2.cubin') == b'c'
+        assert len(archive) == 3
+
+    def test_corrupted(self):
+        path = os.path.join(self.cache_dir, compiler._archive_name)
+        archive = compiler._KernelArchive(path)
+        assert archive.append('a_2.cubin', b'aaa')
+        assert archive.append('b_2.cubin', b'bbb')
+        with open(path, 'r+b') as f:
+            f.seek(1)
+            f.write(b'x')
+
+        other = compiler._KernelArchive(path)
+        assert other.get('a_2.cubin') is None
+        assert other.get('b_2.cubin') == b'bbb'
+        # The corrupted entry is appended again.
+        assert other.append('a_2.cubin', b'aaa')
+        assert other.get('a_2.cubin') == b'aaa'
+        assert compiler._KernelArchive(path).get('a_2.cubin') == b'aaa'
+
+    def test_truncated(self):
+        path = os.path.join(self.cache_dir, compiler._archive_name)
+        archive = compiler._KernelArchive(path)
+        assert archive.append('a_2.cubin', b'aaa')
+        assert archive.append('b_2.cubin', b'bbb')
+        with open(path, 'r+b') as f:
+            f.truncate(4)
+        other = compiler._KernelArchive(path)
+        assert other.get('a_2.cubin') == b'aaa'
+        assert other.get('b_2.cubin') is None
+
+    def test_missing_data(self):
+        path = os.path.join(self.cache_dir, compiler._archive_name)
+        archive = compiler._KernelArchive(path)
+        assert archive.append('a_2.cubin', b'aaa')
+        # e.g., the data file is removed by a partial cleanup
+        open(path, 'wb').close()
+        assert compiler._KernelArchive(path).get('a_2.cubin') is None
+        os.remove(path)
+        assert compiler._KernelArchive(path).get('a_2.cubin') is None
+        # The entry can be appended again.
+        other = compiler._KernelArchive(path)
+        assert other.get('a_2.cubin') is None
+        assert other.append('a_2.cubin', b'aaa')
+        assert other.get('a_2.cubin') == b'aaa'
+
+    def test_save_cuda_source(self):
+        with mock.patch.dict(os.environ, {
+                'CUPY_CACHE_PACKED': '1',
+                'CUPY_CACHE_SAVE_CUDA_SOURCE': '1'}):
+            compiler._write_cached_binary(
+                self.cache_dir, 'a_2.cubin', b'a', 'source', '.cu')
+        with open(os.path.join(self.cache_dir, 'a_2.cubin.cu')) as f:
+            assert f.read() == 'source'
+        assert not os.path.exists(os.path.join(self.cache_dir, 'a_2.cubin'))
+
+    def test_pack_cache(self):
+        for name in ('a_2.cubin', 'b_2.cubin'):
+            path = os.path.join(self.cache_dir, name)
+            compiler._write_cache_file(
+                self.cache_dir, path, name.encode(), 'source', '.cu')
+        assert compiler.pack_cache(self.cache_dir, remove=True) == 2
+        assert compiler.cache_info(self.cache_dir)['entries'] == 0
+        with mock.patch.dict(os.environ, {'CUPY_CACHE_PACKED': '1'}):
+            assert compiler._read_cached_binary(
+                self.cache_dir, 'a_2.cubin') == b'a_2.cubin'
+            compiler._write_cached_binary(
+                self.cache_dir, 'c_2.cubin', b'c', 'source', '.cu')
+            info = compiler.cache_info(self.cache_dir)
+        assert info['archive_entries'] == 3
+        assert info['entries'] == 0
+
+
+class TestCacheKey(unittest.TestCase):
+
+    def test_memoized(self):
+        env = ('80', ('-ftz=true',), (11, 2), 'nvrtc')
+        name = compiler._get_cache_key(env, b'base', 'source', 'extra', '.a')
+        assert name.endswith('.a')
+        with mock.patch('hashlib.md5') as md5:
+            assert compiler._get_cache_key(
+                env, b'base', 'source', 'extra', '.a') == name
+            assert not md5.called
+        assert compiler._get_cache_key(
+            env, b'base', 'source2', 'extra', '.a') != name
+        assert compiler._get_cache_key(
+            env, b'base', 'source', None, '.a') != name
+
+
+class TestPreprocessFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _get(self, backend='nvrtc', cache_dir=None):
+        env = ('80', (), (11, 2), backend)
+        return compiler._get_preprocess_fingerprint(
+            env, (), '80', backend, cache_dir)
+
+    def _patch_identity(self, identity):
+        return mock.patch.object(
+            compiler, '_nvrtc_library_identity', identity)
+
+    def test_persisted(self):
+        with mock.patch.object(
+                compiler, '_preprocess', return_value=b'ptx') as preprocess, \
+                self._patch_identity(('libnvrtc.so', 1, 2)):
+            assert self._get(cache_dir=self.cache_dir) == b'ptx'
+            assert self._get(cache_dir=self.cache_dir) == b'ptx'
+        assert preprocess.call_count == 1
+
+    def test_library_updated(self):
+        with mock.patch.object(
+                compiler, '_preprocess', return_value=b'ptx') as preprocess:
+            with self._patch_identity(('libnvrtc.so', 1, 2)):
+                self._get(cache_dir=self.cache_dir)
+            # e.g., a patch-level update of the same version
+            with self._patch_identity(('libnvrtc.so', 1, 3)):
+                self._get(cache_dir=self.cache_dir)
+                self._get(cache_dir=self.cache_dir)
+        assert preprocess.call_count == 2
+
+    def test_unknown_library(self):
+        with mock.patch.object(
+                compiler, '_preprocess', return_value=b'ptx') as preprocess, \
+                self._patch_identity(False):
+            self._get(cache_dir=self.cache_dir)
+            self._get(cache_dir=self.cache_dir)
+        assert preprocess.call_count == 2
+
+    def test_not_persisted(self):
+        with mock.patch.object(
+                compiler, '_preprocess', return_value=b'ptx') as preprocess:
+            self._get(cache_dir=None)
+            self._get(cache_dir=None)
+            self._get('nvcc', self.cache_dir)
+            self._get('nvcc', self.cache_dir)
+        assert preprocess.call_count == 4
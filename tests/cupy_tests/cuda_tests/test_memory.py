@@ -1,8 +1,11 @@
 import ctypes
 import gc
+import io
+import os
 import pickle
 import threading
 import unittest
+from unittest import mock
 
 import fastrlock
 import pytest
@@ -580,6 +583,194 @@ class TestSingleDeviceMemoryPool(unittest.TestCase):
         assert self.unit * 6 == self.pool.total_bytes()
         del p2
 
+    def test_stats(self):
+        p1 = self.pool.malloc(self.unit * 4)
+        p2 = self.pool.malloc(self.unit * 4)
+        p3 = self.pool.malloc(self.unit * 4)
+        del p1, p3
+        stats = self.pool.stats()
+        assert stats['used_bytes'] == self.unit * 4
+        assert stats['free_bytes'] == self.unit * 8
+        assert stats['total_bytes'] == self.unit * 12
+        assert stats['largest_free_chunk'] == self.unit * 4
+        assert stats['fragmentation'] == 0.5
+        arena, = stats['arenas'].values()
+        assert arena['free_bytes'] == self.unit * 8
+        assert arena['bins'] == {self.unit * 4: 2}
+
+        # split and merge
+        p4 = self.pool.malloc(self.unit * 1)
+        del p4
+        stats = self.pool.stats()
+        assert stats['n_splits'] == 1
+        assert stats['n_merges'] == 1
+        del p2
+
+    def test_release_policy_idle(self):
+        with mock.patch('time.monotonic', return_value=100.0):
+            self.pool.set_release_policy(max_idle_seconds=10)
+            p1 = self.pool.malloc(self.unit * 4)
+            p2 = self.pool.malloc(self.unit * 8)
+            del p1
+        with mock.patch('time.monotonic', return_value=105.0):
+            p3 = self.pool.malloc(self.unit * 8)
+        assert self.pool.stats()['n_released_chunks'] == 0
+        with mock.patch('time.monotonic', return_value=111.0):
+            p4 = self.pool.malloc(self.unit * 8)
+        stats = self.pool.stats()
+        assert stats['n_released_chunks'] == 1
+        assert stats['released_bytes'] == self.unit * 4
+        assert stats['total_bytes'] == self.unit * 24
+        del p2, p3, p4
+
+    def test_release_policy_high_watermark(self):
+        with mock.patch('time.monotonic', return_value=100.0):
+            self.pool.set_release_policy(high_watermark=self.unit * 8)
+            p1 = self.pool.malloc(self.unit * 4)
+            p2 = self.pool.malloc(self.unit * 4)
+            p3 = self.pool.malloc(self.unit * 4)
+            del p1, p2
+        with mock.patch('time.monotonic', return_value=200.0):
+            p4 = self.pool.malloc(self.unit * 4)
+        stats = self.pool.stats()
+        assert stats['n_released_chunks'] == 1
+        assert stats['total_bytes'] == self.unit * 8
+        assert stats['free_bytes'] == 0
+        del p3, p4
+
+    def test_release_policy_invalid(self):
+        assert self.pool.get_release_policy() == {
+            'max_idle_seconds': None, 'high_watermark': None}
+        with pytest.raises(ValueError):
+            self.pool.set_release_policy(max_idle_seconds=-1)
+        with pytest.raises(ValueError):
+            self.pool.set_release_policy(high_watermark=-1)
+        self.pool.set_release_policy(max_idle_seconds=1, high_watermark=2)
+        assert self.pool.get_release_policy() == {
+            'max_idle_seconds': 1, 'high_watermark': 2}
+
+    def _record_fake_events(self, events):
+        def record(stream_ptr):
+            event = mock.Mock(done=False, stream_ptr=stream_ptr)
+            events.append(event)
+            return event
+        return mock.patch.object(
+            memory, '_record_free_event', side_effect=record)
+
+    def test_cross_stream_reuse(self):
+        events = []
+        with self._record_fake_events(events):
+            self.pool.set_cross_stream_reuse(True)
+            assert self.pool.get_cross_stream_reuse()
+            with self.stream:
+                p1 = self.pool.malloc(self.unit * 4)
+                del p1
+            assert len(events) == 1
+            assert events[0].stream_ptr == self.stream_ident
+
+            # The work on the stream has not completed yet.
+            p2 = self.pool.malloc(self.unit * 2)
+            assert self.pool.total_bytes() == self.unit * 6
+
+            events[0].done = True
+            p3 = self.pool.malloc(self.unit * 2)
+            assert self.pool.total_bytes() == self.unit * 6
+            assert p3.ptr not in (p2.ptr, 0)
+            stats = self.pool.stats()
+            assert stats['n_cross_stream_reuses'] == 1
+            assert stats['free_bytes'] == self.unit * 2
+            del p2, p3
+        assert self.pool.stats()['n_cross_stream_reuses'] == 1
+
+    def test_cross_stream_reuse_split(self):
+        events = []
+        with self._record_fake_events(events):
+            self.pool.set_cross_stream_reuse(True)
+            with self.stream:
+                p1 = self.pool.malloc(self.unit * 4)
+                del p1
+                p2 = self.pool.malloc(self.unit * 2)
+            for event in events:
+                event.done = True
+            # The remaining chunk of the split is not reused.
+            p3 = self.pool.malloc(self.unit * 2)
+            assert self.pool.total_bytes() == self.unit * 6
+            assert self.pool.stats()['n_cross_stream_reuses'] == 0
+            del p2, p3
+
+    def test_cross_stream_reuse_disabled(self):
+        events = []
+        with self._record_fake_events(events):
+            assert not self.pool.get_cross_stream_reuse()
+            with self.stream:
+                p1 = self.pool.malloc(self.unit * 4)
+                del p1
+            p2 = self.pool.malloc(self.unit * 4)
+            assert self.pool.total_bytes() == self.unit * 8
+            assert events == []
+            del p2
+
+    def test_stats_empty(self):
+        stats = self.pool.stats()
+        assert stats['free_bytes'] == 0
+        assert stats['fragmentation'] == 0.0
+        assert stats['arenas'] == {}
+
+    def test_reserve(self):
+        self.pool.reserve({self.unit * 2: 2, self.unit: 1, 1: 1})
+        assert self.pool.total_bytes() == self.unit * 6
+        assert self.pool.n_free_blocks() == 4
+        assert self.pool.get_profile() == {self.unit * 2: 2, self.unit: 2}
+        p1 = self.pool.malloc(self.unit * 2)
+        p2 = self.pool.malloc(self.unit * 2)
+        p3 = self.pool.malloc(self.unit)
+        assert self.pool.total_bytes() == self.unit * 6
+        assert self.pool.stats()['n_splits'] == 0
+        del p1, p2, p3
+        # The blocks are not merged with each other after being freed.
+        assert self.pool.n_free_blocks() == 4
+        assert self.pool.get_profile() == {self.unit * 2: 2, self.unit: 2}
+        p1 = self.pool.malloc(self.unit * 2)
+        p2 = self.pool.malloc(self.unit)
+        p3 = self.pool.malloc(self.unit)
+        p4 = self.pool.malloc(self.unit * 2)
+        assert self.pool.total_bytes() == self.unit * 6
+        assert self.pool.stats()['n_splits'] == 0
+        del p1, p2, p3, p4
+        self.pool.free_all_blocks()
+        assert self.pool.total_bytes() == 0
+
+    def test_reserve_stream(self):
+        self.pool.reserve([self.unit], stream=self.stream)
+        self.pool.malloc(self.unit)
+        assert self.pool.total_bytes() == self.unit * 2
+        with self.stream:
+            self.pool.malloc(self.unit)
+        assert self.pool.total_bytes() == self.unit * 2
+
+    def test_reserve_invalid(self):
+        with pytest.raises(ValueError):
+            self.pool.reserve({self.unit: -1})
+        self.pool.reserve([])
+        assert self.pool.total_bytes() == 0
+
+    def test_dump_profile(self):
+        p1 = self.pool.malloc(self.unit * 3)
+        p2 = self.pool.malloc(self.unit)
+        del p2
+        f = io.StringIO()
+        self.pool.dump_profile(f)
+        f.seek(0)
+        pool = memory.SingleDeviceMemoryPool(allocator=mock_alloc)
+        pool.reserve(f)
+        assert pool.get_profile() == {self.unit * 3: 1, self.unit: 1}
+        assert pool.free_bytes() == self.unit * 4
+        del p1
+
+        f = io.StringIO('{"version": 0, "chunks": {}}')
+        with pytest.raises(ValueError):
+            pool.reserve(f)
+
     def test_get_limit(self):
         # limit is disabled by default
         assert 0 == self.pool.get_limit()
@@ -616,6 +807,179 @@ class TestSingleDeviceMemoryPool(unittest.TestCase):
             self.pool.set_limit(fraction=1.1)
 
 
+@testing.gpu
+class TestSingleDeviceMemoryPoolSlab(unittest.TestCase):
+
+    def setUp(self):
+        self.unit = memory._allocation_unit_size
+        with mock.patch.dict(os.environ, {
+                'CUPY_GPU_MEMORY_SLAB_THRESHOLD': str(self.unit * 2)}):
+            self.pool = memory.SingleDeviceMemoryPool(allocator=mock_alloc)
+        self.stream = stream_module.Stream()
+
+    def test_parse_slab_threshold(self):
+        assert memory._parse_slab_threshold('') == 0
+        assert memory._parse_slab_threshold('0') == 0
+        assert memory._parse_slab_threshold(str(self.unit * 2 + 1)) == (
+            self.unit * 2)
+        with pytest.raises(ValueError):
+            memory._parse_slab_threshold('-1')
+
+    def test_alloc(self):
+        p1 = self.pool.malloc(1)
+        p2 = self.pool.malloc(self.unit)
+        # Blocks are carved from a slab
+        assert p2.ptr == p1.ptr + self.unit
+        p3 = self.pool.malloc(self.unit * 2)
+        assert p3.ptr != p1.ptr + self.unit * 2
+        assert self.pool.used_bytes() == self.unit * 4
+        assert self.pool.total_bytes() == self.pool.used_bytes() + (
+            self.pool.free_bytes())
+
+    def test_free(self):
+        p1 = self.pool.malloc(self.unit)
+        ptr1 = p1.ptr
+        n_free_blocks = self.pool.n_free_blocks()
+        del p1
+        assert self.pool.n_free_blocks() == n_free_blocks + 1
+        p2 = self.pool.malloc(self.unit)
+        assert p2.ptr == ptr1
+
+    def test_free_explicit(self):
+        p1 = self.pool.malloc(self.unit)
+        used_bytes = self.pool.used_bytes()
+        ptr = p1.mem.ptr
+        p1.mem.ptr = 0  # to avoid double free
+        self.pool.free(ptr, self.unit)
+        assert self.pool.used_bytes() == used_bytes - self.unit
+        with pytest.raises(RuntimeError):
+            self.pool.free(ptr + self.unit * 1000, self.unit)
+
+    def test_free_stream(self):
+        p1 = self.pool.malloc(self.unit)
+        ptr1 = p1.ptr
+        del p1
+        with self.stream:
+            p2 = self.pool.malloc(self.unit)
+        assert p2.ptr != ptr1
+
+    def test_large_alloc(self):
+        p1 = self.pool.malloc(self.unit * 3)
+        assert self.pool.total_bytes() == self.unit * 3
+        del p1
+
+    def test_slab_bytes(self):
+        # Slabs of large blocks are bounded by bytes rather than blocks.
+        with mock.patch.dict(os.environ, {
+                'CUPY_GPU_MEMORY_SLAB_THRESHOLD': str(1 << 20)}):
+            pool = memory.SingleDeviceMemoryPool(allocator=mock_alloc)
+        p1 = pool.malloc(1 << 20)
+        assert pool.total_bytes() == 1 << 20
+        p2 = pool.malloc(1 << 18)
+        assert pool.total_bytes() == (1 << 20) * 2
+        del p1, p2
+
+    def test_slab_fallback(self):
+        # The requested size is allocated if the slab does not fit.
+        with mock.patch.dict(os.environ, {
+                'CUPY_GPU_MEMORY_SLAB_THRESHOLD': str(1 << 20)}):
+            pool = memory.SingleDeviceMemoryPool(allocator=mock_alloc)
+        pool.set_limit(size=1 << 19)
+        p1 = pool.malloc(1 << 18)
+        assert pool.total_bytes() == 1 << 18
+        with pytest.raises(memory.OutOfMemoryError):
+            pool.malloc(1 << 19)
+        del p1
+
+    def test_free_all_blocks(self):
+        p1 = self.pool.malloc(self.unit)
+        p2 = self.pool.malloc(self.unit * 2)
+        del p1
+        self.pool.free_all_blocks()
+        assert self.pool.total_bytes() != 0
+        del p2
+        self.pool.free_all_blocks()
+        assert self.pool.total_bytes() == 0
+        assert self.pool.n_free_blocks() == 0
+
+
+@testing.gpu
+class TestSingleDeviceMemoryPoolThreadCache(unittest.TestCase):
+
+    def setUp(self):
+        self.unit = memory._allocation_unit_size
+        # Chunks up to 8 units are cached.
+        with mock.patch.dict(os.environ, {
+                'CUPY_GPU_MEMORY_THREAD_CACHE': str(self.unit * 64)}):
+            self.pool = memory.SingleDeviceMemoryPool(allocator=mock_alloc)
+        self.stream = stream_module.Stream()
+
+    def test_parse_thread_cache_size(self):
+        assert memory._parse_thread_cache_size('') == 0
+        assert memory._parse_thread_cache_size('1024') == 1024
+        with pytest.raises(ValueError):
+            memory._parse_thread_cache_size('-1')
+
+    def test_reuse(self):
+        p1 = self.pool.malloc(self.unit * 2)
+        ptr1 = p1.ptr
+        del p1
+        stats = self.pool.stats()
+        assert stats['thread_cache_bytes'] == self.unit * 2
+        assert stats['free_bytes'] == self.unit * 2
+        for arena in stats['arenas'].values():
+            assert arena['free_bytes'] == 0
+        assert self.pool.used_bytes() == 0
+        assert self.pool.free_bytes() == self.unit * 2
+        assert self.pool.n_free_blocks() == 1
+        p2 = self.pool.malloc(self.unit * 2)
+        assert p2.ptr == ptr1
+        assert self.pool.n_free_blocks() == 0
+        assert self.pool.used_bytes() == self.unit * 2
+
+    def test_stream(self):
+        with self.stream:
+            p1 = self.pool.malloc(self.unit * 2)
+            ptr1 = p1.ptr
+            del p1
+        p2 = self.pool.malloc(self.unit * 2)
+        assert p2.ptr != ptr1
+        with self.stream:
+            p3 = self.pool.malloc(self.unit * 2)
+        assert p3.ptr == ptr1
+
+    def test_bounded(self):
+        p1 = self.pool.malloc(self.unit * 16)
+        del p1
+        assert self.pool.stats()['thread_cache_bytes'] == 0
+        ps = [self.pool.malloc(self.unit) for _ in range(9)]
+        del ps
+        stats = self.pool.stats()
+        assert stats['thread_cache_bytes'] == self.unit * 8
+
+    def test_free_all_blocks(self):
+        p1 = self.pool.malloc(self.unit * 2)
+        del p1
+        self.pool.free_all_blocks()
+        assert self.pool.total_bytes() == 0
+        assert self.pool.n_free_blocks() == 0
+
+    def test_thread_exit(self):
+        def f():
+            p = self.pool.malloc(self.unit * 2)
+            del p
+            assert self.pool.stats()['thread_cache_bytes'] == self.unit * 2
+
+        t = threading.Thread(target=f)
+        t.start()
+        t.join()
+        gc.collect()
+        stats = self.pool.stats()
+        assert stats['thread_cache_bytes'] == 0
+        assert stats['free_bytes'] == self.unit * 2
+        assert self.pool.n_free_blocks() == 1
+
+
 class TestParseMempoolLimitEnvVar(unittest.TestCase):
     def test_parse_limit_string(self):
         parse_limit_string = memory._parse_limit_string
@@ -1,5 +1,9 @@
 import unittest
+from unittest import mock
 
+import pytest
+
+from cupy.cuda import memory
 from cupy.cuda import pinned_memory
 from cupy import testing
 
@@ -130,3 +134,68 @@ class TestSingleDeviceMemoryPool(unittest.TestCase):
     def test_n_free_blocks_without_malloc(self):
         # call directly without malloc/free_all_blocks.
         assert self.pool.n_free_blocks() == 0
+
+    def test_best_fit(self):
+        p1 = self.pool.malloc(2000)
+        ptr1 = p1.ptr
+        del p1
+        p2 = self.pool.malloc(600)
+        assert p2.ptr == ptr1
+        assert self.pool.stats()['n_best_fit_reuses'] == 1
+
+        # Too large blocks are not reused.
+        p3 = self.pool.malloc(4000)
+        ptr3 = p3.ptr
+        del p3
+        p4 = self.pool.malloc(512)
+        assert p4.ptr != ptr3
+
+    def test_bytes(self):
+        p1 = self.pool.malloc(1000)
+        p2 = self.pool.malloc(3000)
+        del p2
+        assert self.pool.used_bytes() == 1024
+        assert self.pool.free_bytes() == 4096
+        assert self.pool.total_bytes() == 5120
+        stats = self.pool.stats()
+        assert stats['bins'] == {4096: 1}
+        assert stats['n_allocs'] == 2
+        assert stats['n_free_blocks'] == 1
+        self.pool.free_all_blocks()
+        assert self.pool.total_bytes() == 1024
+        del p1
+
+    def test_limit(self):
+        assert self.pool.get_limit() == 0
+        self.pool.set_limit(2048)
+        assert self.pool.get_limit() == 2048
+        p1 = self.pool.malloc(1000)
+        del p1
+        # The free block is released to allocate a new one.
+        p2 = self.pool.malloc(2000)
+        assert self.pool.total_bytes() == 2048
+        with pytest.raises(memory.OutOfMemoryError):
+            self.pool.malloc(1000)
+        with pytest.raises(ValueError):
+            self.pool.set_limit(-1)
+        del p2
+
+    def test_release_policy(self):
+        assert self.pool.get_release_policy() == {'max_idle_seconds': None}
+        with mock.patch('time.monotonic', return_value=100.0):
+            self.pool.set_release_policy(max_idle_seconds=10)
+            p1 = self.pool.malloc(1000)
+            p2 = self.pool.malloc(1000)
+            del p1
+        with mock.patch('time.monotonic', return_value=105.0):
+            del p2
+        with mock.patch('time.monotonic', return_value=111.0):
+            p3 = self.pool.malloc(5000)
+        stats = self.pool.stats()
+        assert stats['n_released_blocks'] == 1
+        assert stats['released_bytes'] == 1024
+        assert stats['n_free_blocks'] == 1
+        assert self.pool.total_bytes() == 1024 + 8192
+        with pytest.raises(ValueError):
+            self.pool.set_release_policy(max_idle_seconds=-1)
+        del p3
@@ -1,9 +1,16 @@
 import io
+import os
 import pickle
+import tempfile
 import unittest
+from unittest import mock
+
+import numpy
+import pytest
 
 import cupy
 from cupy import testing
+from cupy._io import npz
 
 
 @testing.gpu
@@ -99,3 +106,131 @@ class TestNpz(unittest.TestCase):
         sio.close()
 
         testing.assert_array_equal(a, b)
+
+
+@testing.gpu
+class TestNpzStreaming(unittest.TestCase):
+
+    def setUp(self):
+        # Use small chunks so that arrays are split into many chunks.
+        patcher = mock.patch.object(npz, '_chunk_size', 1000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _save(self, a):
+        f = io.BytesIO()
+        numpy.save(f, a)
+        f.seek(0)
+        return f
+
+    @testing.for_all_dtypes()
+    def test_load(self, dtype):
+        a = testing.shaped_arange((30, 70), numpy, dtype)
+        b = cupy.load(self._save(a))
+        assert b.flags.c_contiguous
+        testing.assert_array_equal(a, b)
+
+    def test_load_fortran_order(self):
+        a = numpy.asfortranarray(testing.shaped_arange((30, 70), numpy))
+        b = cupy.load(self._save(a))
+        assert b.flags.f_contiguous
+        testing.assert_array_equal(a, b)
+
+    def test_load_scalar_and_empty(self):
+        for a in (numpy.array(1.5), numpy.empty((0, 3), numpy.float32)):
+            testing.assert_array_equal(cupy.load(self._save(a)), a)
+
+    def test_load_non_native_byte_order(self):
+        a = numpy.arange(300, dtype='>i4' if numpy.little_endian else '<i4')
+        testing.assert_array_equal(cupy.load(self._save(a)), a)
+
+    def test_load_truncated(self):
+        data = self._save(numpy.arange(3000.0)).getvalue()
+        with pytest.raises(ValueError):
+            cupy.load(io.BytesIO(data[:-10]))
+
+    def test_load_path_and_mmap(self):
+        a = testing.shaped_arange((30, 70), numpy)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'a.npy')
+            numpy.save(path, a)
+            testing.assert_array_equal(cupy.load(path), a)
+            testing.assert_array_equal(cupy.load(path, mmap_mode='r'), a)
+
+    def test_load_npz(self):
+        a1 = testing.shaped_arange((30, 70), numpy)
+        a2 = numpy.asfortranarray(testing.shaped_arange((7, 300), numpy))
+        for savez in (numpy.savez, numpy.savez_compressed):
+            f = io.BytesIO()
+            savez(f, a1, x=a2)
+            f.seek(0)
+            with cupy.load(f) as d:
+                testing.assert_array_equal(d['arr_0'], a1)
+                testing.assert_array_equal(d['x.npy'], a2)
+                with pytest.raises(KeyError):
+                    d['y']
+
+    @testing.for_all_dtypes()
+    def test_save(self, dtype):
+        a = testing.shaped_arange((30, 70), cupy, dtype)
+        f = io.BytesIO()
+        cupy.save(f, a)
+        f.seek(0)
+        testing.assert_array_equal(numpy.load(f), a)
+
+    def test_save_layouts(self):
+        a = testing.shaped_arange((30, 70), cupy)
+        for b in (cupy.asfortranarray(a), a[:, ::3], a[0, 0],
+                  cupy.empty((0, 3))):
+            f = io.BytesIO()
+            cupy.save(f, b)
+            f.seek(0)
+            c = numpy.load(f)
+            assert c.flags.f_contiguous == (
+                b.flags.f_contiguous and not b.flags.c_contiguous)
+            testing.assert_array_equal(c, b)
+
+    def test_save_path(self):
+        a = testing.shaped_arange((30, 70), cupy)
+        with tempfile.TemporaryDirectory() as d:
+            cupy.save(os.path.join(d, 'a'), a)
+            testing.assert_array_equal(
+                numpy.load(os.path.join(d, 'a.npy')), a)
+
+    def test_save_write_error(self):
+        class File(object):
+            def __init__(self):
+                self.n_writes = 0
+
+            def write(self, data):
+                # Fails after the header is written.
+                self.n_writes += 1
+                if self.n_writes > 3:
+                    raise OSError('write error')
+
+        a = testing.shaped_arange((30, 70), cupy)
+        with pytest.raises(OSError):
+            cupy.save(File(), a)
+
+    def test_savez(self):
+        a1 = testing.shaped_arange((30, 70), cupy)
+        a2 = cupy.asfortranarray(testing.shaped_arange((7, 300), cupy))
+        for savez in (cupy.savez, cupy.savez_compressed):
+            f = io.BytesIO()
+            savez(f, a1, x=a2, y=numpy.arange(3))
+            f.seek(0)
+            with numpy.load(f) as d:
+                testing.assert_array_equal(d['arr_0'], a1)
+                testing.assert_array_equal(d['x'], a2)
+                testing.assert_array_equal(d['y'], numpy.arange(3))
+
+    def test_savez_path(self):
+        a = testing.shaped_arange((30, 70), cupy)
+        with tempfile.TemporaryDirectory() as d:
+            cupy.savez(os.path.join(d, 'a'), a)
+            with numpy.load(os.path.join(d, 'a.npz')) as f:
+                testing.assert_array_equal(f['arr_0'], a)
+
+    def test_savez_duplicate_key(self):
+        with pytest.raises(ValueError):
+            cupy.savez(io.BytesIO(), cupy.arange(3), arr_0=cupy.arange(3))
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+
+import cupy
+from cupy import testing
+from cupy.cuda import compiler
+from cupyx import profiler
+
+
+_source = 'extern "C" __global__ void my_kernel(float* x) {}'
+
+
+class TestCompileStats(unittest.TestCase):
+
+    def test_record(self):
+        with profiler.compile_stats() as stats:
+            compiler._record_compile_stats('disk_read', _source, 0.5)
+            compiler._record_compile_stats('compile', _source, 2.0)
+            compiler._record_compile_stats('disk_read', _source, 0.25)
+            compiler._record_compile_stats('disk_hit', _source, 0.0)
+            compiler._record_compile_stats('preprocess', None, 1.0)
+            compiler._record_memo_hit('my_kernel')
+        compiler._record_memo_hit('my_kernel')  # not recorded
+        assert not compiler._compile_stats_collectors
+
+        assert stats.kernels == {'my_kernel': {
+            'memo_hits': 1,
+            'disk_hits': 1,
+            'compiles': 1,
+            'compile_seconds': 2.0,
+            'disk_read_seconds': 0.75,
+            'source_size': len(_source),
+        }}
+        total = stats.total()
+        assert total['compiles'] == 1
+        assert total['preprocess_seconds'] == 1.0
+
+    def test_kernel_name(self):
+        assert compiler._get_kernel_name(_source) == 'my_kernel'
+        assert compiler._get_kernel_name(
+            '__global__ void __launch_bounds__(128, 2) k2() {}') == 'k2'
+        assert compiler._get_kernel_name('int x;') == '<unknown>'
+
+    def test_to_json(self):
+        with profiler.compile_stats() as stats:
+            compiler._record_compile_stats('compile', _source, 1.0)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'stats.json')
+            ret = stats.to_json(path)
+            with open(path) as f:
+                assert json.load(f) == json.loads(ret) == stats.to_dict()
+
+    def test_accumulate(self):
+        stats = profiler.CompileStats()
+        for _ in range(2):
+            with profiler.compile_stats(stats):
+                compiler._record_compile_stats('compile', _source, 1.0)
+        assert stats.kernels['my_kernel']['compiles'] == 2
+
+
+@testing.gpu
+class TestCompileStatsKernel(unittest.TestCase):
+
+    def test_elementwise_kernel(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x', 'T y', 'y = x + 1', 'test_compile_stats_kernel')
+        x = cupy.arange(10)
+        with profiler.compile_stats() as stats:
+            kernel(x)
+            kernel(x)
+        record = stats.kernels['test_compile_stats_kernel']
+        assert record['disk_hits'] + record['compiles'] == 1
+        assert record['memo_hits'] == 1
+        assert record['source_size'] > 0
@@ -0,0 +1,69 @@
+import unittest
+
+import cupy
+from cupy import testing
+from cupy.cuda import runtime
+from cupyx import profiler
+
+
+class TestGetLaunchConfigs(unittest.TestCase):
+
+    def _get_configs(self, name):
+        # Kernels are named after the argument types, e.g.,
+        # ``cupy_add__float32_float32_float32``.
+        configs = profiler.get_launch_configs()
+        return [config
+                for kernel_name, kernel_configs in configs.items()
+                if kernel_name.startswith(name + '__')
+                for config in kernel_configs]
+
+    def _check_configs(self, name):
+        configs = self._get_configs(name)
+        assert len(configs) >= 1
+        max_threads = cupy.cuda.Device().attributes['MaxThreadsPerBlock']
+        for config in configs:
+            assert config['mode'] in ('occupancy', 'fixed')
+            if config['mode'] == 'fixed':
+                assert config['block_size'] == 128
+                assert config['min_grid_size'] == 0
+            else:
+                assert not runtime.is_hip
+                assert 0 < config['block_size'] <= max_threads
+                assert config['min_grid_size'] > 0
+
+    def test_ufunc(self):
+        a = testing.shaped_arange((1000,), cupy, 'f')
+        testing.assert_array_equal(a + a, 2 * testing.shaped_arange(
+            (1000,), cupy, 'f'))
+        self._check_configs('cupy_add')
+        assert 'cupy_add__float32_float32_float32' in (
+            profiler.get_launch_configs())
+
+    def test_ufunc_medium(self):
+        # A launch of fewer threads than min_grid_size full blocks.
+        a = testing.shaped_arange((100003,), cupy, 'd')
+        testing.assert_array_equal(
+            a * a, testing.shaped_arange((100003,), cupy, 'd') ** 2)
+        self._check_configs('cupy_multiply')
+
+    def test_elementwise_kernel(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x', 'T y', 'y = x + 1', 'test_launch_config_kernel')
+        a = testing.shaped_arange((1000,), cupy, 'f')
+        testing.assert_array_equal(kernel(a), a + 1)
+        self._check_configs('test_launch_config_kernel')
+
+    def test_elementwise_kernel_block_size(self):
+        kernel = cupy.ElementwiseKernel(
+            'T x', 'T y', 'y = x + 1', 'test_launch_config_block_size')
+        a = testing.shaped_arange((1000,), cupy, 'f')
+        testing.assert_array_equal(kernel(a, block_size=64), a + 1)
+        # The launch configuration is not chosen for the explicit block size.
+        assert not self._get_configs('test_launch_config_block_size')
+
+    def test_copy(self):
+        a = testing.shaped_arange((1000,), cupy, 'f')
+        a + a
+        name = 'cupy_add__float32_float32_float32'
+        profiler.get_launch_configs()[name].clear()
+        assert profiler.get_launch_configs()[name]
@@ -0,0 +1,178 @@
+import unittest
+
+import numpy
+import pytest
+
+import cupy
+from cupy import testing
+import cupyx
+
+
+class TestAsnumpyAsync(unittest.TestCase):
+
+    def test_asnumpy_async(self):
+        a = testing.shaped_arange((2, 3, 4), cupy, numpy.float32)
+        stream = cupy.cuda.Stream()
+        out, event = cupyx.asnumpy_async(a, stream=stream)
+        assert isinstance(out.base, cupy.cuda.PinnedMemoryPointer)
+        assert isinstance(event, cupy.cuda.Event)
+        event.synchronize()
+        assert event.done
+        testing.assert_array_equal(out, a)
+        assert out.flags.c_contiguous
+
+    def test_current_stream(self):
+        a = testing.shaped_arange((10,), cupy)
+        with cupy.cuda.Stream():
+            out, event = cupyx.asnumpy_async(a)
+        event.synchronize()
+        testing.assert_array_equal(out, a)
+
+    @testing.for_orders('CFA')
+    def test_order(self, order):
+        a = testing.shaped_arange((2, 3), cupy)
+        out, event = cupyx.asnumpy_async(a.T, order=order)
+        event.synchronize()
+        testing.assert_array_equal(out, a.T)
+        if order == 'C':
+            assert out.flags.c_contiguous
+        else:
+            assert out.flags.f_contiguous
+
+    def test_non_contiguous_non_blocking_stream(self):
+        # The contiguous temporary is made on the stream of the copy, not on
+        # the current stream.
+        a = testing.shaped_arange((300, 200), cupy)
+        stream = cupy.cuda.Stream(non_blocking=True)
+        with cupy.cuda.Stream(non_blocking=True):
+            out, event = cupyx.asnumpy_async(a.T, stream=stream)
+            # Reuses the freed temporary if it was made on this stream.
+            cupy.zeros((200, 300), a.dtype)
+        event.synchronize()
+        testing.assert_array_equal(out, a.T)
+        assert out.flags.c_contiguous
+
+    def test_out(self):
+        a = testing.shaped_arange((2, 3), cupy)
+        out = cupyx.empty_pinned((2, 3), dtype=a.dtype)
+        ret, event = cupyx.asnumpy_async(a, out=out)
+        assert ret is out
+        event.synchronize()
+        testing.assert_array_equal(out, a)
+
+    def test_out_mismatch(self):
+        a = testing.shaped_arange((2, 3), cupy)
+        out = cupyx.empty_pinned((3, 2), dtype=a.dtype)
+        with pytest.raises(ValueError):
+            cupyx.asnumpy_async(a, out=out)
+
+    def test_invalid(self):
+        with pytest.raises(TypeError):
+            cupyx.asnumpy_async(numpy.arange(3))
+        with pytest.raises(ValueError):
+            cupyx.asnumpy_async(cupy.arange(3), order='K')
+
+
+class TestAsarrayBatch(unittest.TestCase):
+
+    def test_asarray_batch(self):
+        arrays = [
+            numpy.arange(10, dtype=numpy.float32),
+            numpy.arange(6, dtype=numpy.int8).reshape(2, 3),
+            numpy.arange(12, dtype=numpy.complex128).reshape(3, 4).T,
+            numpy.array(3.0),
+            numpy.empty((0, 2), dtype=numpy.int64),
+        ]
+        stream = cupy.cuda.Stream()
+        out = cupyx.asarray_batch(arrays, stream=stream)
+        stream.synchronize()
+        assert len(out) == len(arrays)
+        for a, b in zip(arrays, out):
+            assert isinstance(b, cupy.ndarray)
+            assert b.dtype == a.dtype
+            assert b.flags.c_contiguous
+            testing.assert_array_equal(b, a)
+        # All arrays share one allocation.
+        mem = out[0].data.mem
+        for b in out[1:4]:
+            assert b.data.mem is mem
+            assert b.data.ptr % 256 == 0
+
+    def test_non_current_stream(self):
+        arrays = [numpy.arange(1000, dtype=numpy.float32) + i
+                  for i in range(3)]
+        stream = cupy.cuda.Stream(non_blocking=True)
+        with cupy.cuda.Stream(non_blocking=True):
+            out = cupyx.asarray_batch(arrays, stream=stream)
+            # The destination is not reused by the current stream before the
+            # copy finishes.
+            del out
+            cupy.zeros((4096,), numpy.float32)
+            out = cupyx.asarray_batch(arrays, stream=stream)
+        stream.synchronize()
+        for a, b in zip(arrays, out):
+            testing.assert_array_equal(b, a)
+
+    def test_list_input(self):
+        out = cupyx.asarray_batch([[1, 2, 3], [[1.5]]])
+        testing.assert_array_equal(out[0], numpy.array([1, 2, 3]))
+        testing.assert_array_equal(out[1], numpy.array([[1.5]]))
+
+    def test_empty(self):
+        assert cupyx.asarray_batch([]) == []
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            cupyx.asarray_batch([numpy.array(['a'], dtype=object)])
+
+
+class TestAsnumpyBatch(unittest.TestCase):
+
+    def test_asnumpy_batch(self):
+        arrays = [
+            testing.shaped_arange((10,), cupy, numpy.float32),
+            testing.shaped_arange((2, 3), cupy, numpy.int8),
+            testing.shaped_arange((3, 4), cupy, numpy.complex128).T,
+            cupy.array(3.0),
+            cupy.empty((0, 2), dtype=numpy.int64),
+        ]
+        stream = cupy.cuda.Stream()
+        out = cupyx.asnumpy_batch(arrays, stream=stream)
+        assert len(out) == len(arrays)
+        for a, b in zip(arrays, out):
+            assert isinstance(b, numpy.ndarray)
+            assert b.dtype == a.dtype
+            assert b.flags.c_contiguous
+            testing.assert_array_equal(b, a)
+        base = out[0].base
+        while isinstance(base, numpy.ndarray):
+            base = base.base
+        assert isinstance(base, cupy.cuda.PinnedMemoryPointer)
+
+    def test_non_current_stream(self):
+        arrays = [testing.shaped_arange((1000,), cupy, numpy.float32) + i
+                  for i in range(3)]
+        stream = cupy.cuda.Stream(non_blocking=True)
+        with cupy.cuda.Stream(non_blocking=True):
+            # A chunk freed on the current stream while it may still be read
+            # is not used as the staging buffer written on the other stream.
+            tmp = cupy.empty((4096,), numpy.float32)
+            tmp.fill(1)
+            del tmp
+            out = cupyx.asnumpy_batch(arrays, stream=stream)
+            cupy.cuda.get_current_stream().synchronize()
+        for a, b in zip(arrays, out):
+            testing.assert_array_equal(b, a)
+
+    def test_roundtrip(self):
+        arrays = [numpy.random.rand(n) for n in range(1, 100)]
+        out = cupyx.asnumpy_batch(cupyx.asarray_batch(arrays))
+        for a, b in zip(arrays, out):
+            numpy.testing.assert_array_equal(a, b)
+
+    def test_empty(self):
+        assert cupyx.asnumpy_batch([]) == []
+
+    def test_invalid(self):
+        with pytest.raises(TypeError):
+            cupyx.asnumpy_batch([numpy.arange(3)])
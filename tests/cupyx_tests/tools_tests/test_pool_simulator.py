@@ -0,0 +1,99 @@
+import io
+import unittest
+
+import numpy
+
+from cupy.cuda.memory_hooks import trace
+from cupyx.tools import pool_simulator
+
+
+def _make_trace(events):
+    records = numpy.zeros(len(events), dtype=trace.trace_dtype)
+    for i, (event, size, ptr, stream) in enumerate(events):
+        records[i] = (event, 0, 0, size, ptr, stream, i)
+    return records
+
+
+class TestPoolSimulator(unittest.TestCase):
+
+    unit = 512
+
+    def test_reuse_split_merge(self):
+        sim = pool_simulator.PoolSimulator()
+        sim.malloc(1, self.unit * 4)
+        sim.free(1)
+        sim.malloc(2, self.unit)
+        sim.malloc(3, self.unit * 3)
+        sim.free(2)
+        sim.free(3)
+        report = sim.report()
+        assert report['peak_reserved_bytes'] == self.unit * 4
+        assert report['peak_used_bytes'] == self.unit * 4
+        assert report['n_device_allocs'] == 1
+        assert report['n_splits'] == 1
+        assert report['n_merges'] == 1
+        assert report['used_bytes'] == 0
+        assert report['fragmentation'] == 0.0
+
+    def test_per_stream(self):
+        events = [
+            (trace.MALLOC, self.unit, 1, 0),
+            (trace.FREE, self.unit, 1, 0),
+            (trace.MALLOC, self.unit, 2, 7),
+        ]
+        report = pool_simulator.simulate(_make_trace(events))
+        assert report['n_device_allocs'] == 2
+        report = pool_simulator.simulate(
+            _make_trace(events), per_stream=False)
+        assert report['n_device_allocs'] == 1
+
+    def test_no_split(self):
+        sim = pool_simulator.PoolSimulator(split=False)
+        sim.malloc(1, self.unit * 4)
+        sim.free(1)
+        sim.malloc(2, self.unit)
+        sim.malloc(3, self.unit)
+        report = sim.report()
+        assert report['n_splits'] == 0
+        assert report['peak_reserved_bytes'] == self.unit * 5
+        assert report['used_bytes'] == self.unit * 5
+
+    def test_pow2(self):
+        sim = pool_simulator.PoolSimulator(rounding='pow2')
+        sim.malloc(1, self.unit * 3)
+        assert sim.report()['reserved_bytes'] == self.unit * 4
+        with self.assertRaises(ValueError):
+            pool_simulator.PoolSimulator(rounding='invalid')
+
+    def test_limit(self):
+        sim = pool_simulator.PoolSimulator(limit=self.unit * 4)
+        sim.malloc(1, self.unit * 2)
+        sim.free(1)
+        sim.malloc(2, self.unit * 4)
+        sim.malloc(3, self.unit)
+        report = sim.report()
+        assert report['n_device_frees'] == 1
+        assert report['n_oom'] == 1
+        assert report['peak_reserved_bytes'] == self.unit * 4
+
+    def test_fragmentation(self):
+        sim = pool_simulator.PoolSimulator()
+        for ptr in range(3):
+            sim.malloc(ptr, self.unit * 2)
+        sim.free(0)
+        sim.free(2)
+        sim.free(100)
+        report = sim.report()
+        assert report['fragmentation'] == 0.5
+        assert report['n_unmatched_frees'] == 1
+
+    def test_read_trace(self):
+        records = _make_trace([
+            (trace.ALLOC, self.unit, 1, 0),
+            (trace.MALLOC, self.unit, 1, 0),
+            (trace.FREE, self.unit, 1, 0),
+        ])
+        f = io.BytesIO(trace._magic + records.tobytes())
+        report = pool_simulator.simulate(f)
+        assert report['n_mallocs'] == 1
+        assert report['n_frees'] == 1
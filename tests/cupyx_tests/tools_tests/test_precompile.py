@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+import cupy
+from cupy import testing
+from cupy.cuda import compiler
+from cupyx.tools import precompile
+
+
+class TestKernelManifest(unittest.TestCase):
+
+    def test_dedup(self):
+        manifest = precompile.KernelManifest()
+        assert manifest.add('src', ('-DA',), '70')
+        assert not manifest.add('src', ['-DA'], 70)
+        assert manifest.add('src', ('-DB',), '70')
+        assert len(manifest) == 2
+
+    def test_merge(self):
+        m1 = precompile.KernelManifest()
+        m1.add('a', arch='70')
+        m1.add('b', arch='70')
+        m2 = precompile.KernelManifest()
+        m2.add('b', arch='70')
+        m2.add('c', arch='70')
+        assert m1.merge(m2) == 1
+        assert sorted([e['source'] for e in m1]) == ['a', 'b', 'c']
+
+    def test_save_load(self):
+        manifest = precompile.KernelManifest()
+        manifest.add('a', ('-DA',), '70', extra_source='x', jitify=True)
+        manifest.add('b', (), '80', backend='nvcc')
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'manifest.json')
+            manifest.save(path)
+            loaded = precompile.KernelManifest.load(path)
+        assert list(loaded) == list(manifest)
+
+    def test_main_merge(self):
+        with tempfile.TemporaryDirectory() as d:
+            paths = [os.path.join(d, '{}.json'.format(i)) for i in range(3)]
+            for i, path in enumerate(paths[:2]):
+                manifest = precompile.KernelManifest()
+                manifest.add('common', arch='70')
+                manifest.add(str(i), arch='70')
+                manifest.save(path)
+            precompile.main(paths[:2] + ['--merge', paths[2]])
+            assert len(precompile.KernelManifest.load(paths[2])) == 3
+
+
+class TestRecord(unittest.TestCase):
+
+    def test_record(self):
+        with precompile.record() as manifest:
+            compiler._record_compile(
+                'src', ('-DA',), '70', None, 'nvrtc', False, False)
+            compiler._record_compile(
+                'src', ('-DA',), '70', None, 'nvrtc', False, False)
+        compiler._record_compile(
+            'other', (), '70', None, 'nvrtc', False, False)
+        assert [e['source'] for e in manifest] == ['src']
+
+    def test_record_to_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'manifest.json')
+            with precompile.record(path):
+                compiler._record_compile(
+                    'a', (), '70', None, 'nvrtc', False, False)
+            with precompile.record(path):
+                compiler._record_compile(
+                    'b', (), '70', None, 'nvrtc', False, False)
+            assert len(precompile.KernelManifest.load(path)) == 2
+
+
+@testing.gpu
+class TestPrecompile(unittest.TestCase):
+
+    def test_precompile(self):
+        source = 'extern "C" __global__ void test_precompile_kernel() {}'
+        with tempfile.TemporaryDirectory() as d:
+            with precompile.record() as manifest:
+                compiler.compile_with_cache(source, cache_dir=d)
+            assert len(manifest) == 1
+            for name in os.listdir(d):
+                os.remove(os.path.join(d, name))
+            assert precompile.precompile(manifest, cache_dir=d) == []
+            assert compiler.cache_info(d)['entries'] == 1
+            # The precompiled kernel is loaded from the cache
+            hits = compiler.cache_info(d)['hits']
+            cupy.clear_memo()
+            compiler.compile_with_cache(source, cache_dir=d)
+            assert compiler.cache_info(d)['hits'] == hits + 1